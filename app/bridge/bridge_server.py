@@ -1,135 +1,593 @@
-"""TCP bridge server running inside the Qt application.
+"""Bridge server running inside the Qt application.
 
-Listens on localhost:19384 for JSON-RPC 2.0 requests from the MCP server
+Listens on localhost:19384 (TCP) and on a local socket (Unix domain socket,
+or a named pipe on Windows) for JSON-RPC 2.0 requests from the MCP server
 process and dispatches them to MainWindow methods on the main thread.
 """
 
-import json
+import os
+import threading
+import time
 import traceback
-from typing import Any, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Optional, Union
 
-from PyQt6.QtCore import QObject, pyqtSignal, pyqtSlot, QMetaObject, Qt, Q_ARG
-from PyQt6.QtNetwork import QTcpServer, QTcpSocket, QHostAddress
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal, pyqtSlot, QMetaObject, Qt, Q_ARG
+from PyQt6.QtNetwork import (
+    QHostAddress, QLocalServer, QLocalSocket, QTcpServer, QTcpSocket,
+)
+
+from app.bridge.codec import Codec, negotiate
+from app.bridge.endpoint import local_socket_name
+from app.models.download_options import DownloadOptions
+from app.utils.helpers import extract_video_id, is_youtube_url
+from app.widgets.toolbar import ToolBar
+from app.bridge.framing import LENGTH, LINE, FrameDecoder, FrameTooLarge, encode_frame
 
 
 BRIDGE_PORT = 19384
 
+# 두 전송 방식의 소켓은 같은 QIODevice API(readAll/write/bytesToWrite)를 쓴다
+BridgeSocket = Union[QTcpSocket, QLocalSocket]
+
+
+class MethodNotFound(ValueError):
+    """Raised by _dispatch for an unknown method (JSON-RPC -32601)."""
+
+
+DOWNLOAD_EVENTS = ("queued", "started", "progress", "paused", "finished", "error")
+
+
+@dataclass
+class Subscription:
+    """Per-socket filter and rate limit for download_event notifications."""
+
+    events: frozenset = frozenset(DOWNLOAD_EVENTS)
+    video_ids: Optional[frozenset] = None  # None = 모든 항목
+    download_type: Optional[str] = None
+    progress_interval: float = 1.0  # 같은 항목의 progress 최소 간격 (초)
+    max_rate: float = 20.0  # progress 알림 초당 최대 개수 (토큰 버킷)
+    tokens: float = 0.0
+    refilled_at: float = 0.0
+    last_progress: Dict[str, float] = field(default_factory=dict)
+    dropped: int = 0
+
+    def allow_progress(self, video_id: str, now: float) -> bool:
+        if now - self.last_progress.get(video_id, 0.0) < self.progress_interval:
+            return False
+        self.tokens = min(self.max_rate, self.tokens + (now - self.refilled_at) * self.max_rate)
+        self.refilled_at = now
+        if self.tokens < 1.0:
+            return False
+        self.tokens -= 1.0
+        self.last_progress[video_id] = now
+        return True
+
+
+@dataclass(eq=False)
+class DownloadWaiter:
+    """A parked wait_for_downloads request, answered when its condition is met."""
+
+    sock: Any
+    req_id: Any
+    video_ids: tuple
+    mode: str  # "all" | "any"
+    timer: Optional[QTimer] = None
+
+
+# wait_for_downloads가 끝난 것으로 보는 상태 (목록에 없는 항목은 not_found).
+# 정보를 가져오는 중(fetching)이거나 대기 중(queued)인 항목은 끝나지 않은 것이다
+TERMINAL_STATUSES = frozenset({"completed", "error", "not_found"})
+
 
 class BridgeServer(QObject):
-    """QTcpServer-based JSON-RPC bridge inside the Qt app."""
+    """JSON-RPC bridge inside the Qt app, over TCP and a local socket."""
+
+    _JSON_CODEC = Codec()
 
-    def __init__(self, main_window, parent=None):
+    # 읽기 전용 메서드 — 작업 스레드에서 실행 (DB는 스레드별 읽기 연결을 쓴다)
+    POOL_METHODS = frozenset({"get_history", "search_history", "get_stats"})
+    # 위젯 상태를 읽는 메서드 — GUI 스레드에서 스냅샷만 만들고 직렬화는 작업 스레드에서
+    SNAPSHOT_METHODS = frozenset({"get_downloads", "get_download_status"})
+    POOL_WORKERS = 4
+    SLOW_CALL_MS = 100.0
+    LATENCY_LOG_INTERVAL_MS = 60_000
+
+    # 작업 스레드에서 만든 응답 바이트를 GUI 스레드로 넘긴다 (sock, payload)
+    _response_ready = pyqtSignal(object, bytes)
+
+    def __init__(self, main_window, parent=None, port: int = BRIDGE_PORT):
         super().__init__(parent)
         self._main_window = main_window
+        self._port = port
         self._server = QTcpServer(self)
-        self._clients: list[QTcpSocket] = []
-        self._buffers: dict[QTcpSocket, bytes] = {}
+        self._local_server = QLocalServer(self)
+        self._local_server.setSocketOptions(QLocalServer.SocketOption.UserAccessOption)
+        self._clients: list[BridgeSocket] = []
+        self._decoders: dict[BridgeSocket, FrameDecoder] = {}
+        self._subscriptions: dict[BridgeSocket, Subscription] = {}
+        # hello로 협상된 연결별 코덱 (없으면 JSON)
+        self._codecs: dict[BridgeSocket, Codec] = {}
+        self._pending_codecs: dict[BridgeSocket, Codec] = {}
+        self._pool = ThreadPoolExecutor(max_workers=self.POOL_WORKERS,
+                                        thread_name_prefix="BridgeWorker")
+        self._response_ready.connect(self._on_response_ready)
+        # 메서드별 지연 시간 [호출 수, 합계 ms, 최대 ms] — 주기적으로 요약 출력
+        self._latency: Dict[str, list] = {}
+        self._latency_lock = threading.Lock()
+        self._latency_timer = QTimer(self)
+        self._latency_timer.setInterval(self.LATENCY_LOG_INTERVAL_MS)
+        self._latency_timer.timeout.connect(self._log_latency)
+        self._latency_timer.start()
+        # video_id → 그 항목을 기다리는 wait_for_downloads 요청들
+        self._waiters: Dict[str, set] = {}
+        if main_window is not None and hasattr(main_window, "download_event"):
+            main_window.download_event.connect(self._on_download_event)
+            dl = getattr(main_window, "download_list", None)
+            if hasattr(dl, "remove_requested"):
+                dl.remove_requested.connect(self._check_waiters)
+            if hasattr(main_window, "fetch_done"):
+                main_window.fetch_done.connect(self._check_waiters)
 
     def start(self) -> bool:
-        ok = self._server.listen(QHostAddress.SpecialAddress.LocalHost, BRIDGE_PORT)
-        if ok:
+        """Listen on TCP and the local socket; True if either is available."""
+        tcp_ok = self._server.listen(QHostAddress.SpecialAddress.LocalHost, self._port)
+        if tcp_ok:
             self._server.newConnection.connect(self._on_new_connection)
-            print(f"[BridgeServer] Listening on localhost:{BRIDGE_PORT}")
+            print(f"[BridgeServer] Listening on localhost:{self._port}")
         else:
             print(f"[BridgeServer] Failed to listen: {self._server.errorString()}")
-        return ok
+        local_ok = self._listen_local()
+        return tcp_ok or local_ok
+
+    def _listen_local(self) -> bool:
+        name = local_socket_name(self._port)
+        # 살아 있는 다른 인스턴스의 소켓은 지우지 않는다 (비정상 종료로 남은 파일만 정리)
+        probe = QLocalSocket()
+        probe.connectToServer(name)
+        if probe.waitForConnected(100):
+            probe.abort()
+            print(f"[BridgeServer] Local socket in use: {name}")
+            return False
+        QLocalServer.removeServer(name)
+        if not self._local_server.listen(name):
+            print(f"[BridgeServer] Failed to listen on {name}: {self._local_server.errorString()}")
+            return False
+        self._local_server.newConnection.connect(self._on_new_local_connection)
+        print(f"[BridgeServer] Listening on {self._local_server.fullServerName()}")
+        return True
 
     def stop(self):
         for client in self._clients:
-            client.disconnectFromHost()
+            self._disconnect(client)
         self._clients.clear()
-        self._buffers.clear()
+        self._decoders.clear()
+        self._subscriptions.clear()
+        self._codecs.clear()
+        self._pending_codecs.clear()
         self._server.close()
+        self._local_server.close()
+        self._latency_timer.stop()
+        for waiter in {w for ws in self._waiters.values() for w in ws}:
+            if waiter.timer:
+                waiter.timer.stop()
+        self._waiters.clear()
+        # 진행 중인 DB 읽기가 끝나야 db.close()가 안전하다
+        self._pool.shutdown(wait=True, cancel_futures=True)
 
     def _on_new_connection(self):
         while self._server.hasPendingConnections():
-            sock = self._server.nextPendingConnection()
-            self._clients.append(sock)
-            self._buffers[sock] = b""
-            sock.readyRead.connect(lambda s=sock: self._on_data_ready(s))
-            sock.disconnected.connect(lambda s=sock: self._on_disconnected(s))
+            self._add_client(self._server.nextPendingConnection())
+
+    def _on_new_local_connection(self):
+        while self._local_server.hasPendingConnections():
+            self._add_client(self._local_server.nextPendingConnection())
+
+    def _add_client(self, sock: BridgeSocket):
+        self._clients.append(sock)
+        self._decoders[sock] = FrameDecoder()
+        sock.readyRead.connect(lambda s=sock: self._on_data_ready(s))
+        sock.disconnected.connect(lambda s=sock: self._on_disconnected(s))
+
+    @staticmethod
+    def _disconnect(sock: BridgeSocket):
+        if isinstance(sock, QLocalSocket):
+            sock.disconnectFromServer()
+        else:
+            sock.disconnectFromHost()
 
-    def _on_disconnected(self, sock: QTcpSocket):
+    def _on_disconnected(self, sock: BridgeSocket):
         if sock in self._clients:
             self._clients.remove(sock)
-        self._buffers.pop(sock, None)
+        self._decoders.pop(sock, None)
+        self._subscriptions.pop(sock, None)
+        self._codecs.pop(sock, None)
+        self._pending_codecs.pop(sock, None)
+        for waiter in {w for ws in self._waiters.values() for w in ws if w.sock is sock}:
+            self._unpark(waiter)
         sock.deleteLater()
 
-    def _on_data_ready(self, sock: QTcpSocket):
-        self._buffers[sock] = self._buffers.get(sock, b"") + bytes(sock.readAll())
-        while b"\n" in self._buffers[sock]:
-            line, rest = self._buffers[sock].split(b"\n", 1)
-            self._buffers[sock] = rest
-            self._process_line(sock, line)
+    def _on_data_ready(self, sock: BridgeSocket):
+        decoder = self._decoders.get(sock)
+        if decoder is None:
+            return
+        try:
+            messages = decoder.feed(sock.readAll().data())
+        except FrameTooLarge as e:
+            # 메시지 경계를 잃었으므로 오류를 알리고 연결을 끊는다
+            print(f"[BridgeServer] {e}; closing connection")
+            self._write(sock, self._error(None, -32600, f"Invalid Request: {e}"))
+            self._decoders.pop(sock, None)
+            self._disconnect(sock)
+            return
+        for message in messages:
+            self._process_message(sock, message)
 
-    def _process_line(self, sock: QTcpSocket, line: bytes):
+    def _process_message(self, sock: BridgeSocket, message: bytes):
+        try:
+            self._handle_message(sock, message)
+        finally:
+            # hello 응답은 이전 코덱으로 보낸 뒤 새 코덱으로 전환
+            codec = self._pending_codecs.pop(sock, None)
+            if codec is not None:
+                if codec.is_default:
+                    self._codecs.pop(sock, None)
+                else:
+                    self._codecs[sock] = codec
+
+    def _handle_message(self, sock: BridgeSocket, message: bytes):
         try:
-            req = json.loads(line.decode("utf-8"))
-        except (json.JSONDecodeError, UnicodeDecodeError) as e:
-            self._send_error(sock, None, -32700, f"Parse error: {e}")
+            req = self._codec_for(sock).decode(message)
+        except ValueError as e:
+            self._write(sock, self._error(None, -32700, f"Parse error: {e}"))
             return
 
-        req_id = req.get("id")
-        method = req.get("method", "")
-        params = req.get("params", {})
+        # JSON-RPC batch: 배열로 받아 알림(id 없음)을 제외한 응답을 배열로 돌려준다
+        if isinstance(req, list):
+            if not req:
+                self._write(sock, self._error(None, -32600, "Invalid Request: empty batch"))
+                return
+            if all(self._method_of(item) in self.POOL_METHODS for item in req):
+                self._submit(sock, lambda: self._run_batch(sock, req))
+                return
+            responses = self._run_batch(sock, req)
+            if responses:
+                # 상태 조회 묶음은 응답이 클 수 있으므로 직렬화는 작업 스레드에서
+                self._submit(sock, lambda: responses)
+            return
+
+        method = self._method_of(req)
+        if method in self.POOL_METHODS:
+            self._submit(sock, lambda: self._handle_request(sock, req))
+            return
+        resp = self._handle_request(sock, req)
+        if resp is None:
+            return
+        if method in self.SNAPSHOT_METHODS:
+            self._submit(sock, lambda: resp)
+        else:
+            self._write(sock, resp)
+
+    @staticmethod
+    def _method_of(req) -> Optional[str]:
+        return req.get("method") if isinstance(req, dict) else None
+
+    def _run_batch(self, sock: BridgeSocket, items: list) -> list:
+        return [r for r in (self._handle_request(sock, item, in_batch=True) for item in items) if r]
+
+    # ── Worker pool ───────────────────────────────────────────
+
+    def _submit(self, sock: BridgeSocket, produce):
+        """Run produce() on the pool and write its encoded result back on the GUI thread.
+
+        The codec is captured now so a response is always encoded the way the
+        client expects it at the time of the request.
+        """
+        codec = self._codec_for(sock)
+
+        def task():
+            try:
+                data = produce()
+                if data:
+                    self._response_ready.emit(sock, codec.encode(data))
+            except Exception as e:
+                print(f"[BridgeServer] Worker error: {e}")
+                traceback.print_exc()
+
+        try:
+            self._pool.submit(task)
+        except RuntimeError:  # stop() 이후
+            pass
 
+    def _on_response_ready(self, sock: BridgeSocket, payload: bytes):
+        # 응답을 기다리는 동안 연결이 끊겼을 수 있다
+        if sock in self._clients:
+            self._write_raw(sock, payload)
+
+    def _record_latency(self, method: str, elapsed_ms: float):
+        with self._latency_lock:
+            entry = self._latency.setdefault(method, [0, 0.0, 0.0])
+            entry[0] += 1
+            entry[1] += elapsed_ms
+            entry[2] = max(entry[2], elapsed_ms)
+        if elapsed_ms >= self.SLOW_CALL_MS:
+            where = "GUI" if threading.current_thread() is threading.main_thread() else "worker"
+            print(f"[BridgeServer] Slow call: {method} {elapsed_ms:.1f} ms ({where})")
+
+    def _log_latency(self):
+        with self._latency_lock:
+            stats, self._latency = self._latency, {}
+        if not stats:
+            return
+        summary = ", ".join(
+            f"{method} n={n} avg={total / n:.1f}ms max={peak:.1f}ms"
+            for method, (n, total, peak) in sorted(stats.items())
+        )
+        print(f"[BridgeServer] Latency: {summary}")
+
+    def _handle_request(self, sock: BridgeSocket, req, in_batch: bool = False) -> Optional[dict]:
+        """Run one request object; returns its response, or None for a notification."""
+        if not isinstance(req, dict) or not isinstance(req.get("method"), str):
+            return self._error(None, -32600, "Invalid Request")
+        is_notification = "id" not in req
+        req_id = req.get("id")
+        method = req["method"]
+        params = req.get("params") or {}
+
+        if method == "wait_for_downloads":
+            # 조건이 이미 맞으면 바로, 아니면 보류했다가 나중에 작업 스레드를 거쳐
+            # 응답한다. 그런 응답은 배치 응답에 넣을 수 없고, 알림은 받을 곳이 없다.
+            if is_notification:
+                return None
+            if in_batch:
+                return self._error(req_id, -32600,
+                                   "Invalid Request: wait_for_downloads cannot be batched")
+            try:
+                self._handle_wait_for_downloads(sock, req_id, params)
+            except Exception as e:
+                return self._error(req_id, -1, str(e))
+            return None
+
+        start = time.perf_counter()
         try:
-            result = self._dispatch(method, params)
-            self._send_result(sock, req_id, result)
+            result = self._dispatch(method, params, sock)
+        except MethodNotFound as e:
+            resp = self._error(req_id, -32601, str(e))
         except Exception as e:
-            self._send_error(sock, req_id, -1, str(e))
+            resp = self._error(req_id, -1, str(e))
+        else:
+            resp = {"jsonrpc": "2.0", "id": req_id, "result": result}
+            self._record_latency(method, (time.perf_counter() - start) * 1000)
+        return None if is_notification else resp
+
+    @staticmethod
+    def _error(req_id, code: int, message: str) -> dict:
+        return {"jsonrpc": "2.0", "id": req_id, "error": {"code": code, "message": message}}
 
-    def _send_result(self, sock: QTcpSocket, req_id, result):
-        resp = {"jsonrpc": "2.0", "id": req_id, "result": result}
-        self._write(sock, resp)
+    def _codec_for(self, sock: BridgeSocket) -> Codec:
+        return self._codecs.get(sock, self._JSON_CODEC)
 
-    def _send_error(self, sock: QTcpSocket, req_id, code: int, message: str):
-        resp = {"jsonrpc": "2.0", "id": req_id, "error": {"code": code, "message": message}}
-        self._write(sock, resp)
+    def _write(self, sock: BridgeSocket, data):
+        self._write_raw(sock, self._codec_for(sock).encode(data))
 
-    def _write(self, sock: QTcpSocket, data: dict):
-        payload = json.dumps(data, ensure_ascii=False).encode("utf-8") + b"\n"
-        sock.write(payload)
+    def _write_raw(self, sock: BridgeSocket, payload: bytes):
+        decoder = self._decoders.get(sock)
+        sock.write(encode_frame(payload, decoder.framing if decoder and decoder.framing else LINE))
         sock.flush()
 
+    # ── Push notifications ────────────────────────────────────
+
+    # 아직 전송되지 않은 바이트가 이만큼 쌓이면 progress 알림을 건너뛴다
+    SLOW_CONSUMER_BYTES = 256 * 1024
+    # 이보다 더 쌓이면 구독을 해제한다 (GUI 스레드 메모리 보호)
+    MAX_BACKLOG_BYTES = 4 * 1024 * 1024
+
+    def _on_download_event(self, event: str, video_id: str, data: dict):
+        if event in ("finished", "error") and video_id in self._waiters:
+            self._check_waiters(video_id)
+        if not self._subscriptions:
+            return
+        now = time.monotonic()
+        message = {
+            "jsonrpc": "2.0",
+            "method": "download_event",
+            "params": {"event": event, "video_id": video_id, **data},
+        }
+        payloads = {}  # 코덱별로 한 번만 직렬화해 구독자끼리 공유
+        download_type = None
+        for sock, sub in list(self._subscriptions.items()):
+            if event not in sub.events:
+                continue
+            if sub.video_ids is not None and video_id not in sub.video_ids:
+                continue
+            if sub.download_type:
+                if download_type is None:
+                    download_type = self._download_type_of(video_id)
+                if download_type != sub.download_type:
+                    continue
+            backlog = sock.bytesToWrite()
+            if backlog > self.MAX_BACKLOG_BYTES:
+                print(f"[BridgeServer] Dropping slow subscriber ({backlog} bytes pending)")
+                del self._subscriptions[sock]
+                continue
+            if event == "progress":
+                if backlog > self.SLOW_CONSUMER_BYTES or not sub.allow_progress(video_id, now):
+                    sub.dropped += 1
+                    continue
+            elif event in ("finished", "error"):
+                sub.last_progress.pop(video_id, None)
+            codec = self._codec_for(sock)
+            payload = payloads.get(codec.key)
+            if payload is None:
+                payload = payloads[codec.key] = codec.encode(message)
+            self._write_raw(sock, payload)
+
+    def _download_type_of(self, video_id: str) -> str:
+        widget = self._main_window.download_list.get_item(video_id)
+        return widget.video_info.download_type if widget else ""
+
     # ── Request dispatch ──────────────────────────────────────
 
-    def _dispatch(self, method: str, params: dict) -> Any:
+    def _dispatch(self, method: str, params: dict, sock: BridgeSocket = None) -> Any:
+        # 연결 단위 상태가 필요한 메서드
+        session_handler = {
+            "hello": self._handle_hello,
+            "subscribe": self._handle_subscribe,
+            "unsubscribe": self._handle_unsubscribe,
+        }.get(method)
+        if session_handler is not None:
+            if sock is None:
+                raise ValueError(f"{method} requires a connection")
+            return session_handler(sock, params)
+
         handler = {
+            "ping": self._handle_ping,
             "add_download": self._handle_add_download,
+            "add_downloads": self._handle_add_downloads,
             "get_downloads": self._handle_get_downloads,
             "get_download_status": self._handle_get_download_status,
             "cancel_download": self._handle_cancel_download,
+            "cancel_downloads": self._handle_cancel_downloads,
             "get_settings": self._handle_get_settings,
             "update_settings": self._handle_update_settings,
             "get_history": self._handle_get_history,
+            "search_history": self._handle_search_history,
+            "get_stats": self._handle_get_stats,
             "pause_all": self._handle_pause_all,
             "resume_all": self._handle_resume_all,
         }.get(method)
 
         if handler is None:
-            raise ValueError(f"Unknown method: {method}")
+            raise MethodNotFound(f"Unknown method: {method}")
         return handler(params)
 
+    def _handle_ping(self, params: dict) -> str:
+        return "pong"
+
     def _handle_add_download(self, params: dict) -> dict:
         url = params.get("url", "")
         if not url:
             raise ValueError("url is required")
-
-        mw = self._main_window
-        mw._fetch_info(url)
-        return {"status": "info_fetch_started", "url": url}
-
-    def _handle_get_downloads(self, params: dict) -> list:
-        items = self._main_window.download_list.get_all_items()
-        return [self._widget_to_dict(w) for w in items]
+        options = self._item_options(params, self._main_window.toolbar.current_options())
+        self._main_window._fetch_info(url, force=bool(params.get("force", False)),
+                                      options=options, quiet=True)
+        return {"status": "info_fetch_started", "url": url, "video_id": extract_video_id(url)}
+
+    # add_downloads 한 번에 받는 최대 항목 수
+    ADD_DOWNLOADS_MAX_ITEMS = 1000
+
+    def _handle_add_downloads(self, params: dict) -> list:
+        items = params.get("items")
+        if not isinstance(items, list) or not items:
+            raise ValueError("items must be a non-empty list")
+        if len(items) > self.ADD_DOWNLOADS_MAX_ITEMS:
+            raise ValueError(f"At most {self.ADD_DOWNLOADS_MAX_ITEMS} items per call")
+        # 툴바 상태는 기본값으로만 읽고 바꾸지 않는다 — 옵션은 작업마다 따로 간다
+        base = self._main_window.toolbar.current_options()
+        results = []
+        seen = set()
+        for item in items:
+            url = item.get("url", "") if isinstance(item, dict) else ""
+            # 재생목록 URL은 video_id가 없으므로 URL로 중복을 가린다
+            video_id = extract_video_id(url) if url else ""
+            try:
+                if not url or not is_youtube_url(url):
+                    raise ValueError("a YouTube url is required")
+                # 항목·작업은 video_id 하나에 하나뿐이라 같은 호출 안의 중복은 서로 덮어쓴다
+                if (video_id or url) in seen:
+                    raise ValueError(f"duplicate of an earlier item: {video_id or url}")
+                options = self._item_options(item, base)
+            except (TypeError, ValueError) as e:
+                results.append({"url": url, "video_id": video_id,
+                                "status": "rejected", "error": str(e)})
+                continue
+            seen.add(video_id or url)
+            self._main_window._fetch_info(url, force=bool(item.get("force", False)),
+                                          options=options, quiet=True)
+            results.append({"url": url, "video_id": video_id, "status": "info_fetch_started",
+                            "options": options.to_dict()})
+        return results
+
+    # 요청 항목 키 → 허용 값 (ToolBar 메뉴에서 가져와 따로 관리하지 않는다)
+    VIDEO_FORMATS = tuple(f.lower() for f in ToolBar.VIDEO_FORMATS if f != "자동")
+    AUDIO_FORMATS = tuple(f.lower() for f in ToolBar.AUDIO_FORMATS if f != "자동")
+    QUALITIES = tuple(value for _, value in ToolBar.VIDEO_QUALITIES)
+    CODECS = tuple(ToolBar.CODECS)
+
+    def _item_options(self, item: dict, base: DownloadOptions) -> DownloadOptions:
+        """Toolbar defaults overridden by an item's type/format/quality/codec/
+        priority/save_path. Raises ValueError for values the app cannot use."""
+        opts = DownloadOptions.from_dict(base.to_dict())
+        opts.priority = 0
+        dtype = item.get("type") or item.get("download_type")
+        if dtype:
+            if dtype not in ("video", "audio"):
+                raise ValueError(f"Invalid type: {dtype}")
+            if dtype != opts.download_type:
+                # 종류가 바뀌면 툴바의 "자동" 형식과 같은 기본 형식을 쓴다
+                opts.fmt = "mp4" if dtype == "video" else "mp3"
+            opts.download_type = dtype
+        fmt = item.get("format")
+        if fmt and str(fmt).lower() not in ("auto", "자동"):
+            fmt = str(fmt).lower()
+            allowed = self.VIDEO_FORMATS if opts.download_type == "video" else self.AUDIO_FORMATS
+            if fmt not in allowed:
+                raise ValueError(f"Invalid format for {opts.download_type}: {fmt}")
+            opts.fmt = fmt
+        elif fmt:
+            opts.fmt = "mp4" if opts.download_type == "video" else "mp3"
+        quality = item.get("quality")
+        if quality:
+            quality = str(quality).lower()
+            if quality.isdigit():
+                quality += "p"
+            if quality not in self.QUALITIES:
+                raise ValueError(f"Invalid quality: {quality}")
+            opts.quality = quality
+        codec = item.get("codec")
+        if codec:
+            codec = str(codec).upper()
+            if codec not in self.CODECS:
+                raise ValueError(f"Invalid codec: {codec}")
+            opts.codec = codec
+        if item.get("priority") is not None:
+            opts.priority = int(item["priority"])
+        save_path = item.get("save_path")
+        if save_path:
+            save_path = os.path.expanduser(str(save_path))
+            if not os.path.isabs(save_path):
+                raise ValueError(f"save_path must be absolute: {save_path}")
+            opts.save_dir = save_path
+        return opts
+
+    def _handle_get_downloads(self, params: dict):
+        dl = self._main_window.download_list
+        since = params.get("since_version")
+        if since is None:
+            return [self._widget_to_dict(w) for w in dl.get_all_items()]
+        # 델타: since_version 이후 바뀐 항목과 제거된 id만 돌려준다
+        widgets, removed, version = dl.changes_since(int(since))
+        return {
+            "items": [self._widget_to_dict(w) for w in widgets],
+            "removed": removed if removed is not None else [],
+            "reset": removed is None,
+            "version": version,
+        }
 
     def _handle_get_download_status(self, params: dict) -> dict:
         video_id = params.get("video_id", "")
         if not video_id:
             raise ValueError("video_id is required")
-        widget = self._main_window.download_list.get_item(video_id)
+        mw = self._main_window
+        if video_id in mw._fetching_ids:
+            return {"video_id": video_id, "status": "fetching"}
+        widget = mw.download_list.get_item(video_id)
         if widget is None:
+            # 대기 작업은 시작될 때까지 목록에 항목이 없다
+            if video_id in mw._queued_ids:
+                return {"video_id": video_id, "status": "queued"}
             raise ValueError(f"Download not found: {video_id}")
         return self._widget_to_dict(widget)
 
@@ -137,8 +595,14 @@ class BridgeServer(QObject):
         video_id = params.get("video_id", "")
         if not video_id:
             raise ValueError("video_id is required")
-        self._main_window._cancel_download(video_id)
-        return {"status": "cancel_requested", "video_id": video_id}
+        return {"status": self._main_window._cancel_download(video_id), "video_id": video_id}
+
+    def _handle_cancel_downloads(self, params: dict) -> list:
+        video_ids = params.get("video_ids")
+        if not isinstance(video_ids, list) or not video_ids:
+            raise ValueError("video_ids must be a non-empty list")
+        return [{"video_id": vid, "status": self._main_window._cancel_download(vid)}
+                for vid in video_ids]
 
     def _handle_get_settings(self, params: dict) -> dict:
         tb = self._main_window.toolbar
@@ -188,23 +652,206 @@ class BridgeServer(QObject):
 
         return {"updated": updated}
 
-    def _handle_get_history(self, params: dict) -> list:
-        records = self._main_window.db.get_all_records()
-        return [
-            {
-                "video_id": r.get("video_id", ""),
-                "title": r.get("title", ""),
-                "channel": r.get("channel", ""),
-                "url": r.get("url", ""),
-                "file_path": r.get("file_path", ""),
-                "format": r.get("format", ""),
-                "quality": r.get("quality", ""),
-                "filesize": r.get("filesize", 0),
-                "duration": r.get("duration", 0),
-                "download_type": r.get("download_type", "video"),
-            }
-            for r in records
-        ]
+    # get_history 한 페이지 최대 크기
+    HISTORY_MAX_LIMIT = 1000
+
+    def _handle_get_history(self, params: dict) -> dict:
+        limit = max(1, min(int(params.get("limit", 100)), self.HISTORY_MAX_LIMIT))
+        records, next_cursor = self._main_window.db.get_history_page(
+            limit=limit,
+            cursor=params.get("cursor") or None,
+            since=self._parse_time(params.get("since")),
+            until=self._parse_time(params.get("until")),
+            channel=params.get("channel") or None,
+            download_type=params.get("download_type") or None,
+            status=params.get("status") or None,
+        )
+        return {
+            "items": [self._record_to_dict(r) for r in records],
+            "next_cursor": next_cursor,
+        }
+
+    def _handle_search_history(self, params: dict) -> list:
+        query = params.get("query", "")
+        if not query.strip():
+            raise ValueError("query is required")
+        limit = max(1, min(int(params.get("limit", 50)), self.HISTORY_MAX_LIMIT))
+        records = self._main_window.db.search(query, limit=limit)
+        return [self._record_to_dict(r) for r in records]
+
+    def _handle_get_stats(self, params: dict) -> dict:
+        days = max(1, min(int(params.get("days", 30)), 3660))
+        top = max(0, min(int(params.get("top_channels", 10)), 100))
+        return self._main_window.db.get_stats(days=days, top_channels=top)
+
+    def _handle_hello(self, sock: BridgeSocket, params: dict) -> dict:
+        """Negotiate the payload codec; applies to messages after this response."""
+        decoder = self._decoders.get(sock)
+        framing = decoder.framing if decoder and decoder.framing else LINE
+        codec = negotiate(params, binary_ok=framing == LENGTH)
+        self._pending_codecs[sock] = codec
+        return {
+            "encoding": codec.encoding,
+            "compression": codec.compression,
+            "compress_threshold": codec.threshold,
+            "framing": framing,
+        }
+
+    # wait_for_downloads 최대 대기 시간 (초)
+    WAIT_MAX_TIMEOUT = 3600
+
+    def _handle_wait_for_downloads(self, sock: BridgeSocket, req_id, params: dict):
+        """Reply now if the condition already holds, else park until it does
+        or the timeout expires. The reply is written via the worker pool."""
+        video_ids = params.get("video_ids")
+        if not isinstance(video_ids, list) or not video_ids:
+            raise ValueError("video_ids must be a non-empty list")
+        mode = params.get("mode", "all")
+        if mode not in ("all", "any"):
+            raise ValueError(f"Invalid mode: {mode}")
+        timeout = max(0.0, min(float(params.get("timeout", 300)), self.WAIT_MAX_TIMEOUT))
+
+        waiter = DownloadWaiter(sock, req_id, tuple(dict.fromkeys(video_ids)), mode)
+        if self._wait_satisfied(waiter) or timeout == 0:
+            self._reply_wait(waiter, timed_out=not self._wait_satisfied(waiter))
+            return None
+        for vid in waiter.video_ids:
+            self._waiters.setdefault(vid, set()).add(waiter)
+        waiter.timer = QTimer(self)
+        waiter.timer.setSingleShot(True)
+        waiter.timer.timeout.connect(lambda w=waiter: self._finish_wait(w, timed_out=True))
+        waiter.timer.start(int(timeout * 1000))
+        return None
+
+    def _check_waiters(self, video_id: str):
+        for waiter in list(self._waiters.get(video_id, ())):
+            if self._wait_satisfied(waiter):
+                self._finish_wait(waiter, timed_out=False)
+
+    def _wait_status(self, video_id: str) -> str:
+        mw = self._main_window
+        # 다시 받는 영상은 예전 항목이 목록에 남아 있어도 가져오기가 우선이다
+        if video_id in mw._fetching_ids:
+            return "fetching"
+        widget = mw.download_list.get_item(video_id)
+        if widget is not None:
+            return widget.video_info.status
+        return "queued" if video_id in mw._queued_ids else "not_found"
+
+    def _wait_satisfied(self, waiter: DownloadWaiter) -> bool:
+        done = (self._wait_status(vid) in TERMINAL_STATUSES for vid in waiter.video_ids)
+        return any(done) if waiter.mode == "any" else all(done)
+
+    def _wait_snapshot(self, video_ids: tuple) -> dict:
+        """video_id → item built from in-memory state (GUI thread), or None for
+        ids in neither the list, the queue nor the fetch queue."""
+        mw = self._main_window
+        snapshot = {}
+        for vid in video_ids:
+            widget = mw.download_list.get_item(vid)
+            if vid in mw._fetching_ids:
+                snapshot[vid] = {"video_id": vid, "status": "fetching"}
+            elif widget is not None:
+                vi = widget.video_info
+                snapshot[vid] = {"video_id": vid, "title": vi.title, "status": vi.status,
+                                 "downloaded_path": vi.downloaded_path,
+                                 "error_message": vi.error_message,
+                                 "record_id": vi.record_id}
+            elif vid in mw._queued_ids:
+                snapshot[vid] = {"video_id": vid, "status": "queued"}
+            else:
+                snapshot[vid] = None
+        return snapshot
+
+    @staticmethod
+    def _wait_items(db, snapshot: dict) -> list:
+        """Fill the ids missing from the snapshot (worker thread): from history
+        (items the retention policy already removed) or the jobs table (queued
+        jobs cancelled before they got a list item), else not_found."""
+        missing = [vid for vid, item in snapshot.items() if item is None]
+        # 목록에 없는 항목이 있을 때만 DB를 읽는다 (응답마다 한 번)
+        records = db.latest_records(missing) if missing else {}
+        failed = {job["video_id"]: job for job in db.get_jobs(("error",), video_ids=missing)} \
+            if missing else {}
+        items = []
+        for vid, item in snapshot.items():
+            if item is not None:
+                items.append(item)
+            elif vid in records:
+                r = records[vid]
+                items.append({"video_id": vid, "title": r["title"] or "",
+                              "status": r["status"] or "completed",
+                              "downloaded_path": r["file_path"] or "",
+                              "error_message": "", "record_id": r["id"]})
+            elif vid in failed:
+                job = failed[vid]
+                items.append({"video_id": vid, "title": job["spec"].get("title", ""),
+                              "status": "error", "downloaded_path": "",
+                              "error_message": job["error_message"], "record_id": 0})
+            else:
+                items.append({"video_id": vid, "status": "not_found"})
+        return items
+
+    def _reply_wait(self, waiter: DownloadWaiter, timed_out: bool):
+        """Answer waiter: states are captured now, DB lookups run on the pool
+        (reading there may wait for the writer to flush)."""
+        snapshot = self._wait_snapshot(waiter.video_ids)
+        db = self._main_window.db
+
+        def produce():
+            return {"jsonrpc": "2.0", "id": waiter.req_id, "result": {
+                "done": not timed_out,
+                "timed_out": timed_out,
+                "items": self._wait_items(db, snapshot),
+            }}
+
+        self._submit(waiter.sock, produce)
+
+    def _finish_wait(self, waiter: DownloadWaiter, timed_out: bool):
+        self._unpark(waiter)
+        # 응답을 쓸 때 연결이 남아 있는지는 _on_response_ready가 확인한다
+        self._reply_wait(waiter, timed_out)
+
+    def _unpark(self, waiter: DownloadWaiter):
+        if waiter.timer:
+            waiter.timer.stop()
+            waiter.timer.deleteLater()
+            waiter.timer = None
+        for vid in waiter.video_ids:
+            waiters = self._waiters.get(vid)
+            if waiters is not None:
+                waiters.discard(waiter)
+                if not waiters:
+                    del self._waiters[vid]
+
+    def _handle_subscribe(self, sock: BridgeSocket, params: dict) -> dict:
+        events = params.get("events") or DOWNLOAD_EVENTS
+        unknown = set(events) - set(DOWNLOAD_EVENTS)
+        if unknown:
+            raise ValueError(f"Unknown events: {', '.join(sorted(unknown))}")
+        video_ids = params.get("video_ids")
+        max_rate = max(0.1, min(float(params.get("max_rate", 20.0)), 1000.0))
+        sub = Subscription(
+            events=frozenset(events),
+            video_ids=frozenset(video_ids) if video_ids else None,
+            download_type=params.get("download_type") or None,
+            progress_interval=max(0.1, float(params.get("progress_interval", 1.0))),
+            max_rate=max_rate,
+            tokens=max_rate,
+            refilled_at=time.monotonic(),
+        )
+        self._subscriptions[sock] = sub
+        return {
+            "events": sorted(sub.events),
+            "video_ids": sorted(sub.video_ids) if sub.video_ids else None,
+            "download_type": sub.download_type,
+            "progress_interval": sub.progress_interval,
+            "max_rate": sub.max_rate,
+        }
+
+    def _handle_unsubscribe(self, sock: BridgeSocket, params: dict) -> dict:
+        sub = self._subscriptions.pop(sock, None)
+        return {"unsubscribed": sub is not None, "dropped": sub.dropped if sub else 0}
 
     def _handle_pause_all(self, params: dict) -> dict:
         self._main_window._pause_all()
@@ -217,7 +864,36 @@ class BridgeServer(QObject):
     # ── Helpers ───────────────────────────────────────────────
 
     @staticmethod
-    def _widget_to_dict(widget) -> dict:
+    def _parse_time(value) -> Optional[int]:
+        """Epoch seconds or an ISO 8601 string (naive = local time) → epoch seconds."""
+        if value is None or value == "":
+            return None
+        if isinstance(value, (int, float)):
+            return int(value)
+        try:
+            return int(datetime.fromisoformat(str(value)).timestamp())
+        except ValueError:
+            raise ValueError(f"Invalid time: {value!r}")
+
+    @staticmethod
+    def _record_to_dict(r: dict) -> dict:
+        return {
+            "id": r.get("id", 0),
+            "video_id": r.get("video_id", ""),
+            "title": r.get("title", ""),
+            "channel": r.get("channel", ""),
+            "url": r.get("url", ""),
+            "file_path": r.get("file_path", ""),
+            "format": r.get("format", ""),
+            "quality": r.get("quality", ""),
+            "filesize": r.get("filesize", 0),
+            "duration": r.get("duration", 0),
+            "download_type": r.get("download_type", "video"),
+            "status": r.get("status", "completed"),
+            "created_at": r.get("created_at", 0),
+        }
+
+    def _widget_to_dict(self, widget) -> dict:
         vi = widget.video_info
         return {
             "video_id": vi.video_id,
@@ -234,4 +910,5 @@ class BridgeServer(QObject):
             "quality": vi.selected_quality,
             "downloaded_path": vi.downloaded_path,
             "error_message": vi.error_message,
+            "version": self._main_window.download_list.item_version(vi.video_id),
         }
@@ -0,0 +1,133 @@
+"""Payload encodings for the bridge protocol (shared by server and client).
+
+JSON is the default and always available. A client may negotiate a compact
+binary encoding (MessagePack or CBOR) and compression (zstd or zlib) with a
+"hello" request as the first message on a connection; both sides then switch
+codec for everything after the hello response. msgpack, cbor2 and zstandard
+are optional — only what is installed on both sides is offered.
+
+Binary encodings and compressed payloads may contain b"\\n", so anything
+other than plain JSON requires length-prefixed framing.
+"""
+
+import json
+import zlib
+from typing import Any, Dict, List, Optional
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import cbor2
+except ImportError:
+    cbor2 = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+JSON = "json"
+
+# 이 크기 이상인 메시지만 압축한다 (작은 응답은 압축 비용이 더 크다)
+COMPRESS_THRESHOLD = 1024
+
+# 압축을 쓰는 연결에서 각 메시지 앞에 붙는 1바이트 플래그
+_RAW = b"\x00"
+_COMPRESSED = b"\x01"
+
+
+def available_encodings() -> List[str]:
+    """Installed encodings, most compact first."""
+    names = []
+    if msgpack is not None:
+        names.append("msgpack")
+    if cbor2 is not None:
+        names.append("cbor")
+    names.append(JSON)
+    return names
+
+
+def available_compressions() -> List[str]:
+    return (["zstd"] if zstandard is not None else []) + ["zlib"]
+
+
+class Codec:
+    """Encodes messages to bytes and back for one connection."""
+
+    def __init__(self, encoding: str = JSON, compression: Optional[str] = None,
+                 threshold: int = COMPRESS_THRESHOLD):
+        if encoding not in available_encodings():
+            raise ValueError(f"Encoding not available: {encoding}")
+        if compression is not None and compression not in available_compressions():
+            raise ValueError(f"Compression not available: {compression}")
+        self.encoding = encoding
+        self.compression = compression
+        self.threshold = threshold
+        if compression == "zstd":
+            self._compress = zstandard.ZstdCompressor(level=3).compress
+            self._decompress = zstandard.ZstdDecompressor().decompress
+        elif compression == "zlib":
+            self._compress = zlib.compress
+            self._decompress = zlib.decompress
+
+    @property
+    def is_default(self) -> bool:
+        return self.encoding == JSON and self.compression is None
+
+    @property
+    def key(self) -> tuple:
+        return self.encoding, self.compression
+
+    def dumps(self, obj: Any) -> bytes:
+        if self.encoding == "msgpack":
+            return msgpack.packb(obj, use_bin_type=True)
+        if self.encoding == "cbor":
+            return cbor2.dumps(obj)
+        return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+    def loads(self, data: bytes) -> Any:
+        if self.encoding == "msgpack":
+            return msgpack.unpackb(data, raw=False)
+        if self.encoding == "cbor":
+            return cbor2.loads(data)
+        return json.loads(data)
+
+    def encode(self, obj: Any) -> bytes:
+        payload = self.dumps(obj)
+        if self.compression is None:
+            return payload
+        if len(payload) >= self.threshold:
+            return _COMPRESSED + self._compress(payload)
+        return _RAW + payload
+
+    def decode(self, data: bytes) -> Any:
+        """Bytes → message; raises ValueError on malformed input."""
+        try:
+            if self.compression is not None:
+                flag, data = data[:1], data[1:]
+                if flag == _COMPRESSED:
+                    data = self._decompress(data)
+                elif flag != _RAW:
+                    raise ValueError("Unknown compression flag")
+            return self.loads(data)
+        except ValueError:
+            raise
+        except Exception as e:  # zlib.error, zstd.ZstdError 등
+            raise ValueError(f"Cannot decode message: {e}") from e
+
+
+def negotiate(offer: Dict[str, Any], binary_ok: bool) -> Codec:
+    """Pick the first encoding/compression in the client's preference lists
+    that this side supports. binary_ok is False on newline-framed
+    connections, which can only carry plain JSON."""
+    encoding, compression = JSON, None
+    if binary_ok:
+        supported = available_encodings()
+        encoding = next((e for e in offer.get("encodings") or () if e in supported), JSON)
+        supported = available_compressions()
+        compression = next((c for c in offer.get("compression") or () if c in supported), None)
+    threshold = int(offer.get("compress_threshold") or COMPRESS_THRESHOLD)
+    return Codec(encoding, compression, threshold=max(0, threshold))
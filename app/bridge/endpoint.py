@@ -0,0 +1,18 @@
+"""Where the bridge listens (shared by server and client)."""
+
+import os
+import sys
+import tempfile
+
+
+def local_socket_name(port: int) -> str:
+    """QLocalServer name for the bridge on this port.
+
+    A Unix domain socket path in the temp directory (per user), or a named
+    pipe name on Windows. The port is part of the name so test/benchmark
+    servers on other ports do not collide with the app.
+    """
+    if sys.platform == "win32":
+        return f"stock-video-automator-bridge-{port}"
+    return os.path.join(tempfile.gettempdir(),
+                        f"stock-video-automator-bridge-{os.getuid()}-{port}.sock")
@@ -0,0 +1,127 @@
+"""Message framing for the bridge protocol (shared by server and client).
+
+Two framings are supported on the same port:
+
+* line   — one message per line, terminated by b"\\n" (the original protocol)
+* length — a 4-byte big-endian length followed by the message bytes
+
+The server detects the framing from the first byte of a connection: a JSON
+message never starts with 0x00, while a length prefix always does because
+messages are limited to MAX_MESSAGE_SIZE (< 16 MiB).
+"""
+
+import struct
+from typing import BinaryIO, List, Optional
+
+LINE = "line"
+LENGTH = "length"
+
+# 한 메시지의 최대 크기 — 길이 접두사의 첫 바이트가 항상 0이 되도록 16 MiB 미만
+MAX_MESSAGE_SIZE = 8 * 1024 * 1024
+
+_LENGTH = struct.Struct(">I")
+
+
+class FrameTooLarge(ValueError):
+    """A message exceeded MAX_MESSAGE_SIZE; the connection cannot be resynced."""
+
+
+def encode_frame(payload: bytes, framing: str = LINE) -> bytes:
+    if framing == LENGTH:
+        return _LENGTH.pack(len(payload)) + payload
+    return payload + b"\n"
+
+
+def detect_framing(first_byte: int) -> str:
+    return LENGTH if first_byte == 0 else LINE
+
+
+class FrameDecoder:
+    """Incremental decoder: feed() received bytes, get complete messages back.
+
+    Bytes are appended to one bytearray and consumed by advancing an offset;
+    the buffer is compacted only once the consumed prefix outweighs the rest,
+    and a partial line is never rescanned from its start. This keeps large or
+    fragmented payloads linear instead of re-copying the tail per message.
+    """
+
+    def __init__(self, framing: Optional[str] = None, max_size: int = MAX_MESSAGE_SIZE):
+        self.framing = framing  # None = 첫 바이트로 판별
+        self.max_size = max_size
+        self._buf = bytearray()
+        self._pos = 0  # 아직 처리하지 않은 첫 바이트
+        self._scan = 0  # 줄 모드: 개행을 찾기 시작할 위치 (이미 본 구간은 건너뜀)
+
+    def feed(self, data: bytes) -> List[bytes]:
+        if not data:
+            return []
+        if self.framing is None:
+            self.framing = detect_framing(data[0])
+        self._buf += data
+        messages = self._split_lines() if self.framing == LINE else self._split_lengths()
+        self._compact()
+        return messages
+
+    @property
+    def buffered(self) -> int:
+        return len(self._buf) - self._pos
+
+    def _split_lines(self) -> List[bytes]:
+        buf, messages = self._buf, []
+        start = max(self._pos, self._scan)
+        while True:
+            end = buf.find(b"\n", start)
+            if end < 0:
+                break
+            if end - self._pos > self.max_size:
+                raise FrameTooLarge(f"Message exceeds {self.max_size} bytes")
+            messages.append(bytes(buf[self._pos:end]))
+            self._pos = start = end + 1
+        if len(buf) - self._pos > self.max_size:
+            raise FrameTooLarge(f"Message exceeds {self.max_size} bytes")
+        self._scan = len(buf)
+        return messages
+
+    def _split_lengths(self) -> List[bytes]:
+        buf, messages = self._buf, []
+        while len(buf) - self._pos >= 4:
+            (size,) = _LENGTH.unpack_from(buf, self._pos)
+            if size > self.max_size:
+                raise FrameTooLarge(f"Message of {size} bytes exceeds {self.max_size}")
+            end = self._pos + 4 + size
+            if end > len(buf):
+                break
+            messages.append(bytes(buf[self._pos + 4:end]))
+            self._pos = end
+        return messages
+
+    def _compact(self):
+        if self._pos == len(self._buf):
+            self._buf.clear()
+            self._pos = self._scan = 0
+        elif self._pos > len(self._buf) // 2:
+            del self._buf[:self._pos]
+            self._scan = max(0, self._scan - self._pos)
+            self._pos = 0
+
+
+def read_frame(reader: BinaryIO, framing: str = LINE,
+               max_size: int = MAX_MESSAGE_SIZE) -> Optional[bytes]:
+    """Read one message from a buffered binary reader; None at end of stream."""
+    if framing == LENGTH:
+        header = reader.read(4)
+        if len(header) < 4:
+            return None
+        (size,) = _LENGTH.unpack(header)
+        if size > max_size:
+            raise FrameTooLarge(f"Message of {size} bytes exceeds {max_size}")
+        payload = reader.read(size)
+        return payload if len(payload) == size else None
+    line = reader.readline(max_size + 1)
+    if not line:
+        return None
+    if not line.endswith(b"\n"):
+        if len(line) > max_size:
+            raise FrameTooLarge(f"Message exceeds {max_size} bytes")
+        return None  # 개행 없이 끊긴 마지막 조각
+    return line[:-1]
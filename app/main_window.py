@@ -1,13 +1,15 @@
+import heapq
+import itertools
 import os
 import sys
-from collections import deque
-from typing import Dict, Optional
+import time
+from typing import Dict, Optional, Set
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QStatusBar, QApplication,
     QMessageBox, QInputDialog, QMenuBar, QMenu, QFileDialog,
-    QSystemTrayIcon,
+    QSystemTrayIcon, QLabel,
 )
-from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtCore import Qt, QEvent, QThread, QTimer, pyqtSignal
 from PyQt6.QtGui import QAction, QDesktopServices, QKeySequence, QIcon
 
 from app.widgets.toolbar import ToolBar
@@ -16,12 +18,23 @@ from app.widgets.download_list import DownloadList
 from app.widgets.download_item import DownloadItemWidget
 from app.widgets.control_panel import ControlPanel
 from app.models.video_info import VideoInfo
+from app.models.download_options import DownloadOptions
 from app.models.database import DownloadDatabase
-from app.utils.helpers import is_youtube_url, resource_path
+from app.utils.helpers import (
+    extract_video_id, format_speed, is_playlist_url, is_youtube_url, resource_path,
+)
 from app.utils.settings_manager import SettingsManager
 
 
 class MainWindow(QMainWindow):
+    # 다운로드 상태 전이 (event, video_id, data) — 브리지 구독자에게 전달된다
+    # event: queued / started / progress / paused / finished / error
+    download_event = pyqtSignal(str, str, dict)
+    # 쓰기 스레드에서 읽어 온 대기 작업 (jobs 행 목록)
+    _queued_jobs_loaded = pyqtSignal(list)
+    # 단일 영상의 정보 가져오기가 끝나거나 취소됨 (video_id) — 시작·건너뜀·실패 모두
+    fetch_done = pyqtSignal(str)
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Stock Video Automator")
@@ -37,10 +50,28 @@ class MainWindow(QMainWindow):
         self._settings = SettingsManager()
         self.db = DownloadDatabase()
         self._workers: Dict[str, DownloadWorker] = {}
-        self._download_queue: deque = deque()  # queued VideoInfo objects
+        self._started_at: Dict[str, float] = {}  # video_id → 워커 시작 시각 (처리량 통계)
+        # 대기 작업은 jobs 테이블에만 두고 메모리에는 id만 — 슬롯이 비면 불러온다
+        self._queued_ids: Set[str] = set()
+        self._queue_loading = False
+        self._queue_submitted: Set[str] = set()  # 불러오기를 요청할 때의 _queued_ids
         self._info_worker: Optional[InfoWorker] = None
+        # 정보 추출 대기열: (-priority, 순번, url, options, force, quiet)
+        self._fetch_queue: list = []
+        self._fetch_seq = itertools.count()
+        # 정보를 가져오는 중(대기 포함)인 단일 영상 URL의 video_id — 아직 목록·대기열에 없다
+        self._fetching_ids: Set[str] = set()
         self._update_worker: Optional[YtDlpUpdateWorker] = None
         self._force_quit = False
+        self._ui_suspended = False
+        self._sort_pending = False
+        # 이 id 이상인 이력은 모두 목록에 있음 (None = 더 오래된 이력 없음)
+        self._history_cursor: Optional[int] = None
+        # 검색 때문에 목록에 불러온 이력 항목 (검색이 바뀌거나 지워지면 다시 내린다)
+        self._search_ids: Set[str] = set()
+        # 이미 받은 영상 건너뛰기 적중률 (실행 중 누적)
+        self._skip_hits = 0
+        self._skip_checked = 0
 
         self._setup_menubar()
         self._setup_ui()
@@ -51,9 +82,18 @@ class MainWindow(QMainWindow):
 
         # 창 표시 후 무거운 작업 지연 실행
         QTimer.singleShot(0, self._load_history)
+        QTimer.singleShot(0, self._restore_jobs)
         QTimer.singleShot(100, self._auto_check_ytdlp_update)
         QTimer.singleShot(200, self._check_dependencies)
 
+        # 이력 파일 존재 여부 점검 (시작 후 잠시 뒤, 이후 주기적으로)
+        self._library_scanner = None
+        self._scan_timer = QTimer(self)
+        self._scan_timer.setInterval(self.LIBRARY_SCAN_INTERVAL_MS)
+        self._scan_timer.timeout.connect(self._start_library_scan)
+        self._scan_timer.start()
+        QTimer.singleShot(5000, self._start_library_scan)
+
     def _setup_menubar(self):
         menubar = self.menuBar()
 
@@ -196,6 +236,7 @@ class MainWindow(QMainWindow):
 
         # Download list
         self.download_list = DownloadList()
+        self.download_list.set_retention_limit(self._settings.max_completed_items)
         layout.addWidget(self.download_list, stretch=1)
 
         # Control panel (overlay, right-side)
@@ -206,6 +247,9 @@ class MainWindow(QMainWindow):
         self.status_bar = QStatusBar()
         self.setStatusBar(self.status_bar)
         self.status_bar.showMessage("준비")
+        # 대기 작업은 목록에 항목을 만들지 않고 개수만 표시한다
+        self.lbl_queued = QLabel()
+        self.status_bar.addPermanentWidget(self.lbl_queued)
 
     def _setup_tray(self):
         """Initialize system tray icon with context menu."""
@@ -235,6 +279,11 @@ class MainWindow(QMainWindow):
         if self._settings.run_in_background:
             self.tray_icon.show()
 
+        # 창이 숨겨진 동안에만 트레이 툴팁에 요약을 갱신
+        self._tray_timer = QTimer(self)
+        self._tray_timer.setInterval(2000)
+        self._tray_timer.timeout.connect(self._update_tray_tooltip)
+
     def _tray_show(self):
         self.showNormal()
         self.activateWindow()
@@ -247,11 +296,54 @@ class MainWindow(QMainWindow):
         if reason == QSystemTrayIcon.ActivationReason.DoubleClick:
             self._tray_show()
 
+    # ── Hidden-window (tray) mode ─────────────────────────────
+
+    def _update_ui_suspended(self):
+        """Suspend per-item UI updates while the window is hidden or minimized."""
+        suspended = not self.isVisible() or self.isMinimized()
+        if suspended == self._ui_suspended:
+            return
+        self._ui_suspended = suspended
+        self.download_list.set_updates_suspended(suspended)
+
+        if suspended:
+            self._update_tray_tooltip()
+            self._tray_timer.start()
+        else:
+            self._tray_timer.stop()
+            self.tray_icon.setToolTip("Stock Video Automator")
+            if self._sort_pending:
+                self._reapply_sort()
+
+    def _update_tray_tooltip(self):
+        if not self.tray_icon.isVisible():
+            return
+        dl = self.download_list
+        speed = sum(
+            w.video_info.speed or 0
+            for w in dl.get_items_by_status("downloading")
+        )
+        parts = [f"다운로드 중 {len(self._workers)}개"]
+        if self._queued_ids:
+            parts.append(f"대기 {len(self._queued_ids)}개")
+        parts.append(f"완료 {dl.status_count('completed')}개")
+        errors = dl.status_count("error")
+        if errors:
+            parts.append(f"오류 {errors}개")
+        tooltip = "Stock Video Automator\n" + " · ".join(parts)
+        if speed:
+            tooltip += f"\n{format_speed(speed)}"
+        self.tray_icon.setToolTip(tooltip)
+
     def _connect_signals(self):
         self.toolbar.paste_clicked.connect(self._on_paste)
         self.tab_bar.tab_changed.connect(self._on_tab_changed)
         self.download_list.count_changed.connect(self.tab_bar.set_count)
+        self.download_list.tab_counts_changed.connect(self.tab_bar.set_tab_counts)
         self.download_list.cancel_requested.connect(self._cancel_download)
+        self.download_list.remove_requested.connect(self._on_item_removed)
+        self._queued_jobs_loaded.connect(self._on_queued_jobs_loaded)
+        self.download_list.history_requested.connect(self._load_more_history)
 
         # Control panel signals
         self.control_panel.preferences_requested.connect(self._show_preferences)
@@ -331,29 +423,142 @@ class MainWindow(QMainWindow):
     # ── Load history ───────────────────────────────────────────
 
     def _load_history(self):
-        records = self.db.get_all_records()
+        limit = min(100, self._settings.max_completed_items)
+        records = self.db.get_records_before(limit=limit)
         for rec in reversed(records):  # oldest first
-            vi = VideoInfo(
-                url=rec.get("url", ""),
-                video_id=rec.get("video_id", ""),
-                title=rec.get("title", ""),
-                channel=rec.get("channel", ""),
-                duration=rec.get("duration") or 0,
-                thumbnail_url=rec.get("thumbnail_url", ""),
-                filesize_approx=rec.get("filesize") or 0,
-                ext=rec.get("format", "mp4"),
-                status="completed",
-                downloaded_path=rec.get("file_path", ""),
-                download_type=rec.get("download_type", "video"),
-                selected_quality=rec.get("quality", ""),
-            )
-            widget = self.download_list.add_item(vi)
-            widget.set_completed(vi.downloaded_path)
+            self._add_history_item(rec)
 
         count = len(records)
         if count > 0:
+            self._history_cursor = records[-1]["id"]
             self.status_bar.showMessage(f"이전 다운로드 {count}개 로드됨")
 
+    # 스크롤로 한 번에 다시 불러올 이력 개수
+    HISTORY_PAGE_SIZE = 50
+
+    def _load_more_history(self):
+        """Page older (evicted or never loaded) history back into the list."""
+        if self._history_cursor is None:
+            return
+        records = self.db.get_records_before(
+            self._history_cursor, limit=self.HISTORY_PAGE_SIZE
+        )
+        if not records:
+            self._history_cursor = None
+            return
+        self._history_cursor = records[-1]["id"]
+
+        infos = [
+            self._history_video_info(rec) for rec in reversed(records)
+            if rec.get("video_id")
+            and self.download_list.get_item(rec["video_id"]) is None
+        ]
+        for widget in self.download_list.add_items(infos, prepend=True):
+            widget.set_completed(widget.video_info.downloaded_path)
+        self._reapply_sort()
+
+    def _enforce_retention(self):
+        evicted = self.download_list.enforce_retention()
+        if evicted:
+            floor = max(evicted) + 1
+            if self._history_cursor is None or floor > self._history_cursor:
+                self._history_cursor = floor
+
+    @staticmethod
+    def _history_video_info(rec: dict) -> VideoInfo:
+        return VideoInfo(
+            url=rec.get("url", ""),
+            video_id=rec.get("video_id", ""),
+            title=rec.get("title", ""),
+            channel=rec.get("channel", ""),
+            duration=rec.get("duration") or 0,
+            thumbnail_url=rec.get("thumbnail_url", ""),
+            filesize_approx=rec.get("filesize") or 0,
+            ext=rec.get("format", "mp4"),
+            status="completed",
+            downloaded_path=rec.get("file_path", ""),
+            download_type=rec.get("download_type", "video"),
+            selected_quality=rec.get("quality", ""),
+            record_id=rec.get("id") or 0,
+            file_missing=rec.get("file_exists") == 0,
+        )
+
+    def _add_history_item(self, rec: dict) -> DownloadItemWidget:
+        vi = self._history_video_info(rec)
+        widget = self.download_list.add_item(vi)
+        widget.set_completed(vi.downloaded_path)
+        return widget
+
+    # ── Library scan ──────────────────────────────────────────
+
+    LIBRARY_SCAN_INTERVAL_MS = 10 * 60 * 1000
+
+    def _start_library_scan(self):
+        if self._library_scanner and self._library_scanner.isRunning():
+            return
+        from app.workers.library_scanner import LibraryScanner
+        self._library_scanner = LibraryScanner(self.db)
+        self._library_scanner.file_states_changed.connect(self._on_file_states_changed)
+        self._library_scanner.start(QThread.Priority.LowestPriority)
+
+    def _on_file_states_changed(self, states: dict):
+        for video_id, exists in states.items():
+            widget = self.download_list.get_item(video_id)
+            if widget and widget.video_info.status == "completed":
+                widget.set_file_missing(not exists)
+        missing = sum(1 for exists in states.values() if not exists)
+        if missing:
+            self.status_bar.showMessage(f"파일이 없는 이력 {missing}개 발견", 5000)
+
+    # ── Durable jobs ──────────────────────────────────────────
+
+    # jobs 테이블에 저장하는 VideoInfo 필드 (formats 등 큰 추출 결과는 제외)
+    JOB_SPEC_FIELDS = (
+        "url", "video_id", "title", "channel", "duration", "thumbnail_url",
+        "is_playlist", "playlist_title", "playlist_index", "playlist_count",
+        "selected_format", "selected_quality", "filesize_approx", "resolution",
+        "fps", "ext", "download_type",
+    )
+
+    def _save_job(self, video_info: VideoInfo, state: str):
+        spec = {name: getattr(video_info, name) for name in self.JOB_SPEC_FIELDS}
+        self.db.save_job(video_info.video_id, video_info.url, spec,
+                         video_info.options.to_dict(), state)
+
+    def _job_video_info(self, job: dict) -> VideoInfo:
+        vi = VideoInfo(**{k: v for k, v in job["spec"].items()
+                          if k in self.JOB_SPEC_FIELDS})
+        vi.options = DownloadOptions.from_dict(job["options"])
+        vi.partial_path = job.get("partial_path", "")
+        return vi
+
+    def _restore_jobs(self):
+        """Re-queue jobs left over from the last run without re-extracting.
+
+        Only interrupted (downloading/paused) jobs are loaded; queued ones stay
+        in the jobs table and are pulled in by _process_queue.
+        """
+        # 실패·취소된 작업 행은 이번 실행 동안 wait_for_downloads에 오류를 알리는
+        # 용도뿐이다 — 목록 항목 없이 남은 이전 실행의 행은 여기서 정리한다
+        self.db.delete_jobs(("error",))
+        jobs = self.db.get_jobs(("downloading", "paused"))
+        queued = self.db.get_job_ids(("queued",))
+        if not jobs and not queued:
+            return
+        # 중단된 작업이 대기열보다 먼저 슬롯을 받는다
+        for job in jobs:
+            vi = self._job_video_info(job)
+            if job["state"] == "downloading":
+                self._start_download(vi)
+            else:
+                widget = self.download_list.add_item(vi)
+                widget.set_status("paused")
+                widget.lbl_status.setText("일시정지")
+        self._queued_ids.update(queued)
+        self._update_queued_label()
+        self._process_queue()
+        self.status_bar.showMessage(f"이전 작업 {len(jobs) + len(queued)}개 복원됨")
+
     # ── Paste / URL handling ─────────────────────────────────
 
     def _on_paste(self):
@@ -373,94 +578,272 @@ class MainWindow(QMainWindow):
 
         self._fetch_info(url)
 
-    def _fetch_info(self, url: str):
+    def _fetch_info(self, url: str, force: bool = False,
+                    options: Optional[DownloadOptions] = None, quiet: bool = False):
+        """Queue an info fetch that then starts downloading with options.
+
+        force re-downloads what is already on disk; options default to the
+        toolbar's current choices; quiet reports errors in the status bar
+        only (bridge requests). Fetches run one at a time, highest priority
+        first.
+        """
+        if options is None:
+            options = self.toolbar.current_options()
+        heapq.heappush(self._fetch_queue,
+                       (-options.priority, next(self._fetch_seq), url, options, force, quiet))
+        vid = self._single_video_id(url)
+        if vid:
+            self._fetching_ids.add(vid)
         if self._info_worker and self._info_worker.isRunning():
-            QMessageBox.information(self, "알림", "이미 정보를 가져오는 중입니다.")
+            self.status_bar.showMessage(f"정보 가져오기 대기 중: {len(self._fetch_queue)}개")
+            return
+        self._next_fetch()
+
+    def _next_fetch(self):
+        if not self._fetch_queue or (self._info_worker and self._info_worker.isRunning()):
             return
+        _, _, url, options, force, quiet = heapq.heappop(self._fetch_queue)
 
         self.status_bar.showMessage("영상 정보를 가져오는 중...")
         from app.workers.info_worker import InfoWorker
-        self._info_worker = InfoWorker(url)
-        self._info_worker.info_ready.connect(self._on_info_ready)
-        self._info_worker.playlist_ready.connect(self._on_playlist_ready)
-        self._info_worker.error.connect(self._on_info_error)
-        self._info_worker.status_message.connect(self.status_bar.showMessage)
-        self._info_worker.start()
-
-    def _on_info_ready(self, video_info: VideoInfo):
-        video_info.download_type = self.toolbar.download_type
-        video_info.selected_quality = self.toolbar.quality
-        video_info.ext = self.toolbar.format
-
-        widget = self.download_list.add_item(video_info)
+        lookup = None
+        if self._settings.skip_downloaded and not force:
+            lookup = self._downloaded_lookup(options)
+        worker = InfoWorker(url, lookup=lookup)
+        worker.already_downloaded.connect(self._on_already_downloaded)
+        worker.info_ready.connect(
+            lambda vi, o=options, w=worker: self._on_info_ready(vi, o, w.discarded))
+        worker.playlist_ready.connect(lambda videos, o=options: self._on_playlist_ready(videos, o))
+        worker.error.connect(lambda msg, q=quiet: self._on_info_error(msg, q))
+        worker.status_message.connect(self.status_bar.showMessage)
+        # 결과 시그널(info_ready 등)은 finished보다 먼저 처리된다
+        worker.finished.connect(lambda u=url: self._on_fetch_finished(u))
+        worker.finished.connect(self._next_fetch)
+        self._info_worker = worker
+        worker.start()
+
+    @staticmethod
+    def _single_video_id(url: str) -> str:
+        """video_id of a single-video URL ("" for playlists and unknown URLs)."""
+        return "" if is_playlist_url(url) else extract_video_id(url)
+
+    def _on_fetch_finished(self, url: str):
+        vid = self._single_video_id(url)
+        if not vid or vid not in self._fetching_ids:
+            return
+        if any(self._single_video_id(entry[2]) == vid for entry in self._fetch_queue):
+            return  # 같은 영상이 다시 대기 중
+        self._fetching_ids.discard(vid)
+        self.fetch_done.emit(vid)
+
+    @staticmethod
+    def _apply_options(video_info: VideoInfo, options: DownloadOptions):
+        video_info.download_type = options.download_type
+        video_info.selected_quality = options.quality
+        video_info.ext = options.fmt
+        video_info.options = options
+
+    def _on_info_ready(self, video_info: VideoInfo, options: DownloadOptions,
+                       discarded: Set[str] = frozenset()):
+        if video_info.video_id in discarded:
+            return  # 정보를 가져오는 사이 취소됨
+        self._apply_options(video_info, options)
         self._start_download(video_info)
         self.status_bar.showMessage("다운로드 시작...")
 
-    def _on_playlist_ready(self, videos: list):
+    def _on_playlist_ready(self, videos: list, options: DownloadOptions):
         self.status_bar.showMessage(f"재생목록: {len(videos)}개 영상 발견")
         for vi in videos:
-            vi.download_type = self.toolbar.download_type
-            vi.selected_quality = self.toolbar.quality
-            vi.ext = self.toolbar.format
-            self.download_list.add_item(vi)
+            self._apply_options(vi, options)
             self._start_download(vi)
 
-    def _on_info_error(self, msg: str):
+    def _downloaded_lookup(self, options: DownloadOptions):
+        """Build the InfoWorker's already-downloaded check for these options."""
+        db = self.db
+
+        def lookup(video_ids: list) -> dict:
+            try:
+                return db.find_downloaded(video_ids, options.download_type,
+                                          options.fmt, options.quality)
+            finally:
+                db.release_connection()  # InfoWorker 스레드의 연결
+
+        return lookup
+
+    def _on_already_downloaded(self, records: list, checked: int):
+        self._skip_hits += len(records)
+        self._skip_checked += checked
+        rate = self._skip_hits / self._skip_checked * 100
+        print(f"[MainWindow] Already downloaded {len(records)}/{checked} "
+              f"(total hit rate {rate:.0f}% of {self._skip_checked})")
+        if not records:
+            return
+        for rec in records:
+            if self.download_list.get_item(rec["video_id"]) is None:
+                self._add_history_item(rec)
+        if checked == 1:
+            self.status_bar.showMessage(f"이미 다운로드한 영상입니다: {records[0].get('title', '')}")
+        else:
+            self.status_bar.showMessage(
+                f"이미 받은 영상 {len(records)}/{checked}개 건너뜀 ({len(records) / checked:.0%})"
+            )
+        self._reapply_sort()
+
+    def _on_info_error(self, msg: str, quiet: bool = False):
+        if quiet:
+            print(f"[MainWindow] Info fetch failed: {msg}")
+            self.status_bar.showMessage(f"오류: {msg}")
+            return
         self.status_bar.showMessage("오류 발생")
         QMessageBox.warning(self, "오류", msg)
 
     # ── Download management ──────────────────────────────────
 
     def _start_download(self, video_info: VideoInfo):
-        """Queue or start a download respecting concurrent limit."""
+        """Queue or start a download respecting concurrent limit.
+
+        A queued job is only a jobs row: no list item is created and the
+        VideoInfo is dropped (the worker re-extracts when it starts).
+        """
+        if video_info.options is None:
+            video_info.options = self.toolbar.current_options()
+        vid = video_info.video_id
+        if vid in self._workers:
+            return  # 이미 진행 중
         max_concurrent = self._settings.concurrent_downloads
-        if len(self._workers) >= max_concurrent:
-            self._download_queue.append(video_info)
-            widget = self.download_list.get_item(video_info.video_id)
+        # 대기열이 남아 있으면 우선순위 순서를 지키도록 새 작업도 대기열을 거친다
+        if self._queued_ids or len(self._workers) >= max_concurrent:
+            self._save_job(video_info, "queued")
+            self._queued_ids.add(vid)
+            widget = self.download_list.get_item(vid)
             if widget:
+                # 이미 목록에 있는 항목은 새 작업 정보로 바꿔 두고 상태만 대기로 표시
+                widget = self._item_for(video_info)
+                widget.set_status("queued")
                 widget.lbl_status.setText("대기중")
+            self.download_event.emit("queued", vid, {})
+            self._update_queued_label()
+            self._process_queue()
             return
 
+        self._save_job(video_info, "downloading")
+        self._item_for(video_info)
         self._launch_worker(video_info)
 
+    def _item_for(self, video_info: VideoInfo):
+        """The list row showing video_info, replacing a row of an earlier download.
+
+        A row left over from a previous download (completed, failed, found by
+        search) holds that download's VideoInfo; reusing it would record the
+        old type/format/quality in history. Only a paused row being resumed
+        passes its own VideoInfo and is kept as is.
+        """
+        widget = self.download_list.get_item(video_info.video_id)
+        if widget is None or widget.video_info is not video_info:
+            widget = self.download_list.add_item(video_info)
+        return widget
+
     def _launch_worker(self, video_info: VideoInfo):
         from app.workers.download_worker import DownloadWorker
+        opts = video_info.options
         worker = DownloadWorker(
             video_info=video_info,
-            save_dir=self.toolbar.save_path,
-            download_type=self.toolbar.download_type,
-            quality=self.toolbar.quality,
-            fmt=self.toolbar.format,
-            subtitle=self.toolbar.subtitle_enabled,
-            subtitle_lang=self.toolbar.subtitle_lang,
-            audio_track=self.toolbar.audio_track,
-            frame_rate=self.toolbar.frame_rate,
-            codec=self.toolbar.codec,
+            save_dir=opts.save_dir,
+            download_type=opts.download_type,
+            quality=opts.quality,
+            fmt=opts.fmt,
+            subtitle=opts.subtitle,
+            subtitle_lang=opts.subtitle_lang,
+            audio_track=opts.audio_track,
+            frame_rate=opts.frame_rate,
+            codec=opts.codec,
         )
         worker.progress.connect(self._on_download_progress)
         worker.finished.connect(self._on_download_finished)
         worker.error.connect(self._on_download_error)
         self._workers[video_info.video_id] = worker
+        self._started_at[video_info.video_id] = time.monotonic()
         worker.start()
+        self.download_event.emit("started", video_info.video_id, {})
 
     def _process_queue(self):
         """Start queued downloads if slots are available."""
-        max_concurrent = self._settings.concurrent_downloads
-        while self._download_queue and len(self._workers) < max_concurrent:
-            vi = self._download_queue.popleft()
+        # 대기 작업은 jobs 테이블에만 있고 슬롯이 빌 때 필요한 만큼만 불러온다.
+        # 읽기는 쓰기 스레드에서 한다 — GUI 스레드에서 읽으면 대기 중인 커밋을 기다린다.
+        free = self._settings.concurrent_downloads - len(self._workers)
+        if free <= 0 or not self._queued_ids or self._queue_loading:
+            return
+        self._queue_loading = True
+        self._queue_submitted = set(self._queued_ids)
+        self.db.load_jobs(self._queued_jobs_loaded.emit, ("queued",), limit=free)
+
+    def _on_queued_jobs_loaded(self, jobs: list):
+        self._queue_loading = False
+        submitted, self._queue_submitted = self._queue_submitted, set()
+        if not jobs:
+            # 요청 시점의 대기 작업은 테이블에 없다 (테이블이 기준). 그 뒤에 대기열에
+            # 들어온 작업은 이 읽기 다음에 저장되므로 남겨 두고 다시 읽는다
+            self._queued_ids -= submitted
+            self._update_queued_label()
+            self._process_queue()
+            return
+        retry = False
+        for job in jobs:
+            vid = job["video_id"]
+            if vid not in self._queued_ids or vid in self._workers:
+                retry = True  # 읽는 사이 취소·제거됨
+                continue
+            if len(self._workers) >= self._settings.concurrent_downloads:
+                break
+            self._queued_ids.discard(vid)
+            widget = self.download_list.get_item(vid)
+            if widget and widget.video_info.status == "queued":
+                # 대기열에 넣을 때 이 작업 정보로 바꿔 둔 항목 (일시정지 후 재시작 포함)
+                vi = widget.video_info
+                vi.options = DownloadOptions.from_dict(job["options"])
+            else:
+                # 행이 없거나 그 사이 검색 등으로 예전 이력 항목이 들어온 경우 — 작업 행이 기준
+                vi = self._job_video_info(job)
+                widget = self.download_list.add_item(vi)
+            widget.set_status("downloading")
+            self.db.update_job(vid, state="downloading")
             self._launch_worker(vi)
+            retry = True
+        self._update_queued_label()
+        if retry:
+            self._process_queue()
+
+    def _update_queued_label(self):
+        count = len(self._queued_ids)
+        self.lbl_queued.setText(f"대기 {count}개" if count else "")
+        self.download_list.set_queued_count(count)
+
+    def _on_item_removed(self, video_id: str):
+        if video_id in self._queued_ids:
+            self._queued_ids.discard(video_id)
+            self._update_queued_label()
+        self.db.delete_job(video_id)
 
     def _on_download_progress(self, video_id: str, data: dict):
         widget = self.download_list.get_item(video_id)
         if widget:
             widget.update_progress(data)
+            filename = data.get("filename")
+            if filename and filename != widget.video_info.partial_path:
+                widget.video_info.partial_path = filename
+                self.db.update_job(video_id, partial_path=filename)
+        self.download_event.emit("progress", video_id, data)
 
     def _on_download_finished(self, video_id: str, file_path: str):
         widget = self.download_list.get_item(video_id)
+        started = self._started_at.pop(video_id, None)
         if widget:
-            widget.set_completed(file_path)
             vi = widget.video_info
-            self.db.add_record(
+            try:
+                filesize = os.path.getsize(file_path)
+            except OSError:
+                filesize = vi.filesize_approx
+            vi.record_id = self.db.add_record(
                 url=vi.url,
                 video_id=vi.video_id,
                 title=vi.title,
@@ -469,16 +852,25 @@ class MainWindow(QMainWindow):
                 file_path=file_path,
                 fmt=vi.ext,
                 quality=vi.selected_quality,
-                filesize=vi.filesize_approx,
+                filesize=filesize,
                 duration=vi.duration,
                 download_type=vi.download_type,
+                elapsed=time.monotonic() - started if started else 0.0,
             )
+            # 원본 포맷 목록 등 큰 메타데이터는 완료 후 필요 없음
+            vi.formats = []
+            vi.subtitles = {}
+            vi.auto_captions = {}
+            widget.set_completed(file_path)
+            self._enforce_retention()
 
+        self.db.delete_job(video_id)
         self._workers.pop(video_id, None)
+        self.download_event.emit("finished", video_id, {"file_path": file_path})
         self._process_queue()
 
         active = len(self._workers)
-        queued = len(self._download_queue)
+        queued = len(self._queued_ids)
         if active > 0:
             msg = f"다운로드 중... ({active}개 진행"
             if queued > 0:
@@ -503,14 +895,26 @@ class MainWindow(QMainWindow):
             self.control_panel.update_notification(
                 "다운로드 완료", widget.video_info.title
             )
+        if self.control_panel.is_open:
+            self._refresh_stats()
 
         self._reapply_sort()
 
     def _on_download_error(self, video_id: str, msg: str):
         widget = self.download_list.get_item(video_id)
+        worker = self._workers.pop(video_id, None)
+        self._started_at.pop(video_id, None)
+        if widget and widget.video_info.status == "paused":
+            # 일시정지로 중단된 작업 — 오류가 아니므로 재시작할 수 있게 둔다
+            self._process_queue()
+            return
         if widget:
             widget.set_error(msg)
-        self._workers.pop(video_id, None)
+            if not (worker and worker._cancelled):
+                self.db.record_failure(widget.video_info.channel,
+                                       widget.video_info.download_type)
+        self.db.update_job(video_id, state="error", error_message=msg)
+        self.download_event.emit("error", video_id, {"error_message": msg})
         self._process_queue()
         self._reapply_sort()
         self.status_bar.showMessage(f"오류: {msg}")
@@ -532,49 +936,97 @@ class MainWindow(QMainWindow):
         except Exception:
             pass
 
-    def _cancel_download(self, video_id: str):
+    def _cancel_download(self, video_id: str) -> str:
+        """Cancel a running, queued or still-fetching download; returns what happened."""
         worker = self._workers.get(video_id)
         if worker:
             worker.cancel()
+            return "cancel_requested"
+        fetch_cancelled = self._cancel_fetch(video_id)
+        widget = self.download_list.get_item(video_id)
+        queued = video_id in self._queued_ids
+        if widget is None and not queued:
+            return "cancelled" if fetch_cancelled else "not_found"
+        if not queued and widget.video_info.status != "paused":
+            return "cancelled" if fetch_cancelled else "not_active"
+        # 아직 시작하지 않은 작업은 워커 없이 바로 취소 처리
+        msg = "다운로드가 취소되었습니다."
+        if queued:
+            self._queued_ids.discard(video_id)
+            self._update_queued_label()
+        if widget:
+            widget.set_error(msg)
+        self.db.update_job(video_id, state="error", error_message=msg)
+        self.download_event.emit("error", video_id, {"error_message": msg})
+        return "cancelled"
+
+    def _cancel_fetch(self, video_id: str) -> bool:
+        """Drop info fetches of a single video that have not started a download yet."""
+        kept = [entry for entry in self._fetch_queue
+                if self._single_video_id(entry[2]) != video_id]
+        cancelled = len(kept) != len(self._fetch_queue)
+        if cancelled:
+            heapq.heapify(kept)
+            self._fetch_queue = kept
+        worker = self._info_worker
+        if worker and worker.isRunning() and self._single_video_id(worker.url) == video_id:
+            # 이미 보낸 info_ready가 도착하더라도 다운로드를 시작하지 않는다
+            worker.discarded.add(video_id)
+            cancelled = True
+        if cancelled and video_id in self._fetching_ids:
+            self._fetching_ids.discard(video_id)
+            self.fetch_done.emit(video_id)
+        return cancelled
 
     # ── Tab / Search filtering ──────────────────────────────
 
     def _apply_filters(self):
         """Apply both tab filter and search text filter."""
-        tab_name = self.tab_bar.current_tab
-        search_text = self.tab_bar.search_input.text().strip().lower()
-
-        for item in self.download_list.get_all_items():
-            # Tab filter
-            if tab_name == "전체":
-                tab_match = True
-            elif tab_name == "동영상":
-                tab_match = item.video_info.download_type == "video"
-            elif tab_name == "오디오":
-                tab_match = item.video_info.download_type == "audio"
-            elif tab_name == "재생 목록":
-                tab_match = item.video_info.is_playlist
-            else:
-                tab_match = True
-
-            # Search filter
-            if search_text:
-                title = (item.video_info.title or "").lower()
-                channel = (item.video_info.channel or "").lower()
-                search_match = search_text in title or search_text in channel
-            else:
-                search_match = True
-
-            item.setVisible(tab_match and search_match)
+        self.download_list.set_filter(
+            self.tab_bar.current_tab_key,
+            self.tab_bar.search_input.text(),
+        )
 
     def _on_tab_changed(self, tab_name: str):
         self._apply_filters()
 
     def _on_search_filter(self, text: str):
+        text = text.strip()
+        self._search_history(text)
         self._apply_filters()
 
+    # 목록에 없는 이전 기록을 검색해 추가할 최대 개수
+    HISTORY_SEARCH_LIMIT = 50
+
+    def _search_history(self, text: str):
+        """Materialize history records matching the query that are not loaded yet.
+
+        Items brought in by an earlier query that no longer match (or all of
+        them, when the query is cleared) are dropped from the list again.
+        """
+        records = self.db.search(text, limit=self.HISTORY_SEARCH_LIMIT) if text else []
+        matched = {rec.get("video_id", "") for rec in records}
+        stale = []
+        for vid in self._search_ids - matched:
+            widget = self.download_list.get_item(vid)
+            # 그 사이 다시 받기 등으로 상태가 바뀐 항목은 남긴다
+            if widget and widget.video_info.status == "completed":
+                stale.append(vid)
+        self.download_list.discard_items(stale)
+        self._search_ids &= matched
+        for rec in reversed(records):  # oldest first
+            vid = rec.get("video_id", "")
+            if vid and self.download_list.get_item(vid) is None:
+                self._add_history_item(rec)
+                self._search_ids.add(vid)
+
     def _reapply_sort(self):
         """현재 정렬 설정으로 목록을 다시 정렬한다."""
+        if self._ui_suspended:
+            # 숨겨진 동안에는 다시 표시될 때 한 번만 정렬
+            self._sort_pending = True
+            return
+        self._sort_pending = False
         key = self.tab_bar._sort_key
         ascending = self.tab_bar._sort_ascending
         self.download_list.sort_items(key, ascending)
@@ -619,7 +1071,9 @@ class MainWindow(QMainWindow):
                 widget = self.download_list.get_item(vid)
                 if widget:
                     widget.lbl_status.setText("일시정지")
-                    widget.video_info.status = "paused"
+                    widget.set_status("paused")
+                self.db.update_job(vid, state="paused")
+                self.download_event.emit("paused", vid, {})
                 paused += 1
         if paused > 0:
             self.status_bar.showMessage(f"{paused}개 다운로드 일시정지됨")
@@ -628,12 +1082,11 @@ class MainWindow(QMainWindow):
 
     def _resume_all(self):
         resumed = 0
-        for item in self.download_list.get_all_items():
-            if item.video_info.status == "paused":
-                item.video_info.status = "downloading"
-                item.lbl_status.setText("대기중")
-                self._start_download(item.video_info)
-                resumed += 1
+        for item in self.download_list.get_items_by_status("paused"):
+            item.set_status("downloading")
+            item.lbl_status.setText("대기중")
+            self._start_download(item.video_info)
+            resumed += 1
         if resumed > 0:
             self.status_bar.showMessage(f"{resumed}개 다운로드 재시작")
         else:
@@ -652,6 +1105,10 @@ class MainWindow(QMainWindow):
 
             for item in list(self.download_list.get_all_items()):
                 self.download_list._remove_item(item.video_info.video_id)
+            if self._queued_ids:
+                self.db.delete_jobs(("queued",))
+                self._queued_ids.clear()
+                self._update_queued_label()
             self.status_bar.showMessage("모든 항목이 제거되었습니다")
 
     def _download_playlist_type(self, playlist_type: str):
@@ -677,8 +1134,13 @@ class MainWindow(QMainWindow):
         )
 
     def _show_control_panel(self):
+        if not self.control_panel.is_open:
+            self._refresh_stats()
         self.control_panel.toggle()
 
+    def _refresh_stats(self):
+        self.control_panel.update_stats(self.db.get_stats(days=7))
+
     def _on_youtube_login(self):
         QMessageBox.information(
             self, "YouTube 로그인",
@@ -710,6 +1172,9 @@ class MainWindow(QMainWindow):
             display = self.toolbar._get_display_path()
             self.toolbar.btn_save_path.setText(f"{display}  ▾")
 
+        self.download_list.set_retention_limit(s.max_completed_items)
+        self._enforce_retention()
+
         # Show/hide tray icon based on background setting
         if s.run_in_background:
             self.tray_icon.show()
@@ -791,6 +1256,19 @@ class MainWindow(QMainWindow):
                 central.width(), central.height()
             )
 
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._update_ui_suspended()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self._update_ui_suspended()
+
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        if event.type() == QEvent.Type.WindowStateChange:
+            self._update_ui_suspended()
+
     def closeEvent(self, event):
         # Minimize to tray if background running is enabled
         if self._settings.run_in_background and not self._force_quit:
@@ -807,8 +1285,14 @@ class MainWindow(QMainWindow):
         # Actually quit: stop bridge server and cancel all running downloads
         if hasattr(self, '_bridge_server'):
             self._bridge_server.stop()
+        self.download_list.shutdown()
+        if self._library_scanner:
+            self._library_scanner.stop()
         for worker in self._workers.values():
+            # 종료로 인한 취소는 오류로 기록하지 않는다 (다음 실행 때 이어받기)
+            worker.blockSignals(True)
             worker.cancel()
             worker.wait(2000)
+        self.db.close()
         self.tray_icon.hide()
         event.accept()
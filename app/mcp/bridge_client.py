@@ -1,48 +1,320 @@
-"""TCP client for communicating with the Qt app's bridge server."""
+"""Client for communicating with the Qt app's bridge server."""
 
-import json
+import itertools
 import socket
-from typing import Any
+import sys
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from typing import Any, Callable, Dict, Optional
+
+from app.bridge.codec import Codec, available_compressions, available_encodings
+from app.bridge.endpoint import local_socket_name
+from app.bridge.framing import LENGTH, LINE, encode_frame, read_frame
 
 BRIDGE_HOST = "127.0.0.1"
 BRIDGE_PORT = 19384
 TIMEOUT = 30  # seconds
+CONNECT_TIMEOUT = 5  # seconds
 
 
 class BridgeClient:
-    """Sends JSON-RPC requests to the Qt app's BridgeServer over TCP."""
+    """Sends JSON-RPC requests to the Qt app's BridgeServer.
+
+    One long-lived connection is shared by all callers. Requests are written
+    as soon as they are made and matched to responses by id on a reader
+    thread, so several requests can be in flight at once (pipelining). A
+    dropped connection fails the in-flight requests and is re-opened on the
+    next call.
+
+    framing selects newline-delimited ("line", default) or length-prefixed
+    ("length") messages; see app.bridge.framing. encodings/compression are
+    preference lists (e.g. ["msgpack", "cbor"], ["zstd", "zlib"]) offered in
+    a hello handshake on every connect; they imply length framing. The
+    server falls back to JSON for anything it does not support.
+
+    transport is "auto" (default: the server's Unix domain socket when
+    available, else TCP), "local" or "tcp". Windows has no AF_UNIX client
+    for the server's named pipe, so it always uses TCP.
+    """
 
-    def __init__(self, host: str = BRIDGE_HOST, port: int = BRIDGE_PORT):
+    def __init__(self, host: str = BRIDGE_HOST, port: int = BRIDGE_PORT,
+                 framing: str = LINE, encodings: Optional[list] = None,
+                 compression: Optional[list] = None, transport: str = "auto"):
         self.host = host
         self.port = port
-        self._req_id = 0
-
-    def send_request(self, method: str, params: dict | None = None) -> Any:
-        self._req_id += 1
-        req = {
-            "jsonrpc": "2.0",
-            "id": self._req_id,
-            "method": method,
-            "params": params or {},
-        }
-        payload = json.dumps(req, ensure_ascii=False).encode("utf-8") + b"\n"
-
-        with socket.create_connection((self.host, self.port), timeout=TIMEOUT) as sock:
-            sock.sendall(payload)
-
-            # Read response (newline-delimited JSON)
-            buf = b""
-            while b"\n" not in buf:
-                chunk = sock.recv(4096)
-                if not chunk:
-                    raise ConnectionError("Connection closed by server")
-                buf += chunk
-
-            line = buf.split(b"\n", 1)[0]
-            resp = json.loads(line.decode("utf-8"))
+        self.transport = transport
+        self.connected_via: Optional[str] = None  # 마지막으로 연결된 방식 (local/tcp)
+        self._offer = None
+        if encodings or compression:
+            framing = LENGTH
+            # 이쪽에 설치되지 않은 코덱은 제안하지 않는다
+            self._offer = {
+                "encodings": [e for e in encodings or () if e in available_encodings()],
+                "compression": [c for c in compression or () if c in available_compressions()],
+            }
+        self.framing = framing
+        self.codec = Codec()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()  # 연결 생성과 쓰기를 직렬화
+        self._sock: Optional[socket.socket] = None
+        self._pending: Dict[int, Future] = {}
+        self._pending_lock = threading.Lock()
+        # 응답이 아닌 서버 알림(id 없는 메시지)을 받을 콜백
+        self.notification_handler: Optional[Callable[[dict], None]] = None
+        # 재연결 시 다시 보낼 subscribe 파라미터
+        self._subscription: Optional[dict] = None
+
+    # ── Public API ────────────────────────────────────────────
+
+    def send_request(self, method: str, params: dict | None = None,
+                     timeout: float | None = None) -> Any:
+        """Send one request and wait for its result (timeout defaults to TIMEOUT)."""
+        fut = self.call_async(method, params)
+        try:
+            resp = fut.result(TIMEOUT if timeout is None else timeout)
+        except FutureTimeout:
+            with self._pending_lock:
+                self._pending.pop(fut.req_id, None)
+            raise TimeoutError(f"Bridge request timed out: {method}")
+        return self._result(resp)
+
+    def call_async(self, method: str, params: dict | None = None) -> Future:
+        """Send a request without waiting; the Future resolves to the raw response."""
+        req_id = next(self._ids)
+        req = {"jsonrpc": "2.0", "id": req_id, "method": method, "params": params or {}}
+        fut: Future = Future()
+        fut.req_id = req_id
+        fut.sock = None  # 요청을 쓴 연결 (_mark_sent)
+        with self._pending_lock:
+            self._pending[req_id] = fut
+        try:
+            self._send(req, (req_id,))
+        except OSError as e:
+            with self._pending_lock:
+                self._pending.pop(req_id, None)
+            raise ConnectionError(f"Bridge connection failed: {e}") from e
+        return fut
+
+    def send_batch(self, calls: list) -> list:
+        """Send [(method, params), ...] as one JSON-RPC batch.
+
+        Returns the results in call order; a call that failed on the server
+        is returned as a RuntimeError instance instead of raising, so one bad
+        id does not hide the other results.
+        """
+        if not calls:
+            return []
+        reqs, futures = [], []
+        with self._pending_lock:
+            for method, params in calls:
+                req_id = next(self._ids)
+                fut: Future = Future()
+                fut.req_id = req_id
+                fut.sock = None
+                self._pending[req_id] = fut
+                futures.append(fut)
+                reqs.append({"jsonrpc": "2.0", "id": req_id,
+                             "method": method, "params": params or {}})
+        try:
+            self._send(reqs, [f.req_id for f in futures])
+        except OSError as e:
+            with self._pending_lock:
+                for fut in futures:
+                    self._pending.pop(fut.req_id, None)
+            raise ConnectionError(f"Bridge connection failed: {e}") from e
+
+        results = []
+        for fut in futures:
+            try:
+                resp = fut.result(TIMEOUT)
+            except FutureTimeout:
+                with self._pending_lock:
+                    for f in futures:
+                        self._pending.pop(f.req_id, None)
+                raise TimeoutError("Bridge batch request timed out")
+            try:
+                results.append(self._result(resp))
+            except RuntimeError as e:
+                results.append(e)
+        return results
+
+    def notify(self, method: str, params: dict | None = None):
+        """Send a JSON-RPC notification (no id, no response)."""
+        req = {"jsonrpc": "2.0", "method": method, "params": params or {}}
+        try:
+            self._send(req, ())
+        except OSError as e:
+            raise ConnectionError(f"Bridge connection failed: {e}") from e
+
+    def subscribe(self, handler: Callable[[dict], None], **filters) -> dict:
+        """Receive download_event notifications on handler (reader thread).
+
+        filters are passed to the server's subscribe method (events,
+        video_ids, download_type, progress_interval, max_rate). The
+        subscription is re-sent automatically after a reconnect.
+        """
+        self.notification_handler = handler
+        result = self.send_request("subscribe", filters)
+        self._subscription = filters
+        return result
+
+    def unsubscribe(self) -> dict:
+        self._subscription = None
+        return self.send_request("unsubscribe")
 
+    def close(self):
+        with self._lock:
+            self._drop(self._sock, ConnectionError("Client closed"))
+
+    # ── Connection ───────────────────────────────────────────
+
+    def _send(self, msg, req_ids):
+        # 연결(및 코덱 협상) 뒤에 인코딩해야 하므로 잠금 안에서 직렬화한다
+        with self._lock:
+            reused = self._sock is not None
+            sock = self._sock or self._connect()
+            try:
+                sock.sendall(self._encode(msg))
+            except OSError as e:
+                self._drop(sock, ConnectionError(f"Connection lost: {e}"))
+                if not reused:
+                    raise
+                # 서버 재시작 등으로 끊긴 연결을 재사용했던 경우 한 번만 다시 연결
+                sock = self._connect()
+                sock.sendall(self._encode(msg))
+            self._mark_sent(sock, req_ids)
+
+    def _mark_sent(self, sock: socket.socket, req_ids):
+        """Record which connection carries each request, so only its drop fails them."""
+        with self._pending_lock:
+            for req_id in req_ids:
+                fut = self._pending.get(req_id)
+                if fut is not None:
+                    fut.sock = sock
+
+    def _open_socket(self) -> socket.socket:
+        local_ok = (self.transport != "tcp" and sys.platform != "win32"
+                    and hasattr(socket, "AF_UNIX")
+                    and self.host in ("127.0.0.1", "localhost", "::1"))
+        if local_ok:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(CONNECT_TIMEOUT)
+            try:
+                sock.connect(local_socket_name(self.port))
+                self.connected_via = "local"
+                return sock
+            except OSError:
+                sock.close()
+                if self.transport == "local":
+                    raise
+        elif self.transport == "local":
+            raise ConnectionError("Local socket transport is not available")
+        # 로컬 소켓이 없으면(이전 버전 앱, Windows) TCP로 대체
+        sock = socket.create_connection((self.host, self.port), timeout=CONNECT_TIMEOUT)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.connected_via = "tcp"
+        return sock
+
+    def _connect(self) -> socket.socket:
+        sock = self._open_socket()
+        reader = sock.makefile("rb")
+        try:
+            self.codec = self._handshake(sock, reader) if self._offer else Codec()
+        except (OSError, ValueError):
+            reader.close()
+            sock.close()
+            raise
+        sock.settimeout(None)
+        self._sock = sock
+        threading.Thread(
+            target=self._read_loop, args=(sock, reader), name="BridgeClientReader", daemon=True,
+        ).start()
+        if self._subscription is not None:
+            # 서버의 구독 상태는 연결 단위이므로 새 연결에 다시 등록 (응답 없는 알림)
+            req = {"jsonrpc": "2.0", "method": "subscribe", "params": self._subscription}
+            sock.sendall(self._encode(req))
+        return sock
+
+    def _drop(self, sock: Optional[socket.socket], error: Exception):
+        """Close sock (if still current) and fail the in-flight requests written to it.
+
+        Requests not yet written, or already re-sent on a newer connection,
+        stay pending.
+        """
+        if sock is None:
+            return
+        if self._sock is sock:
+            self._sock = None
+        try:
+            # makefile() 리더가 fd를 잡고 있어 close()만으로는 연결이 끊기지 않는다
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        try:
+            sock.close()
+        except OSError:
+            pass
+        with self._pending_lock:
+            lost = [req_id for req_id, fut in self._pending.items()
+                    if fut.sock is sock]
+            failed = [self._pending.pop(req_id) for req_id in lost]
+        for fut in failed:
+            if not fut.done():
+                fut.set_exception(error)
+
+    def _handshake(self, sock: socket.socket, reader) -> Codec:
+        """Send hello in JSON and build the codec the server agreed to."""
+        hello = {"jsonrpc": "2.0", "id": 0, "method": "hello", "params": self._offer}
+        sock.sendall(encode_frame(Codec().encode(hello), self.framing))
+        message = read_frame(reader, self.framing)
+        if message is None:
+            raise ConnectionError("Connection closed during handshake")
+        result = Codec().decode(message).get("result")
+        if not result:
+            return Codec()  # hello를 모르는 이전 버전 서버 — JSON 유지
+        return Codec(result["encoding"], result.get("compression"),
+                     threshold=result.get("compress_threshold", 0))
+
+    def _encode(self, msg) -> bytes:
+        return encode_frame(self.codec.encode(msg), self.framing)
+
+    def _read_loop(self, sock: socket.socket, reader):
+        # makefile()의 버퍼드 리더로 메시지 단위 읽기 (청크를 이어붙이지 않음)
+        try:
+            while True:
+                message = read_frame(reader, self.framing)
+                if message is None:
+                    break
+                self._dispatch(message)
+        except (OSError, ValueError):  # FrameTooLarge 포함 — 연결을 버린다
+            pass
+        finally:
+            reader.close()
+            with self._lock:
+                self._drop(sock, ConnectionError("Connection closed by server"))
+
+    def _dispatch(self, message: bytes):
+        try:
+            msg = self.codec.decode(message)
+        except ValueError:
+            return
+        for item in (msg if isinstance(msg, list) else [msg]):
+            self._dispatch_one(item)
+
+    def _dispatch_one(self, msg):
+        req_id = msg.get("id") if isinstance(msg, dict) else None
+        if req_id is None:
+            if self.notification_handler and isinstance(msg, dict):
+                self.notification_handler(msg)
+            return
+        with self._pending_lock:
+            fut = self._pending.pop(req_id, None)
+        if fut is not None and not fut.done():
+            fut.set_result(msg)
+
+    @staticmethod
+    def _result(resp: dict) -> Any:
         if "error" in resp:
             err = resp["error"]
             raise RuntimeError(f"Bridge error: {err.get('message', 'Unknown error')}")
-
         return resp.get("result")
@@ -4,6 +4,9 @@ Run with: python -m app.mcp.server
 Uses stdio transport for communication with Claude Code.
 """
 
+import threading
+import time
+
 from mcp.server.fastmcp import FastMCP
 
 from app.mcp.bridge_client import BridgeClient
@@ -13,44 +16,176 @@ bridge = BridgeClient()
 
 
 @mcp.tool()
-def add_download(url: str) -> str:
+def add_download(url: str, force: bool = False) -> str:
     """Add a YouTube video/audio download by URL.
 
+    Videos already in history with the same type/format/quality whose file is
+    still on disk are skipped (playlist re-runs only fetch new entries).
+
     Args:
         url: YouTube video or playlist URL to download
+        force: Download again even if it was already downloaded
     """
-    result = bridge.send_request("add_download", {"url": url})
+    result = bridge.send_request("add_download", {"url": url, "force": force})
     return f"Download started for: {url} (status: {result.get('status', 'unknown')})"
 
 
 @mcp.tool()
-def get_downloads() -> list[dict]:
+def add_downloads(items: list[dict]) -> list[dict]:
+    """Add many downloads in one call, each with its own options.
+
+    Options travel with each job; the app's toolbar settings are only used as
+    defaults and are not changed, so concurrent callers do not interfere.
+
+    Args:
+        items: [{url, type, format, quality, codec, priority, save_path, force}].
+            Only url is required. type is "video" or "audio"; format e.g.
+            mp4/mkv or mp3/m4a/wav/flac; quality "best" or e.g. "1080p";
+            codec H264/H265/VP9/AV1; higher priority starts first;
+            save_path is an absolute folder.
+
+    Returns one entry per item: {url, video_id, status: "info_fetch_started",
+    options} or {url, video_id, status: "rejected", error}. video_id is empty
+    for playlist URLs. Info is fetched in the background; an item may still be
+    skipped as already downloaded, so follow up with get_download_status or
+    wait_for_downloads. A repeated video (or playlist URL) within one call is
+    rejected, since each video has a single download entry.
+    """
+    return bridge.send_request("add_downloads", {"items": items})
+
+
+@mcp.tool()
+def get_downloads(since_version: int | None = None) -> list[dict] | dict:
     """Get list of all current downloads with their status.
 
-    Returns a list of download items with video_id, title, status, progress, etc.
+    Returns a list of download items with video_id, title, status, progress,
+    version, etc. With since_version, returns only what changed after it:
+    {"items", "removed", "reset", "version"} — pass the returned version on
+    the next call. reset=true means items is the full list. Queued jobs get
+    an entry only once they start; until then get_download_status reports
+    them as {"video_id", "status": "queued"} (or "fetching" while their info
+    is still being extracted).
+
+    Args:
+        since_version: The version returned by the previous delta call (0 = everything)
+    """
+    if since_version is None:
+        return bridge.send_request("get_downloads")
+    return bridge.send_request("get_downloads", {"since_version": since_version})
+
+
+@mcp.tool()
+def watch_downloads(
+    seconds: float = 10.0,
+    video_ids: list[str] | None = None,
+    events: list[str] | None = None,
+    progress_interval: float = 2.0,
+) -> list[dict]:
+    """Collect pushed download events for a while instead of polling get_downloads.
+
+    Args:
+        seconds: How long to listen (max 300)
+        video_ids: Only these downloads (default all)
+        events: Subset of queued, started, progress, paused, finished, error
+        progress_interval: Minimum seconds between progress events per download
     """
-    return bridge.send_request("get_downloads")
+    collected: list[dict] = []
+    lock = threading.Lock()
+
+    def on_event(msg: dict):
+        if msg.get("method") == "download_event":
+            with lock:
+                collected.append(msg.get("params", {}))
+
+    # 구독은 연결 단위라 공유 연결과 분리된 전용 연결을 쓴다
+    watcher = BridgeClient(bridge.host, bridge.port)
+    try:
+        filters = {"progress_interval": progress_interval}
+        if video_ids:
+            filters["video_ids"] = video_ids
+        if events:
+            filters["events"] = events
+        watcher.subscribe(on_event, **filters)
+        time.sleep(max(0.0, min(seconds, 300.0)))
+    finally:
+        watcher.close()
+    with lock:
+        return list(collected)
+
+
+def _per_id(method: str, video_ids: list[str]) -> list[dict]:
+    """Run method for each id in one JSON-RPC batch; failures become {"video_id", "error"}."""
+    results = bridge.send_batch([(method, {"video_id": vid}) for vid in video_ids])
+    return [
+        {"video_id": vid, "error": str(res)} if isinstance(res, Exception) else res
+        for vid, res in zip(video_ids, results)
+    ]
 
 
 @mcp.tool()
-def get_download_status(video_id: str) -> dict:
-    """Get detailed status of a specific download.
+def get_download_status(video_id: str | list[str]) -> dict | list[dict]:
+    """Get detailed status of one or more downloads.
 
     Args:
-        video_id: The YouTube video ID to check status for
+        video_id: A YouTube video ID, or a list of IDs (fetched in a single batch
+            round trip; unknown IDs come back as {"video_id", "error"})
     """
+    if isinstance(video_id, list):
+        return _per_id("get_download_status", video_id)
     return bridge.send_request("get_download_status", {"video_id": video_id})
 
 
 @mcp.tool()
-def cancel_download(video_id: str) -> str:
-    """Cancel an active download.
+def wait_for_downloads(video_ids: list[str], timeout: float = 300, mode: str = "all") -> dict:
+    """Block until downloads finish instead of polling get_download_status.
+
+    Args:
+        video_ids: YouTube video IDs to wait for
+        timeout: Maximum seconds to wait (server caps at 3600)
+        mode: "all" returns when every item is done, "any" when the first one is
+
+    An item is done when it is completed, failed (error) or removed
+    (not_found); fetching (info still being extracted) and queued are not.
+    Returns {done, timed_out, items: [{video_id, status, title,
+    downloaded_path, error_message, record_id}]} with the states at reply
+    time. Items already cleared from the list are reported from history.
+    """
+    return bridge.send_request(
+        "wait_for_downloads",
+        {"video_ids": video_ids, "timeout": timeout, "mode": mode},
+        timeout=min(timeout, 3600) + 10,
+    )
+
+
+@mcp.tool()
+def cancel_download(video_id: str | list[str]) -> str:
+    """Cancel one or more downloads (running, queued or still fetching info).
 
     Args:
-        video_id: The YouTube video ID to cancel
+        video_id: The YouTube video ID to cancel, or a list of IDs
     """
+    if isinstance(video_id, list):
+        results = cancel_downloads(video_id)
+        failed = [r["video_id"] for r in results
+                  if r["status"] not in ("cancel_requested", "cancelled")]
+        msg = f"Cancel requested for {len(video_id) - len(failed)} download(s)"
+        return msg + (f"; not cancelled: {', '.join(failed)}" if failed else "")
     result = bridge.send_request("cancel_download", {"video_id": video_id})
-    return f"Cancel requested for: {video_id}"
+    return f"Cancel {video_id}: {result.get('status', 'unknown')}"
+
+
+@mcp.tool()
+def cancel_downloads(video_ids: list[str]) -> list[dict]:
+    """Cancel many downloads, running or still queued, in one call.
+
+    Args:
+        video_ids: YouTube video IDs to cancel
+
+    Returns [{video_id, status}] with status cancel_requested (running),
+    cancelled (was queued, paused or still fetching info), not_active
+    (already finished) or not_found.
+    """
+    return bridge.send_request("cancel_downloads", {"video_ids": video_ids})
 
 
 @mcp.tool()
@@ -108,13 +243,64 @@ def update_settings(
 
 
 @mcp.tool()
-def get_history() -> list[dict]:
-    """Get download history.
+def get_history(
+    limit: int = 100,
+    cursor: str | None = None,
+    since: str | None = None,
+    until: str | None = None,
+    channel: str | None = None,
+    download_type: str | None = None,
+    status: str | None = None,
+) -> dict:
+    """Get download history, newest first, one page at a time.
+
+    Returns {"items": [...], "next_cursor": ...}. Each item has id, video_id,
+    title, channel, url, file_path, format, quality, filesize, duration,
+    download_type, status, created_at (epoch seconds).
+
+    Args:
+        limit: Page size (max 1000)
+        cursor: next_cursor from the previous page; omit for the first page
+        since: Only records at/after this time (ISO 8601, e.g. "2025-01-31T00:00")
+        until: Only records before this time (ISO 8601)
+        channel: Exact channel name
+        download_type: "video" or "audio"
+        status: Record status, e.g. "completed"
+    """
+    params = {"limit": limit}
+    for key, value in (("cursor", cursor), ("since", since), ("until", until),
+                       ("channel", channel), ("download_type", download_type),
+                       ("status", status)):
+        if value is not None:
+            params[key] = value
+    return bridge.send_request("get_history", params)
+
+
+@mcp.tool()
+def search_history(query: str, limit: int = 50) -> list[dict]:
+    """Full-text search over download history (newest first).
+
+    Args:
+        query: Words to find in title, channel, url or file path (all must match)
+        limit: Maximum number of records to return
+    """
+    return bridge.send_request("search_history", {"query": query, "limit": limit})
+
+
+@mcp.tool()
+def get_stats(days: int = 30, top_channels: int = 10) -> dict:
+    """Get download statistics from pre-aggregated rollups.
+
+    Returns totals, per-day rows for the last `days` days, per-type rows and
+    the top channels by bytes. Each row has completed, failed, bytes,
+    seconds, timed_bytes, failure_rate and avg_speed (bytes/s, from
+    timed_bytes / seconds — downloads without a recorded duration are left out).
 
-    Returns list of previously completed downloads with video_id, title,
-    channel, url, file_path, format, quality, filesize, duration.
+    Args:
+        days: Number of recent days to include
+        top_channels: Number of channels to include, by downloaded bytes
     """
-    return bridge.send_request("get_history")
+    return bridge.send_request("get_stats", {"days": days, "top_channels": top_channels})
 
 
 @mcp.tool()
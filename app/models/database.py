@@ -1,69 +1,843 @@
+import base64
+import json
 import sqlite3
 import os
-from datetime import datetime
+import queue
+import threading
+import time
+from typing import Callable
+
+
+# SQL 문자열을 상수로 두어 연결별 statement 캐시에서 재사용되도록 한다
+_INSERT_RECORD = """INSERT INTO downloads
+    (id, url, video_id, title, channel, thumbnail_url, file_path,
+     format, quality, filesize, duration, download_type, status, created_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 'completed', ?)"""
+_SELECT_RECENT = "SELECT * FROM downloads ORDER BY created_at DESC, id DESC LIMIT ?"
+_SELECT_NEWEST = "SELECT * FROM downloads ORDER BY id DESC LIMIT ?"
+_SELECT_BEFORE = "SELECT * FROM downloads WHERE id < ? ORDER BY id DESC LIMIT ?"
+# video_id 목록 조회 — {marks}에 청크 크기만큼 ?를 채운다. status 앞의 단항 +는
+# idx_downloads_status_created 대신 idx_downloads_variant를 타도록 플래너에 알린다
+_SELECT_VARIANT = """SELECT * FROM downloads
+    WHERE video_id IN ({marks}) AND download_type = ?
+      AND format = ? AND quality = ? AND +status = 'completed'
+    ORDER BY id DESC"""
+_SELECT_BY_VIDEO = "SELECT * FROM downloads WHERE video_id IN ({marks}) ORDER BY id DESC"
+
+# 다운로드 작업 저장 — video_id당 한 행, 다시 저장하면 상태·옵션을 덮어쓴다
+_UPSERT_JOB = """INSERT INTO jobs
+    (video_id, url, spec, options, state, priority, partial_path, error_message,
+     created_at, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, '', '', ?, ?)
+    ON CONFLICT (video_id) DO UPDATE SET
+        url = excluded.url, spec = excluded.spec, options = excluded.options,
+        state = excluded.state, priority = excluded.priority, error_message = '',
+        updated_at = excluded.updated_at"""
+
+# 롤업 테이블 갱신 (table, key column) — 다운로드 1건마다 세 테이블을 함께 올린다
+_STATS_TABLES = (("stats_daily", "day"), ("stats_channel", "channel"),
+                 ("stats_type", "download_type"))
+_UPSERT_STATS = {
+    table: f"""INSERT INTO {table} ({key}, completed, failed, bytes, seconds, timed_bytes)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT ({key}) DO UPDATE SET
+            completed = completed + excluded.completed,
+            failed = failed + excluded.failed,
+            bytes = bytes + excluded.bytes,
+            seconds = seconds + excluded.seconds,
+            timed_bytes = timed_bytes + excluded.timed_bytes"""
+    for table, key in _STATS_TABLES
+}
+
+# 재시작 시 복원할 작업 상태
+RESUMABLE_JOB_STATES = ("queued", "downloading", "paused")
+
+# 검색 대상 컬럼 (FTS 테이블과 LIKE 대체 경로가 같은 목록을 쓴다)
+_SEARCH_COLUMNS = ("title", "channel", "url", "file_path")
+_FTS_MIN_TERM = 3  # trigram 토크나이저는 3글자 미만 검색어를 인덱스로 찾지 못한다
+
+
+# ── Schema migrations (PRAGMA user_version) ─────────────────
+# 각 함수는 한 트랜잭션 안에서 실행되고, 성공하면 user_version이 해당 번호가 된다.
+# 새 스키마 변경은 목록 끝에 함수를 추가한다 (기존 항목은 수정하지 않는다).
+
+def _migrate_v1(conn: sqlite3.Connection):
+    """Original schema (databases created before versioning already have it)."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS downloads (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            url TEXT NOT NULL,
+            video_id TEXT,
+            title TEXT,
+            channel TEXT,
+            thumbnail_url TEXT,
+            file_path TEXT,
+            format TEXT,
+            quality TEXT,
+            filesize INTEGER,
+            duration INTEGER,
+            download_type TEXT DEFAULT 'video',
+            status TEXT DEFAULT 'completed',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+
+def _migrate_v2(conn: sqlite3.Connection):
+    """created_at as integer epoch seconds + lookup indexes."""
+    conn.execute("""
+        CREATE TABLE downloads_new (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            url TEXT NOT NULL,
+            video_id TEXT,
+            title TEXT,
+            channel TEXT,
+            thumbnail_url TEXT,
+            file_path TEXT,
+            format TEXT,
+            quality TEXT,
+            filesize INTEGER,
+            duration INTEGER,
+            download_type TEXT DEFAULT 'video',
+            status TEXT DEFAULT 'completed',
+            created_at INTEGER NOT NULL DEFAULT (CAST(strftime('%s', 'now') AS INTEGER))
+        )
+    """)
+    # 기존 값은 datetime.now().isoformat() (로컬 시각) 문자열
+    conn.execute("""
+        INSERT INTO downloads_new
+            (id, url, video_id, title, channel, thumbnail_url, file_path, format,
+             quality, filesize, duration, download_type, status, created_at)
+        SELECT id, url, video_id, title, channel, thumbnail_url, file_path, format,
+               quality, filesize, duration, download_type, status,
+               COALESCE(CAST(strftime('%s', created_at, 'utc') AS INTEGER),
+                        CAST(strftime('%s', 'now') AS INTEGER))
+        FROM downloads
+    """)
+    conn.execute("DROP TABLE downloads")
+    conn.execute("ALTER TABLE downloads_new RENAME TO downloads")
+    conn.execute("CREATE INDEX idx_downloads_created_at ON downloads (created_at)")
+    conn.execute("CREATE INDEX idx_downloads_video_id ON downloads (video_id)")
+    conn.execute("CREATE INDEX idx_downloads_channel_created ON downloads (channel, created_at)")
+    conn.execute("CREATE INDEX idx_downloads_status ON downloads (status)")
+
+
+def _migrate_v3(conn: sqlite3.Connection):
+    """FTS5 (trigram) index over title/channel/url/file_path, synced by triggers."""
+    try:
+        conn.execute("""
+            CREATE VIRTUAL TABLE downloads_fts USING fts5(
+                title, channel, url, file_path,
+                content='downloads', content_rowid='id', tokenize='trigram'
+            )
+        """)
+    except sqlite3.OperationalError as e:
+        # FTS5/trigram 없이 빌드된 SQLite — search()가 LIKE로 대체한다
+        print(f"[Database] FTS5 unavailable, history search falls back to LIKE: {e}")
+        return
+    conn.execute("""
+        CREATE TRIGGER downloads_fts_ai AFTER INSERT ON downloads BEGIN
+            INSERT INTO downloads_fts (rowid, title, channel, url, file_path)
+            VALUES (new.id, new.title, new.channel, new.url, new.file_path);
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER downloads_fts_ad AFTER DELETE ON downloads BEGIN
+            INSERT INTO downloads_fts (downloads_fts, rowid, title, channel, url, file_path)
+            VALUES ('delete', old.id, old.title, old.channel, old.url, old.file_path);
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER downloads_fts_au AFTER UPDATE ON downloads BEGIN
+            INSERT INTO downloads_fts (downloads_fts, rowid, title, channel, url, file_path)
+            VALUES ('delete', old.id, old.title, old.channel, old.url, old.file_path);
+            INSERT INTO downloads_fts (rowid, title, channel, url, file_path)
+            VALUES (new.id, new.title, new.channel, new.url, new.file_path);
+        END
+    """)
+    conn.execute("INSERT INTO downloads_fts (downloads_fts) VALUES ('rebuild')")
+
+
+def _migrate_v4(conn: sqlite3.Connection):
+    """Durable download jobs (queued/active work survives a crash or reboot)."""
+    conn.execute("""
+        CREATE TABLE jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            video_id TEXT NOT NULL UNIQUE,
+            url TEXT NOT NULL,
+            spec TEXT NOT NULL,
+            options TEXT NOT NULL,
+            state TEXT NOT NULL DEFAULT 'queued',
+            partial_path TEXT NOT NULL DEFAULT '',
+            error_message TEXT NOT NULL DEFAULT '',
+            created_at INTEGER NOT NULL,
+            updated_at INTEGER NOT NULL
+        )
+    """)
+    conn.execute("CREATE INDEX idx_jobs_state ON jobs (state, id)")
+
+
+def _migrate_v5(conn: sqlite3.Connection):
+    """Composite indexes for filtered keyset paging of history."""
+    conn.execute("DROP INDEX IF EXISTS idx_downloads_status")
+    conn.execute("CREATE INDEX idx_downloads_status_created ON downloads (status, created_at)")
+    conn.execute("CREATE INDEX idx_downloads_type_created ON downloads (download_type, created_at)")
+
+
+def _migrate_v6(conn: sqlite3.Connection):
+    """Already-downloaded lookup by (video_id, download_type, format, quality)."""
+    conn.execute("DROP INDEX IF EXISTS idx_downloads_video_id")
+    conn.execute("""
+        CREATE INDEX idx_downloads_variant
+        ON downloads (video_id, download_type, format, quality)
+    """)
+
+
+def _migrate_v7(conn: sqlite3.Connection):
+    """Rollup tables (daily / per-channel / per-type), backfilled from history."""
+    columns = """
+            completed INTEGER NOT NULL DEFAULT 0,
+            failed INTEGER NOT NULL DEFAULT 0,
+            bytes INTEGER NOT NULL DEFAULT 0,
+            seconds REAL NOT NULL DEFAULT 0"""
+    conn.execute(f"CREATE TABLE stats_daily (day TEXT PRIMARY KEY,{columns})")
+    conn.execute(f"CREATE TABLE stats_channel (channel TEXT PRIMARY KEY,{columns})")
+    conn.execute(f"CREATE TABLE stats_type (download_type TEXT PRIMARY KEY,{columns})")
+    conn.execute("CREATE INDEX idx_stats_channel_bytes ON stats_channel (bytes)")
+    # 기존 이력은 소요 시간을 모르므로 seconds 없이 채운다
+    for table, key in (("stats_daily", "date(created_at, 'unixepoch', 'localtime')"),
+                       ("stats_channel", "COALESCE(channel, '')"),
+                       ("stats_type", "COALESCE(download_type, 'video')")):
+        conn.execute(f"""
+            INSERT INTO {table}
+            SELECT {key}, COUNT(*), 0, COALESCE(SUM(filesize), 0), 0
+            FROM downloads GROUP BY 1
+        """)
+
+
+def _migrate_v8(conn: sqlite3.Connection):
+    """On-disk state of each record's file, maintained by LibraryScanner."""
+    # file_exists: NULL = 아직 확인 안 함, 1 = 있음, 0 = 없음(또는 0바이트)
+    conn.execute("ALTER TABLE downloads ADD COLUMN file_exists INTEGER")
+    conn.execute("ALTER TABLE downloads ADD COLUMN file_size_disk INTEGER")
+    conn.execute("ALTER TABLE downloads ADD COLUMN file_mtime REAL")
+    conn.execute("ALTER TABLE downloads ADD COLUMN checked_at INTEGER")
+    conn.execute("CREATE INDEX idx_downloads_missing ON downloads (file_exists) WHERE file_exists = 0")
+    conn.execute("""
+        CREATE TABLE scan_dirs (
+            path TEXT PRIMARY KEY,
+            mtime REAL NOT NULL,
+            scanned_at INTEGER NOT NULL
+        )
+    """)
+    # 스캔 결과 갱신 때마다 FTS 행을 다시 쓰지 않도록 검색 컬럼이 바뀔 때만 동기화
+    has_fts = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE name = 'downloads_fts_au'"
+    ).fetchone()
+    if has_fts:
+        conn.execute("DROP TRIGGER downloads_fts_au")
+        conn.execute("""
+            CREATE TRIGGER downloads_fts_au
+            AFTER UPDATE OF title, channel, url, file_path ON downloads BEGIN
+                INSERT INTO downloads_fts (downloads_fts, rowid, title, channel, url, file_path)
+                VALUES ('delete', old.id, old.title, old.channel, old.url, old.file_path);
+                INSERT INTO downloads_fts (rowid, title, channel, url, file_path)
+                VALUES (new.id, new.title, new.channel, new.url, new.file_path);
+            END
+        """)
+
+
+def _migrate_v9(conn: sqlite3.Connection):
+    """Per-job priority: higher-priority queued jobs start first."""
+    conn.execute("ALTER TABLE jobs ADD COLUMN priority INTEGER NOT NULL DEFAULT 0")
+    conn.execute("DROP INDEX idx_jobs_state")
+    conn.execute("CREATE INDEX idx_jobs_state ON jobs (state, priority DESC, id)")
+
+
+def _migrate_v10(conn: sqlite3.Connection):
+    """timed_bytes: bytes of downloads with a known duration, for throughput."""
+    # bytes에는 소요 시간이 없는 기존 이력도 포함되어 bytes / seconds가 부풀려진다.
+    # 지금까지 쌓인 seconds는 어느 bytes에 해당하는지 알 수 없으므로 0부터 다시 센다.
+    for table, _ in _STATS_TABLES:
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN timed_bytes INTEGER NOT NULL DEFAULT 0")
+        conn.execute(f"UPDATE {table} SET seconds = 0")
+
+
+_MIGRATIONS = [
+    _migrate_v1,
+    _migrate_v2,
+    _migrate_v3,
+    _migrate_v4,
+    _migrate_v5,
+    _migrate_v6,
+    _migrate_v7,
+    _migrate_v8,
+    _migrate_v9,
+    _migrate_v10,
+]
+
+
+class DatabaseWriter(threading.Thread):
+    """Dedicated writer thread with group commit.
+
+    Writes are queued as callables taking the writer's connection. The thread
+    takes the first pending write, keeps collecting for BATCH_WINDOW seconds
+    (or MAX_BATCH writes) and commits them all in a single transaction, so a
+    burst of completions costs one fsync instead of one per row.
+    """
+
+    BATCH_WINDOW = 0.005  # seconds
+    MAX_BATCH = 500
+    MAX_QUEUE = 10000
+
+    def __init__(self, db: "DownloadDatabase"):
+        super().__init__(name="DatabaseWriter", daemon=True)
+        self._db = db
+        self._queue: "queue.Queue" = queue.Queue(maxsize=self.MAX_QUEUE)
+        self._cond = threading.Condition()
+        # 번호 부여와 큐 삽입을 묶어 큐 안의 순서가 항상 번호 순이 되게 한다.
+        # 큐가 가득 차면 put()이 막히므로 쓰기 스레드가 잡는 _cond와는 따로 둔다.
+        self._submit_lock = threading.Lock()
+        self._submitted = 0
+        self._committed = 0
+
+    def submit(self, op: Callable[[sqlite3.Connection], None]):
+        """Queue a write; blocks only when MAX_QUEUE writes are already pending."""
+        with self._submit_lock:
+            self._submitted += 1
+            self._queue.put((self._submitted, op))
+
+    def flush(self, timeout: float = None) -> bool:
+        """Wait until every write submitted so far is committed.
+
+        Returns False on timeout, or if the writer thread has ended with
+        writes still uncommitted.
+        """
+        if threading.current_thread() is self:
+            return True
+        with self._cond:
+            target = self._submitted
+            self._cond.wait_for(
+                lambda: self._committed >= target or not self.is_alive(),
+                timeout,
+            )
+            return self._committed >= target
+
+    @property
+    def pending(self) -> int:
+        return self._submitted - self._committed
+
+    def stop(self, timeout: float = 5.0):
+        """Commit everything still queued, then end the thread."""
+        if not self.is_alive():
+            return
+        self._queue.put((None, None))
+        self.join(timeout)
+
+    def run(self):
+        try:
+            self._run()
+        finally:
+            # 어떤 이유로 끝나든 flush()에서 기다리는 쪽을 깨운다
+            with self._cond:
+                self._cond.notify_all()
+
+    def _run(self):
+        conn = self._db._conn()
+        stopping = False
+        while not stopping:
+            seq, op = self._queue.get()
+            if op is None:
+                break
+            batch = [(seq, op)]
+            deadline = time.monotonic() + self.BATCH_WINDOW
+            while len(batch) < self.MAX_BATCH:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 \
+                        else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item[1] is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            self._commit(conn, [op for _, op in batch])
+            with self._cond:
+                self._committed = max(self._committed, batch[-1][0])
+                self._cond.notify_all()
+
+        self._db.release_connection()
+
+    @staticmethod
+    def _commit(conn: sqlite3.Connection, ops: list):
+        try:
+            with conn:
+                for op in ops:
+                    op(conn)
+            return
+        except Exception as e:
+            print(f"[DatabaseWriter] Batch failed, retrying individually: {e}")
+        # 한 건의 오류로 묶음 전체를 잃지 않도록 개별 트랜잭션으로 재시도
+        # (sqlite 오류뿐 아니라 잘못된 입력으로 인한 예외도 그 작업만 건너뛴다)
+        for op in ops:
+            try:
+                with conn:
+                    op(conn)
+            except Exception as e:
+                print(f"[DatabaseWriter] Write failed: {e}")
 
 
 class DownloadDatabase:
+    """Download history store.
+
+    Each thread gets one long-lived connection (WAL journal, synchronous=NORMAL)
+    instead of a connect/close per call. Writes go through a DatabaseWriter
+    thread so the GUI thread never waits on a commit; reads first flush
+    pending writes, so callers always see their own writes.
+    """
+
+    PRAGMAS = (
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA cache_size=-8000",       # 8 MB page cache
+        "PRAGMA mmap_size=67108864",     # 64 MB memory-mapped reads
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA busy_timeout=5000",
+    )
+    CACHED_STATEMENTS = 64
+
     def __init__(self, db_path: str = None):
         if db_path is None:
             app_data = os.path.join(os.path.expanduser("~"), ".youtube_downloader")
             os.makedirs(app_data, exist_ok=True)
             db_path = os.path.join(app_data, "downloads.db")
         self.db_path = db_path
+        self._local = threading.local()
+        self._connections: list = []
+        self._conn_lock = threading.Lock()
         self._init_db()
+        self._has_fts = self._conn().execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'downloads_fts'"
+        ).fetchone() is not None
+        self._id_lock = threading.Lock()
+        self._next_id = self._load_next_id()
+        self._writer = DatabaseWriter(self)
+        self._writer.start()
+
+    # ── Connections ─────────────────────────────────────
+
+    def _conn(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.db_path,
+                check_same_thread=False,
+                cached_statements=self.CACHED_STATEMENTS,
+            )
+            conn.row_factory = sqlite3.Row
+            for pragma in self.PRAGMAS:
+                conn.execute(pragma)
+            self._local.conn = conn
+            with self._conn_lock:
+                self._connections.append(conn)
+        return conn
+
+    def release_connection(self):
+        """Close the calling thread's connection (for short-lived worker threads)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            return
+        self._local.conn = None
+        with self._conn_lock:
+            if conn in self._connections:
+                self._connections.remove(conn)
+        conn.close()
+
+    def close(self):
+        """Flush pending writes and close every connection (app shutdown)."""
+        self._writer.stop()
+        with self._conn_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        self._local = threading.local()
 
     def _init_db(self):
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS downloads (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    url TEXT NOT NULL,
-                    video_id TEXT,
-                    title TEXT,
-                    channel TEXT,
-                    thumbnail_url TEXT,
-                    file_path TEXT,
-                    format TEXT,
-                    quality TEXT,
-                    filesize INTEGER,
-                    duration INTEGER,
-                    download_type TEXT DEFAULT 'video',
-                    status TEXT DEFAULT 'completed',
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            conn.commit()
+        conn = self._conn()
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        for target, migrate in enumerate(_MIGRATIONS, start=1):
+            if version >= target:
+                continue
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                migrate(conn)
+                conn.execute(f"PRAGMA user_version = {target}")
+            version = target
+
+    # ── Writes ──────────────────────────────────────────
+
+    def _load_next_id(self) -> int:
+        # id는 쓰기 스레드에 넘기기 전에 미리 배정해 add_record가 바로 반환할 수 있게 한다
+        conn = self._conn()
+        row = conn.execute(
+            "SELECT seq FROM sqlite_sequence WHERE name = 'downloads'"
+        ).fetchone()
+        max_id = conn.execute("SELECT MAX(id) FROM downloads").fetchone()[0]
+        return max(row[0] if row else 0, max_id or 0) + 1
+
+    def _allocate_id(self) -> int:
+        with self._id_lock:
+            record_id = self._next_id
+            self._next_id += 1
+            return record_id
+
+    def flush(self, timeout: float = None) -> bool:
+        """Block until queued writes are committed."""
+        return self._writer.flush(timeout)
+
+    def _read(self) -> sqlite3.Connection:
+        # read-your-writes: 대기 중인 쓰기가 있으면 커밋될 때까지 기다린다
+        if self._writer.pending:
+            self._writer.flush()
+        return self._conn()
+
+    # ── Records ─────────────────────────────────────────
 
     def add_record(self, url: str, video_id: str, title: str, channel: str,
                    thumbnail_url: str, file_path: str, fmt: str, quality: str,
-                   filesize: int, duration: int, download_type: str = "video"):
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(
-                """INSERT INTO downloads
-                   (url, video_id, title, channel, thumbnail_url, file_path,
-                    format, quality, filesize, duration, download_type, status, created_at)
-                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 'completed', ?)""",
-                (url, video_id, title, channel, thumbnail_url, file_path,
-                 fmt, quality, filesize, duration, download_type,
-                 datetime.now().isoformat()),
-            )
-            conn.commit()
+                   filesize: int, duration: int, download_type: str = "video",
+                   elapsed: float = 0.0) -> int:
+        """Insert a completed download; elapsed (download seconds) feeds throughput stats."""
+        record_id = self._allocate_id()
+        now = int(time.time())
+        params = (record_id, url, video_id, title, channel, thumbnail_url, file_path,
+                  fmt, quality, filesize, duration, download_type, now)
+
+        def op(conn):
+            conn.execute(_INSERT_RECORD, params)
+            self._bump_stats(conn, now, channel, download_type,
+                             completed=1, nbytes=filesize or 0, seconds=elapsed)
+
+        self._writer.submit(op)
+        return record_id
+
+    def record_failure(self, channel: str, download_type: str = "video"):
+        """Count a failed download in the rollups (failures are not kept as records)."""
+        now = int(time.time())
+        self._writer.submit(
+            lambda conn: self._bump_stats(conn, now, channel, download_type, failed=1)
+        )
+
+    @staticmethod
+    def _bump_stats(conn: sqlite3.Connection, ts: int, channel: str, download_type: str,
+                    completed: int = 0, failed: int = 0, nbytes: int = 0,
+                    seconds: float = 0.0):
+        day = time.strftime("%Y-%m-%d", time.localtime(ts))
+        # 처리 속도는 소요 시간을 아는 다운로드의 바이트만으로 계산한다
+        timed_bytes = nbytes if seconds > 0 else 0
+        for (table, _), key in zip(_STATS_TABLES, (day, channel or "", download_type or "video")):
+            conn.execute(_UPSERT_STATS[table],
+                         (key, completed, failed, nbytes, seconds, timed_bytes))
 
     def get_all_records(self, limit: int = 100) -> list:
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        cursor = self._read().execute(_SELECT_RECENT, (limit,))
+        return [dict(row) for row in cursor.fetchall()]
+
+    def get_records_before(self, record_id: int = None, limit: int = 50) -> list:
+        """Records older than record_id (newest first), for paging history back in."""
+        if record_id is None:
+            cursor = self._read().execute(_SELECT_NEWEST, (limit,))
+        else:
+            cursor = self._read().execute(_SELECT_BEFORE, (record_id, limit))
+        return [dict(row) for row in cursor.fetchall()]
+
+    @staticmethod
+    def _encode_cursor(created_at: int, record_id: int) -> str:
+        raw = f"{created_at}:{record_id}".encode("ascii")
+        return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> tuple:
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            created_at, record_id = raw.decode("ascii").split(":")
+            return int(created_at), int(record_id)
+        except (ValueError, UnicodeDecodeError):
+            raise ValueError(f"Invalid cursor: {cursor!r}")
+
+    def get_history_page(self, limit: int = 100, cursor: str = None,
+                         since: int = None, until: int = None, channel: str = None,
+                         download_type: str = None, status: str = None) -> tuple:
+        """One page of history, newest first: (records, next_cursor).
+
+        Keyset pagination on (created_at, id): each page is a single index
+        range scan regardless of how deep it is. next_cursor is None on the
+        last page. since/until are epoch seconds (since inclusive, until
+        exclusive).
+        """
+        where, params = [], []
+        if cursor:
+            where.append("(created_at, id) < (?, ?)")
+            params.extend(self._decode_cursor(cursor))
+        for clause, value in (("created_at >= ?", since), ("created_at < ?", until),
+                              ("channel = ?", channel),
+                              ("download_type = ?", download_type),
+                              ("status = ?", status)):
+            if value is not None:
+                where.append(clause)
+                params.append(value)
+
+        sql = "SELECT * FROM downloads"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        # 한 행 더 읽어 다음 페이지가 있는지 확인한다
+        sql += " ORDER BY created_at DESC, id DESC LIMIT ?"
+        params.append(limit + 1)
+
+        records = [dict(row) for row in self._read().execute(sql, params).fetchall()]
+        next_cursor = None
+        if len(records) > limit:
+            records = records[:limit]
+            last = records[-1]
+            next_cursor = self._encode_cursor(last["created_at"], last["id"])
+        return records, next_cursor
+
+    # SQLite 바인드 변수 개수 제한을 넘지 않도록 나눠서 조회
+    _LOOKUP_CHUNK = 500
+
+    def find_downloaded(self, video_ids: list, download_type: str,
+                        fmt: str, quality: str) -> dict:
+        """video_id → newest matching record whose file is still on disk.
+
+        Matches the exact (video_id, download_type, format, quality) variant
+        via idx_downloads_variant; records whose file is gone or empty are
+        ignored so they get downloaded again. The file state recorded by
+        LibraryScanner is trusted; only never-scanned records are stat'ed.
+        """
+        found = {}
+        ids = [vid for vid in dict.fromkeys(video_ids) if vid]
+        conn = self._read()
+        for start in range(0, len(ids), self._LOOKUP_CHUNK):
+            chunk = ids[start:start + self._LOOKUP_CHUNK]
+            marks = ", ".join("?" * len(chunk))
             cursor = conn.execute(
-                "SELECT * FROM downloads ORDER BY created_at DESC LIMIT ?",
-                (limit,),
+                _SELECT_VARIANT.format(marks=marks),
+                (*chunk, download_type, fmt, quality),
             )
-            return [dict(row) for row in cursor.fetchall()]
+            for row in cursor.fetchall():
+                vid = row["video_id"]
+                if vid in found or row["file_exists"] == 0:
+                    continue
+                if row["file_exists"] == 1:
+                    found[vid] = dict(row)
+                    continue
+                try:
+                    if os.stat(row["file_path"]).st_size > 0:
+                        found[vid] = dict(row)
+                except (OSError, TypeError, ValueError):
+                    pass
+        return found
+
+    def latest_records(self, video_ids: list) -> dict:
+        """video_id → its newest history record, any variant (via idx_downloads_variant)."""
+        found = {}
+        ids = [vid for vid in dict.fromkeys(video_ids) if vid]
+        conn = self._read()
+        for start in range(0, len(ids), self._LOOKUP_CHUNK):
+            chunk = ids[start:start + self._LOOKUP_CHUNK]
+            marks = ", ".join("?" * len(chunk))
+            cursor = conn.execute(_SELECT_BY_VIDEO.format(marks=marks), chunk)
+            for row in cursor.fetchall():
+                found.setdefault(row["video_id"], dict(row))
+        return found
+
+    def search(self, query: str, limit: int = 50) -> list:
+        """Full-text search over title/channel/url/file_path (newest first).
+
+        Every whitespace-separated term must appear as a substring of one of
+        the columns. Terms of three or more characters are answered by the
+        FTS5 trigram index; shorter ones are checked with LIKE on the rows it
+        returns (or on the whole table if no term is long enough).
+        """
+        terms = query.split()
+        if not terms:
+            return []
+        long_terms = [t for t in terms if len(t) >= _FTS_MIN_TERM] if self._has_fts else []
+        short_terms = [t for t in terms if t not in long_terms]
+
+        where, params = [], []
+        for term in short_terms:
+            pattern = "%" + term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            where.append("(" + " OR ".join(
+                f"d.{col} LIKE ? ESCAPE '\\'" for col in _SEARCH_COLUMNS) + ")")
+            params.extend([pattern] * len(_SEARCH_COLUMNS))
+
+        if long_terms:
+            match = " AND ".join('"' + t.replace('"', '""') + '"' for t in long_terms)
+            sql = ("SELECT d.* FROM downloads_fts f JOIN downloads d ON d.id = f.rowid "
+                   "WHERE downloads_fts MATCH ?")
+            params.insert(0, match)
+            if where:
+                sql += " AND " + " AND ".join(where)
+        else:
+            sql = "SELECT d.* FROM downloads d WHERE " + " AND ".join(where)
+        # id 역순 = 최신순. FTS5는 rowid 순서로 결과를 내므로 LIMIT에서 바로 멈춘다
+        sql += (" ORDER BY f.rowid DESC" if long_terms else " ORDER BY d.id DESC") + " LIMIT ?"
+        params.append(limit)
+
+        cursor = self._read().execute(sql, params)
+        return [dict(row) for row in cursor.fetchall()]
 
     def delete_record(self, record_id: int):
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("DELETE FROM downloads WHERE id = ?", (record_id,))
-            conn.commit()
+        self._writer.submit(
+            lambda conn: conn.execute("DELETE FROM downloads WHERE id = ?", (record_id,))
+        )
 
     def clear_all(self):
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("DELETE FROM downloads")
-            conn.commit()
+        self._writer.submit(lambda conn: conn.execute("DELETE FROM downloads"))
+
+    # ── Jobs ────────────────────────────────────────────
+
+    def save_job(self, video_id: str, url: str, spec: dict, options: dict,
+                 state: str = "queued"):
+        """Insert or replace the job for video_id (spec/options as JSON)."""
+        now = int(time.time())
+        params = (video_id, url, json.dumps(spec, ensure_ascii=False),
+                  json.dumps(options, ensure_ascii=False), state,
+                  int(options.get("priority", 0)), now, now)
+        self._writer.submit(lambda conn: conn.execute(_UPSERT_JOB, params))
+
+    def update_job(self, video_id: str, state: str = None,
+                   partial_path: str = None, error_message: str = None):
+        """Record a state change (and optionally the partial file / error)."""
+        sets, params = ["updated_at = ?"], [int(time.time())]
+        for column, value in (("state", state), ("partial_path", partial_path),
+                              ("error_message", error_message)):
+            if value is not None:
+                sets.append(f"{column} = ?")
+                params.append(value)
+        params.append(video_id)
+        sql = f"UPDATE jobs SET {', '.join(sets)} WHERE video_id = ?"
+        self._writer.submit(lambda conn: conn.execute(sql, params))
+
+    def delete_job(self, video_id: str):
+        self._writer.submit(
+            lambda conn: conn.execute("DELETE FROM jobs WHERE video_id = ?", (video_id,))
+        )
+
+    def delete_jobs(self, states: tuple):
+        marks = ", ".join("?" * len(states))
+        self._writer.submit(
+            lambda conn: conn.execute(f"DELETE FROM jobs WHERE state IN ({marks})", states)
+        )
+
+    def get_jobs(self, states: tuple = RESUMABLE_JOB_STATES, limit: int = -1,
+                 video_ids: list = None) -> list:
+        """Jobs in the given states (optionally only these video_ids), highest
+        priority then oldest first, with spec/options decoded."""
+        return self._select_jobs(self._read(), states, limit, video_ids)
+
+    def load_jobs(self, callback: Callable[[list], None],
+                  states: tuple = ("queued",), limit: int = -1):
+        """get_jobs on the writer thread; callback(jobs) is called there.
+
+        The read is ordered after every write submitted before it, so it sees
+        them without the caller waiting on a commit (no flush on the GUI thread).
+        """
+        delivered = []
+
+        def op(conn):
+            # 묶음이 실패해 개별 재시도되더라도 콜백은 한 번만
+            if not delivered:
+                delivered.append(True)
+                callback(self._select_jobs(conn, states, limit))
+
+        self._writer.submit(op)
+
+    def get_job_ids(self, states: tuple) -> list:
+        """video_ids of the jobs in these states (without loading spec/options)."""
+        marks = ", ".join("?" * len(states))
+        cursor = self._read().execute(
+            f"SELECT video_id FROM jobs WHERE state IN ({marks})", states)
+        return [row[0] for row in cursor.fetchall()]
+
+    @staticmethod
+    def _select_jobs(conn: sqlite3.Connection, states: tuple, limit: int,
+                     video_ids: list = None) -> list:
+        marks = ", ".join("?" * len(states))
+        where, params = f"state IN ({marks})", list(states)
+        if video_ids is not None:
+            where += f" AND video_id IN ({', '.join('?' * len(video_ids))})"
+            params += video_ids
+        cursor = conn.execute(
+            f"SELECT * FROM jobs WHERE {where} ORDER BY priority DESC, id LIMIT ?",
+            (*params, limit),
+        )
+        jobs = []
+        for row in cursor.fetchall():
+            job = dict(row)
+            job["spec"] = json.loads(job["spec"])
+            job["options"] = json.loads(job["options"])
+            jobs.append(job)
+        return jobs
+
+    # ── Stats ───────────────────────────────────────────
+
+    def get_stats(self, days: int = 30, top_channels: int = 10) -> dict:
+        """Aggregates from the rollup tables only — O(days + top_channels)."""
+        conn = self._read()
+        since = time.strftime("%Y-%m-%d", time.localtime(time.time() - (days - 1) * 86400))
+        daily = [dict(r) for r in conn.execute(
+            "SELECT * FROM stats_daily WHERE day >= ? ORDER BY day", (since,))]
+        by_type = [dict(r) for r in conn.execute(
+            "SELECT * FROM stats_type ORDER BY download_type")]
+        channels = [dict(r) for r in conn.execute(
+            "SELECT * FROM stats_channel ORDER BY bytes DESC LIMIT ?", (top_channels,))]
+
+        totals = {"completed": 0, "failed": 0, "bytes": 0, "seconds": 0.0, "timed_bytes": 0}
+        for row in by_type:
+            for k in totals:
+                totals[k] += row[k]
+        for row in daily + by_type + channels + [totals]:
+            attempts = row["completed"] + row["failed"]
+            row["failure_rate"] = row["failed"] / attempts if attempts else 0.0
+            row["avg_speed"] = row["timed_bytes"] / row["seconds"] if row["seconds"] else 0.0
+        return {"days": days, "totals": totals, "daily": daily,
+                "by_type": by_type, "top_channels": channels}
+
+    # ── Library scan ────────────────────────────────────
+
+    def get_scan_targets(self) -> list:
+        """(id, video_id, file_path, file_exists, checked_at) of every record with a path."""
+        cursor = self._read().execute(
+            """SELECT id, video_id, file_path, file_exists, checked_at
+               FROM downloads WHERE file_path IS NOT NULL AND file_path != ''"""
+        )
+        return [dict(row) for row in cursor.fetchall()]
+
+    def get_scan_dirs(self) -> dict:
+        """Directory → mtime it had when it was last scanned."""
+        cursor = self._read().execute("SELECT path, mtime FROM scan_dirs")
+        return {row["path"]: row["mtime"] for row in cursor.fetchall()}
+
+    def save_scan_results(self, file_states: list, dirs: list):
+        """file_states: [(exists, size, mtime, record_id)], dirs: [(path, mtime)]."""
+        now = int(time.time())
+        states = [(exists, size, mtime, now, rid) for exists, size, mtime, rid in file_states]
+        dir_rows = [(path, mtime, now) for path, mtime in dirs]
+
+        def op(conn):
+            conn.executemany(
+                """UPDATE downloads SET file_exists = ?, file_size_disk = ?,
+                   file_mtime = ?, checked_at = ? WHERE id = ?""", states)
+            conn.executemany(
+                "INSERT OR REPLACE INTO scan_dirs (path, mtime, scanned_at) VALUES (?, ?, ?)",
+                dir_rows)
+
+        self._writer.submit(op)
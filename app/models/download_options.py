@@ -0,0 +1,30 @@
+from dataclasses import asdict, dataclass, fields
+
+
+@dataclass
+class DownloadOptions:
+    """Snapshot of the toolbar choices a job was queued with.
+
+    Stored with each job so queued/restored downloads keep their own settings
+    even if the toolbar changes before they start.
+    """
+
+    save_dir: str = ""
+    download_type: str = "video"  # video or audio
+    quality: str = "best"
+    fmt: str = "mp4"
+    subtitle: bool = False
+    subtitle_lang: str = "한국어"
+    audio_track: str = "기본"
+    frame_rate: str = "최고"
+    codec: str = "H264"
+    priority: int = 0  # 클수록 먼저 시작
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "DownloadOptions":
+        # 알 수 없는 키(이전/이후 버전)는 무시한다
+        names = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in (data or {}).items() if k in names})
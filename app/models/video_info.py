@@ -1,4 +1,7 @@
 from dataclasses import dataclass, field
+from typing import Optional
+
+from app.models.download_options import DownloadOptions
 
 
 @dataclass
@@ -27,6 +30,8 @@ class VideoInfo:
 
     # Internal
     added_index: int = 0  # 추가 순서 (정렬용)
+    record_id: int = 0  # downloads 테이블 id (이력에 저장된 경우)
+    options: Optional[DownloadOptions] = None  # 작업 추가 시점의 다운로드 설정
 
     # Download state
     status: str = "pending"  # pending, downloading, completed, error, cancelled
@@ -34,5 +39,7 @@ class VideoInfo:
     speed: float = 0.0
     eta: int = 0
     downloaded_path: str = ""
+    partial_path: str = ""  # 다운로드 중인 (.part) 파일 경로
+    file_missing: bool = False  # 라이브러리 스캔에서 파일이 없다고 확인됨
     error_message: str = ""
     download_type: str = "video"  # video or audio
@@ -54,5 +54,21 @@ def is_youtube_url(url: str) -> bool:
     return any(re.search(p, url) for p in patterns)
 
 
+_VIDEO_ID_PATTERNS = (
+    re.compile(r"[?&]v=([\w-]{11})"),
+    re.compile(r"youtu\.be/([\w-]{11})"),
+    re.compile(r"youtube\.com/(?:shorts|embed|live)/([\w-]{11})"),
+)
+
+
+def extract_video_id(url: str) -> str:
+    """YouTube 영상 URL에서 11자리 video id를 꺼낸다 (없으면 빈 문자열)."""
+    for pattern in _VIDEO_ID_PATTERNS:
+        m = pattern.search(url)
+        if m:
+            return m.group(1)
+    return ""
+
+
 def is_playlist_url(url: str) -> bool:
     return "playlist?list=" in url or "&list=" in url
@@ -0,0 +1,135 @@
+"""Precomputed search index for filtering download items.
+
+Titles/channels are normalized once when an item is added so that each
+keystroke only does substring checks on ready-made strings. Korean text is
+indexed both as decomposed jamo (partial syllable input, e.g. "하" → "한국")
+and as chosung (initial consonant search, e.g. "ㅎㄱ" → "한국").
+"""
+
+import unicodedata
+from typing import Dict, Optional, Set, Tuple
+
+_HANGUL_BASE = 0xAC00
+_HANGUL_LAST = 0xD7A3
+
+_CHOSUNG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_JUNGSUNG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+_JONGSUNG = ("", "ㄱ", "ㄲ", "ㄳ", "ㄴ", "ㄵ", "ㄶ", "ㄷ", "ㄹ", "ㄺ", "ㄻ",
+             "ㄼ", "ㄽ", "ㄾ", "ㄿ", "ㅀ", "ㅁ", "ㅂ", "ㅄ", "ㅅ", "ㅆ", "ㅇ",
+             "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ")
+
+# 겹모음/겹받침 → 구성 자모 (입력 중인 글자와도 매칭되도록)
+_COMPOUND = {
+    "ㅘ": "ㅗㅏ", "ㅙ": "ㅗㅐ", "ㅚ": "ㅗㅣ", "ㅝ": "ㅜㅓ", "ㅞ": "ㅜㅔ",
+    "ㅟ": "ㅜㅣ", "ㅢ": "ㅡㅣ", "ㄳ": "ㄱㅅ", "ㄵ": "ㄴㅈ", "ㄶ": "ㄴㅎ",
+    "ㄺ": "ㄹㄱ", "ㄻ": "ㄹㅁ", "ㄼ": "ㄹㅂ", "ㄽ": "ㄹㅅ", "ㄾ": "ㄹㅌ",
+    "ㄿ": "ㄹㅍ", "ㅀ": "ㄹㅎ", "ㅄ": "ㅂㅅ",
+}
+
+_CONSONANTS = frozenset(_CHOSUNG) | frozenset("ㄳㄵㄶㄺㄻㄼㄽㄾㄿㅀㅄ")
+
+
+def normalize_text(text: str) -> str:
+    """NFC + casefold + collapsed whitespace."""
+    text = unicodedata.normalize("NFC", text or "")
+    return " ".join(text.casefold().split())
+
+
+def decompose_jamo(text: str) -> str:
+    """Split Hangul syllables into compatibility jamo; other chars pass through."""
+    out = []
+    for ch in text:
+        code = ord(ch)
+        if _HANGUL_BASE <= code <= _HANGUL_LAST:
+            idx = code - _HANGUL_BASE
+            jamo = (_CHOSUNG[idx // 588]
+                    + _JUNGSUNG[(idx % 588) // 28]
+                    + _JONGSUNG[idx % 28])
+            for j in jamo:
+                out.append(_COMPOUND.get(j, j))
+        else:
+            out.append(_COMPOUND.get(ch, ch))
+    return "".join(out)
+
+
+def to_chosung(text: str) -> str:
+    """Replace each Hangul syllable with its initial consonant."""
+    out = []
+    for ch in text:
+        code = ord(ch)
+        if _HANGUL_BASE <= code <= _HANGUL_LAST:
+            out.append(_CHOSUNG[(code - _HANGUL_BASE) // 588])
+        else:
+            out.append(ch)
+    return "".join(out)
+
+
+def is_chosung_query(query: str) -> bool:
+    """True if the query consists only of consonant jamo (and spaces)."""
+    stripped = query.replace(" ", "")
+    return bool(stripped) and all(ch in _CONSONANTS for ch in stripped)
+
+
+class SearchIndex:
+    """key → normalized text index with incremental query narrowing."""
+
+    def __init__(self):
+        self._entries: Dict[str, Tuple[str, str]] = {}  # key -> (jamo, chosung)
+        self._last_query: Tuple[bool, str] = (False, "")
+        self._last_result: Optional[Set[str]] = None
+
+    def add(self, key: str, *texts: str):
+        norm = "\x00".join(normalize_text(t) for t in texts if t)
+        self._entries[key] = (decompose_jamo(norm), to_chosung(norm))
+        self._last_result = None
+
+    def remove(self, key: str):
+        if self._entries.pop(key, None) is not None:
+            self._last_result = None
+
+    def clear(self):
+        self._entries.clear()
+        self._last_result = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _prepare(query: str) -> Tuple[bool, str]:
+        norm = normalize_text(query)
+        if is_chosung_query(norm):
+            return True, norm
+        return False, decompose_jamo(norm)
+
+    @staticmethod
+    def _hit(entry: Tuple[str, str], chosung: bool, needle: str) -> bool:
+        return needle in (entry[1] if chosung else entry[0])
+
+    def matches(self, key: str, query: str) -> bool:
+        """Check a single entry (used when a new item arrives under a filter)."""
+        if not query.strip():
+            return True
+        entry = self._entries.get(key)
+        if entry is None:
+            return False
+        chosung, needle = self._prepare(query)
+        return self._hit(entry, chosung, needle)
+
+    def match(self, query: str) -> Optional[Set[str]]:
+        """Return the set of matching keys, or None when the query is empty."""
+        if not query.strip():
+            return None
+        chosung, needle = self._prepare(query)
+
+        # 이전 검색어를 이어서 입력한 경우 이전 결과 안에서만 다시 찾는다
+        last_chosung, last_needle = self._last_query
+        if (self._last_result is not None and chosung == last_chosung
+                and needle.startswith(last_needle)):
+            candidates = ((k, self._entries[k]) for k in self._last_result)
+        else:
+            candidates = self._entries.items()
+
+        result = {k for k, entry in candidates if self._hit(entry, chosung, needle)}
+        self._last_query = (chosung, needle)
+        self._last_result = result
+        return set(result)
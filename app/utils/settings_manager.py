@@ -86,6 +86,24 @@ class SettingsManager:
     def default_save_path(self, v: str):
         self._qs.setValue("advanced/default_save_path", v)
 
+    @property
+    def max_completed_items(self) -> int:
+        """완료 항목을 목록(메모리)에 유지할 최대 개수. 나머지는 이력 DB에서 다시 불러온다."""
+        return self._qs.value("advanced/max_completed_items", 200, type=int)
+
+    @max_completed_items.setter
+    def max_completed_items(self, v: int):
+        self._qs.setValue("advanced/max_completed_items", v)
+
+    @property
+    def skip_downloaded(self) -> bool:
+        """이력에 있고 파일도 남아 있는 영상은 정보 추출/다운로드를 건너뛴다."""
+        return self._qs.value("advanced/skip_downloaded", True, type=bool)
+
+    @skip_downloaded.setter
+    def skip_downloaded(self, v: bool):
+        self._qs.setValue("advanced/skip_downloaded", v)
+
     @property
     def filename_numbering(self) -> bool:
         return self._qs.value("advanced/filename_numbering", False, type=bool)
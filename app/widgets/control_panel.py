@@ -5,6 +5,8 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtCore import Qt, QPropertyAnimation, QEasingCurve, pyqtSignal, QSize
 from PyQt6.QtGui import QFont, QMouseEvent
 
+from app.utils.helpers import format_file_size, format_speed
+
 
 class ControlPanelOverlay(QWidget):
     """Transparent overlay behind the control panel. Clicking it closes the panel."""
@@ -221,6 +223,34 @@ class ControlPanel(QWidget):
         sep4.setObjectName("cpSeparator")
         content_layout.addWidget(sep4)
 
+        # ── Download stats section ───────────────────
+        stats_section = QWidget()
+        stats_section.setObjectName("cpStatsSection")
+        stats_layout = QVBoxLayout(stats_section)
+        stats_layout.setContentsMargins(16, 12, 16, 12)
+        stats_layout.setSpacing(8)
+
+        stats_title = QLabel("다운로드 통계")
+        stats_title.setObjectName("cpStatsTitle")
+        stf = stats_title.font()
+        stf.setPointSize(12)
+        stf.setBold(True)
+        stats_title.setFont(stf)
+        stats_layout.addWidget(stats_title)
+
+        self.lbl_stats_body = QLabel("통계가 없습니다.")
+        self.lbl_stats_body.setObjectName("cpStatsBody")
+        self.lbl_stats_body.setWordWrap(True)
+        stats_layout.addWidget(self.lbl_stats_body)
+
+        content_layout.addWidget(stats_section)
+
+        # ── Separator ────────────────────────────────
+        sep5 = QFrame()
+        sep5.setFrameShape(QFrame.Shape.HLine)
+        sep5.setObjectName("cpSeparator")
+        content_layout.addWidget(sep5)
+
         # ── Download notifications section ───────────
         notif_section = QWidget()
         notif_section.setObjectName("cpNotifSection")
@@ -312,6 +342,30 @@ class ControlPanel(QWidget):
     def update_notification(self, title: str, message: str):
         self.lbl_notif_body.setText(f"{title}\n{message}")
 
+    def update_stats(self, stats: dict):
+        """Render DownloadDatabase.get_stats() output."""
+        daily = stats.get("daily", [])
+        totals = stats.get("totals", {})
+        if not totals.get("completed") and not totals.get("failed"):
+            self.lbl_stats_body.setText("통계가 없습니다.")
+            return
+
+        recent_count = sum(d["completed"] for d in daily)
+        recent_bytes = sum(d["bytes"] for d in daily)
+        lines = [
+            f"최근 {stats.get('days', len(daily))}일: {recent_count}개 · "
+            f"{format_file_size(recent_bytes)}",
+            f"전체: {totals['completed']}개 · {format_file_size(totals['bytes'])}",
+            f"실패율: {totals['failure_rate']:.1%}",
+        ]
+        if totals.get("avg_speed"):
+            lines.append(f"평균 속도: {format_speed(totals['avg_speed'])}")
+        top = stats.get("top_channels", [])[:3]
+        if top:
+            lines.append("많이 받은 채널: " + ", ".join(
+                c["channel"] or "알 수 없음" for c in top))
+        self.lbl_stats_body.setText("\n".join(lines))
+
     def resizeEvent(self, event):
         super().resizeEvent(event)
 
@@ -7,7 +7,6 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import Qt, pyqtSignal, QSize, QUrl
 from PyQt6.QtGui import QPixmap, QDesktopServices, QMouseEvent
-import requests
 
 from app.models.video_info import VideoInfo
 from app.utils.helpers import format_duration, format_file_size, format_speed
@@ -19,13 +18,20 @@ class DownloadItemWidget(QWidget):
     cancel_requested = pyqtSignal(str)  # video_id
     remove_requested = pyqtSignal(str)  # video_id
     clicked = pyqtSignal(str)  # video_id — for selection management
+    status_changed = pyqtSignal(str, str, str)  # video_id, old, new
+    changed = pyqtSignal(str)  # video_id — progress/경로/오류 등 상태 외 필드 변경
 
     def __init__(self, video_info: VideoInfo, parent=None):
         super().__init__(parent)
         self.video_info = video_info
         self._selected = False
+        self._thumbnail_loaded = False
+        self._deferred = False
+        self._dirty = False
+        self._last_progress = None
         self._setup_ui()
-        self._load_thumbnail()
+        if not self.video_info.thumbnail_url:
+            self.lbl_thumbnail.setText("No Image")
 
     def _setup_ui(self):
         self.setObjectName("downloadItem")
@@ -117,58 +123,133 @@ class DownloadItemWidget(QWidget):
         self.btn_action.clicked.connect(self._on_action)
         layout.addWidget(self.btn_action)
 
-    def _load_thumbnail(self):
-        if not self.video_info.thumbnail_url:
+    @property
+    def needs_thumbnail(self) -> bool:
+        return bool(self.video_info.thumbnail_url) and not self._thumbnail_loaded
+
+    def set_thumbnail(self, data: bytes):
+        """Apply image data fetched by ThumbnailLoader."""
+        self._thumbnail_loaded = True
+        pixmap = QPixmap()
+        if not data or not pixmap.loadFromData(data):
             self.lbl_thumbnail.setText("No Image")
             return
-        try:
-            resp = requests.get(self.video_info.thumbnail_url, timeout=5)
-            if resp.status_code == 200:
-                pixmap = QPixmap()
-                pixmap.loadFromData(resp.content)
-                self.lbl_thumbnail.setPixmap(
-                    pixmap.scaled(
-                        100, 56,
-                        Qt.AspectRatioMode.KeepAspectRatio,
-                        Qt.TransformationMode.SmoothTransformation,
-                    )
-                )
-        except Exception:
-            self.lbl_thumbnail.setText("No Image")
+        self.lbl_thumbnail.setPixmap(
+            pixmap.scaled(
+                100, 56,
+                Qt.AspectRatioMode.KeepAspectRatio,
+                Qt.TransformationMode.SmoothTransformation,
+            )
+        )
 
     def update_progress(self, data: dict):
         status = data.get("status", "")
 
         if status == "downloading":
-            pct = data.get("progress", 0)
-            speed = data.get("speed", 0)
+            self.set_status("downloading")
+            self.video_info.progress = data.get("progress", 0)
+            self.video_info.speed = data.get("speed", 0)
+            self.video_info.eta = data.get("eta", 0)
+            self.changed.emit(self.video_info.video_id)
+
+        if self._deferred:
+            self._last_progress = data
+            self._dirty = True
+            return
+        self._render_progress(data)
+
+    def _render_progress(self, data: dict):
+        status = data.get("status", "")
+
+        if status == "downloading":
             self.progress_bar.setVisible(True)
-            self.progress_bar.setValue(int(pct))
-            self.lbl_status.setText(format_speed(speed))
-            self.video_info.status = "downloading"
-            self.video_info.progress = pct
-            self.video_info.speed = speed
+            self.progress_bar.setValue(int(data.get("progress", 0)))
+            self.lbl_status.setText(format_speed(data.get("speed", 0)))
 
         elif status == "processing":
             self.progress_bar.setValue(100)
             self.lbl_status.setText("변환 중...")
 
+    def set_status(self, status: str):
+        """Change video_info.status, notifying DownloadList's indexes."""
+        old = self.video_info.status
+        if old == status:
+            return
+        self.video_info.status = status
+        self.status_changed.emit(self.video_info.video_id, old, status)
+
     def set_completed(self, file_path: str):
-        self.video_info.status = "completed"
+        self.set_status("completed")
         self.video_info.downloaded_path = file_path
+        self.changed.emit(self.video_info.video_id)
+        if self._deferred:
+            self._dirty = True
+            return
+        self._render_completed()
+
+    def _render_completed(self):
         self.progress_bar.setVisible(False)
-        self.lbl_status.setText("완료")
-        self.lbl_status.setStyleSheet("color: #4CAF50; font-weight: bold;")
         self.btn_action.setText("✕")
-        self.btn_folder.setVisible(True)
+        if self.video_info.file_missing:
+            self.lbl_status.setText("파일 없음")
+            self.lbl_status.setStyleSheet("color: #FF9800; font-weight: bold;")
+            self.btn_folder.setVisible(False)
+        else:
+            self.lbl_status.setText("완료")
+            self.lbl_status.setStyleSheet("color: #4CAF50; font-weight: bold;")
+            self.btn_folder.setVisible(True)
+
+    def set_file_missing(self, missing: bool):
+        """Apply the library scanner's verdict on the downloaded file."""
+        if self.video_info.file_missing == missing:
+            return
+        self.video_info.file_missing = missing
+        self.changed.emit(self.video_info.video_id)
+        if self.video_info.status != "completed":
+            return
+        if self._deferred:
+            self._dirty = True
+            return
+        self._render_completed()
 
     def set_error(self, msg: str):
-        self.video_info.status = "error"
+        self.set_status("error")
         self.video_info.error_message = msg
+        self.changed.emit(self.video_info.video_id)
+        if self._deferred:
+            self._dirty = True
+            return
+        self._render_error()
+
+    def _render_error(self):
         self.progress_bar.setVisible(False)
         self.lbl_status.setText("오류")
         self.lbl_status.setStyleSheet("color: #f44336; font-weight: bold;")
 
+    # -- Deferred rendering (window hidden / in tray) -------------------------
+
+    def set_deferred(self, deferred: bool):
+        """While deferred, state changes only update video_info; the labels and
+        progress bar are brought up to date by sync_from_info()."""
+        self._deferred = deferred
+        if not deferred and self._dirty:
+            self.sync_from_info()
+
+    def sync_from_info(self):
+        self._dirty = False
+        status = self.video_info.status
+        if status == "completed":
+            self._render_completed()
+        elif status == "error":
+            self._render_error()
+        elif self._last_progress is not None:
+            self._render_progress(self._last_progress)
+        self._last_progress = None
+
+    @property
+    def is_dirty(self) -> bool:
+        return self._dirty
+
     # -- Selection -----------------------------------------------------------
 
     def set_selected(self, selected: bool):
@@ -188,9 +269,10 @@ class DownloadItemWidget(QWidget):
         super().mousePressEvent(event)
 
     def mouseDoubleClickEvent(self, event: QMouseEvent):
+        # 파일 존재 여부는 LibraryScanner가 기록한 값을 쓴다 (클릭마다 stat 하지 않음)
         if (self.video_info.status == "completed"
                 and self.video_info.downloaded_path
-                and os.path.isfile(self.video_info.downloaded_path)):
+                and not self.video_info.file_missing):
             QDesktopServices.openUrl(
                 QUrl.fromLocalFile(self.video_info.downloaded_path)
             )
@@ -201,7 +283,7 @@ class DownloadItemWidget(QWidget):
 
     def _on_open_folder(self):
         path = self.video_info.downloaded_path
-        if path and os.path.exists(path):
+        if path and not self.video_info.file_missing:
             folder = os.path.dirname(path)
             if sys.platform == "win32":
                 subprocess.Popen(["explorer", "/select,", os.path.normpath(path)])
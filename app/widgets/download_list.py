@@ -1,11 +1,15 @@
-from typing import Dict, List, Optional
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QScrollArea, QLabel, QSizePolicy,
 )
-from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtCore import Qt, pyqtSignal, QRect, QTimer
 
 from app.models.video_info import VideoInfo
 from app.widgets.download_item import DownloadItemWidget
+from app.utils.search_index import SearchIndex
+from app.workers.thumbnail_worker import ThumbnailLoader
 
 
 class DownloadList(QWidget):
@@ -14,12 +18,42 @@ class DownloadList(QWidget):
     cancel_requested = pyqtSignal(str)
     remove_requested = pyqtSignal(str)
     count_changed = pyqtSignal(int)
+    tab_counts_changed = pyqtSignal(dict)  # {"all", "video", "audio", "playlist"} -> count
+    history_requested = pyqtSignal()  # scrolled to the end where older history lives
 
     def __init__(self, parent=None):
         super().__init__(parent)
         self._items: Dict[str, DownloadItemWidget] = {}
         self._selected_id: Optional[str] = None
         self._add_counter: int = 0
+        self._prepend_counter: int = 0
+        self._sort_key: str = "added"
+        self._sort_ascending: bool = True
+        self._max_completed: int = 0  # 0 = unlimited
+        self._search_index = SearchIndex()
+        # 추가/제거/상태 변경 시 갱신되는 보조 인덱스 (전체 스캔 방지)
+        self._by_type: Dict[str, Set[str]] = defaultdict(set)
+        self._by_status: Dict[str, Set[str]] = defaultdict(set)
+        self._playlist_ids: Set[str] = set()
+        self._filter_tab: str = "all"
+        self._filter_query: str = ""
+        self._hidden_ids: Set[str] = set()
+        self._thumb_pending: Set[str] = set()
+        self._updates_suspended = False
+        self._queued_count = 0  # set_queued_count
+        # 항목별 변경 버전 (get_downloads 델타용). 둘 다 버전 오름차순 유지.
+        # 시작 시각(ms)부터 세어, 앱 재시작 전에 받은 버전은 하한 아래로 떨어져 reset이 된다
+        self._version = int(time.time() * 1000)
+        self._versions: Dict[str, int] = {}
+        self._removed: Dict[str, int] = {}  # 제거된 id → 제거 시점 버전
+        self._removed_floor = self._version  # 이 버전 이하의 제거 기록은 잘려 나감
+        self._thumb_loader = ThumbnailLoader(self)
+        self._thumb_loader.loaded.connect(self._on_thumbnail_loaded)
+        self._thumb_loader.failed.connect(lambda vid: self._on_thumbnail_loaded(vid, b""))
+        self._thumb_timer = QTimer(self)
+        self._thumb_timer.setSingleShot(True)
+        self._thumb_timer.setInterval(50)
+        self._thumb_timer.timeout.connect(self._request_visible_thumbnails)
         self._setup_ui()
 
     def _setup_ui(self):
@@ -54,34 +88,324 @@ class DownloadList(QWidget):
         self.container_layout.insertWidget(0, self.lbl_empty)
 
         self.scroll_area.setWidget(self.container)
+
+        # 대기 작업 자리표시 행 — 대기 작업은 항목 위젯 없이 jobs 테이블에만 있다
+        self.lbl_queued = QLabel()
+        self.lbl_queued.setObjectName("queuedPlaceholder")
+        self.lbl_queued.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.lbl_queued.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+        self.lbl_queued.hide()
+
+        main_layout.addWidget(self.lbl_queued)
         main_layout.addWidget(self.scroll_area)
 
+        self.scroll_area.verticalScrollBar().valueChanged.connect(
+            self._schedule_thumbnails
+        )
+        self.scroll_area.verticalScrollBar().valueChanged.connect(
+            self._on_scrolled
+        )
+
     def add_item(self, video_info: VideoInfo) -> DownloadItemWidget:
         self.lbl_empty.hide()
+        widget = self._create_widget(video_info)
+
+        # Insert before the stretch
+        count = self.container_layout.count()
+        self.container_layout.insertWidget(count - 1, widget)
+        self._emit_counts()
+        self._schedule_thumbnails()
+        return widget
 
+    def add_items(self, video_infos: List[VideoInfo],
+                  prepend: bool = False) -> List[DownloadItemWidget]:
+        """Bulk insert (playlists): one layout pass and a single count_changed.
+
+        With prepend=True the items (given oldest first) are ordered before
+        everything already in the list — older history paged back in.
+        """
+        if not video_infos:
+            return []
+        self.lbl_empty.hide()
+
+        self.container.setUpdatesEnabled(False)
+        self.container_layout.setEnabled(False)
+        widgets = []
+        try:
+            insert_at = self.container_layout.count() - 1
+            next_index = None
+            if prepend:
+                insert_at = 1 if self.container_layout.indexOf(self.lbl_empty) == 0 else 0
+                # 기존 항목보다 앞에 정렬되는 음수 인덱스
+                self._prepend_counter -= len(video_infos)
+                next_index = self._prepend_counter
+            for vi in video_infos:
+                widget = self._create_widget(vi, added_index=next_index)
+                if next_index is not None:
+                    next_index += 1
+                self.container_layout.insertWidget(insert_at, widget)
+                insert_at += 1
+                widgets.append(widget)
+        finally:
+            self.container_layout.setEnabled(True)
+            self.container_layout.activate()
+            self.container.setUpdatesEnabled(True)
+
+        self._emit_counts()
+        self._schedule_thumbnails()
+        return widgets
+
+    def _create_widget(self, video_info: VideoInfo,
+                       added_index: Optional[int] = None) -> DownloadItemWidget:
         # 추가 순서 기록
-        self._add_counter += 1
-        video_info.added_index = self._add_counter
+        if added_index is None:
+            self._add_counter += 1
+            added_index = self._add_counter
+        video_info.added_index = added_index
 
         # Remove existing widget with same video_id to prevent orphans
         vid = video_info.video_id
         old_widget = self._items.pop(vid, None)
         if old_widget:
+            self._unindex(vid, old_widget.video_info)
             self.container_layout.removeWidget(old_widget)
             old_widget.deleteLater()
+            self._hidden_ids.discard(vid)
 
         widget = DownloadItemWidget(video_info)
+        widget.set_deferred(self._updates_suspended)
         widget.cancel_requested.connect(self.cancel_requested.emit)
         widget.remove_requested.connect(self._remove_item)
         widget.clicked.connect(self._select_item)
+        widget.status_changed.connect(self._on_status_changed)
+        widget.changed.connect(self._touch)
 
-        # Insert before the stretch
-        count = self.container_layout.count()
-        self.container_layout.insertWidget(count - 1, widget)
         self._items[vid] = widget
-        self.count_changed.emit(len(self._items))
+        self._touch(vid)
+        self._by_type[video_info.download_type].add(vid)
+        self._by_status[video_info.status].add(vid)
+        if video_info.is_playlist:
+            self._playlist_ids.add(vid)
+        # DB 검색(search)과 같은 컬럼: 제목/채널/URL/파일 경로
+        self._search_index.add(vid, video_info.title, video_info.channel,
+                               video_info.url, video_info.downloaded_path)
+        if widget.needs_thumbnail:
+            self._thumb_pending.add(vid)
+        # 현재 필터에 맞지 않는 항목은 숨긴 채로 추가
+        if not self._passes_filter(vid):
+            widget.setVisible(False)
+            self._hidden_ids.add(vid)
         return widget
 
+    # -- Retention ------------------------------------------------------------
+
+    def set_retention_limit(self, max_completed: int):
+        """Keep at most max_completed finished items materialized (0 = no limit)."""
+        self._max_completed = max_completed
+
+    def enforce_retention(self) -> List[int]:
+        """Evict the oldest completed items beyond the limit.
+
+        They are already in the history DB, so nothing is lost; scrolling to the
+        end of the list or searching brings them back. Returns the record ids
+        of the evicted items.
+        """
+        completed = self._by_status.get("completed")
+        if not self._max_completed or not completed:
+            return []
+        excess = len(completed) - self._max_completed
+        if excess <= 0:
+            return []
+
+        candidates = sorted(
+            (vid for vid in completed if vid != self._selected_id),
+            key=lambda vid: self._items[vid].video_info.record_id,
+        )[:excess]
+
+        evicted = []
+        self.container.setUpdatesEnabled(False)
+        for vid in candidates:
+            evicted.append(self._items[vid].video_info.record_id)
+            self._discard_widget(vid)
+        self.container.setUpdatesEnabled(True)
+        self._emit_counts()
+        return evicted
+
+    def _on_scrolled(self, value: int):
+        # 오래된 이력이 있는 쪽 끝에 닿으면 DB에서 더 불러오도록 요청
+        bar = self.scroll_area.verticalScrollBar()
+        older_on_top = self._sort_key == "added" and self._sort_ascending
+        edge = bar.minimum() if older_on_top else bar.maximum()
+        if value == edge and bar.maximum() > 0:
+            self.history_requested.emit()
+
+    # -- Hidden-window mode ---------------------------------------------------
+
+    def set_updates_suspended(self, suspended: bool):
+        """Stop/resume per-item UI updates (window hidden to tray or minimized).
+
+        On resume every item that changed while hidden is re-rendered from its
+        VideoInfo in a single pass with layout and painting disabled.
+        """
+        if suspended == self._updates_suspended:
+            return
+        self._updates_suspended = suspended
+        if suspended:
+            self._thumb_timer.stop()
+            for widget in self._items.values():
+                widget.set_deferred(True)
+            return
+
+        self.container.setUpdatesEnabled(False)
+        self.container_layout.setEnabled(False)
+        try:
+            for widget in self._items.values():
+                widget.set_deferred(False)
+        finally:
+            self.container_layout.setEnabled(True)
+            self.container_layout.activate()
+            self.container.setUpdatesEnabled(True)
+        self._schedule_thumbnails()
+
+    @property
+    def updates_suspended(self) -> bool:
+        return self._updates_suspended
+
+    # -- Indexes --------------------------------------------------------------
+
+    def _unindex(self, video_id: str, video_info: VideoInfo):
+        self._by_type[video_info.download_type].discard(video_id)
+        self._by_status[video_info.status].discard(video_id)
+        self._playlist_ids.discard(video_id)
+
+    def _on_status_changed(self, video_id: str, old: str, new: str):
+        if video_id not in self._items:
+            return
+        self._by_status[old].discard(video_id)
+        self._by_status[new].add(video_id)
+        self._touch(video_id)
+
+    # -- Versions -------------------------------------------------------------
+
+    # 유지할 제거 기록 수 — 더 오래된 버전으로 물으면 전체 스냅샷을 준다
+    MAX_TOMBSTONES = 5000
+
+    def _touch(self, video_id: str):
+        if video_id not in self._items:
+            return
+        self._version += 1
+        # 다시 넣어 dict 순서를 버전 순으로 유지
+        self._versions.pop(video_id, None)
+        self._versions[video_id] = self._version
+        self._removed.pop(video_id, None)
+
+    def _forget_version(self, video_id: str):
+        self._versions.pop(video_id, None)
+        self._version += 1
+        self._removed[video_id] = self._version
+        if len(self._removed) > self.MAX_TOMBSTONES:
+            oldest = next(iter(self._removed))
+            self._removed_floor = self._removed.pop(oldest)
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def item_version(self, video_id: str) -> int:
+        return self._versions.get(video_id, 0)
+
+    def changes_since(self, version: int) -> Tuple[List[DownloadItemWidget], Optional[List[str]], int]:
+        """Items changed after version, ids removed after it, and the current version.
+
+        Cost is proportional to the number of changes, not the list size.
+        removed is None when version predates the kept tombstones or was not
+        issued by this instance (e.g. kept across an app restart); the items
+        are then the full list and the caller should replace its snapshot.
+        """
+        if version < self._removed_floor or version > self._version:
+            return list(self._items.values()), None, self._version
+        changed = []
+        for vid in reversed(self._versions):
+            if self._versions[vid] <= version:
+                break
+            changed.append(self._items[vid])
+        changed.reverse()
+        removed = []
+        for vid in reversed(self._removed):
+            if self._removed[vid] <= version:
+                break
+            removed.append(vid)
+        removed.reverse()
+        return changed, removed, self._version
+
+    def _emit_counts(self):
+        self.count_changed.emit(len(self._items))
+        self.tab_counts_changed.emit(self.tab_counts())
+
+    def tab_counts(self) -> Dict[str, int]:
+        return {
+            "all": len(self._items),
+            "video": len(self._by_type["video"]),
+            "audio": len(self._by_type["audio"]),
+            "playlist": len(self._playlist_ids),
+        }
+
+    def status_count(self, status: str) -> int:
+        return len(self._by_status.get(status, ()))
+
+    def _tab_ids(self, tab_key: str) -> Optional[Set[str]]:
+        """Ids belonging to a tab, or None for "all"."""
+        if tab_key == "playlist":
+            return self._playlist_ids
+        if tab_key in ("video", "audio"):
+            return self._by_type[tab_key]
+        return None
+
+    # -- Thumbnails -----------------------------------------------------------
+
+    def _schedule_thumbnails(self, *_):
+        if self._thumb_pending:
+            self._thumb_timer.start()
+
+    def _request_visible_thumbnails(self):
+        """Queue thumbnail loads for items in (or one page around) the viewport."""
+        if not self._thumb_pending or not self.isVisible():
+            return
+        viewport = self.scroll_area.viewport()
+        top = self.scroll_area.verticalScrollBar().value()
+        page = viewport.height()
+        area = QRect(0, top - page, viewport.width(), page * 3)
+
+        for vid in list(self._thumb_pending):
+            widget = self._items.get(vid)
+            if widget is None:
+                self._thumb_pending.discard(vid)
+                continue
+            if vid in self._hidden_ids:
+                continue
+            if widget.geometry().intersects(area):
+                self._thumb_pending.discard(vid)
+                self._thumb_loader.request(vid, widget.video_info.thumbnail_url)
+
+    def _on_thumbnail_loaded(self, video_id: str, data: bytes):
+        widget = self._items.get(video_id)
+        if widget:
+            widget.set_thumbnail(data)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._schedule_thumbnails()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._schedule_thumbnails()
+
+    def shutdown(self):
+        """Stop background thumbnail loading (called on app exit)."""
+        self._thumb_timer.stop()
+        if self._thumb_loader.isRunning():
+            self._thumb_loader.stop()
+
     def get_item(self, video_id: str) -> Optional[DownloadItemWidget]:
         return self._items.get(video_id)
 
@@ -94,38 +418,102 @@ class DownloadList(QWidget):
         if video_id in self._items:
             self._items[video_id].set_selected(True)
 
-    def _remove_item(self, video_id: str):
+    def _discard_widget(self, video_id: str) -> bool:
+        widget = self._items.pop(video_id, None)
+        if widget is None:
+            return False
         if self._selected_id == video_id:
             self._selected_id = None
-        widget = self._items.pop(video_id, None)
-        if widget:
-            self.container_layout.removeWidget(widget)
-            widget.deleteLater()
-            self.count_changed.emit(len(self._items))
+        self._unindex(video_id, widget.video_info)
+        self._forget_version(video_id)
+        self._search_index.remove(video_id)
+        self._hidden_ids.discard(video_id)
+        self._thumb_pending.discard(video_id)
+        self.container_layout.removeWidget(widget)
+        widget.deleteLater()
+        return True
+
+    def set_queued_count(self, count: int):
+        """Show how many queued jobs are waiting for a slot (they have no rows yet)."""
+        self._queued_count = count
+        if count:
+            self.lbl_queued.setText(f"⏳ 대기 중인 다운로드 {count}개 — 슬롯이 비면 순서대로 시작됩니다")
+        self.lbl_queued.setVisible(count > 0)
+        self.lbl_empty.setVisible(not self._items and not count)
+
+    def discard_items(self, video_ids: List[str]):
+        """Drop items from the list only (unlike removal, jobs/history are untouched)."""
+        self.container.setUpdatesEnabled(False)
+        dropped = [vid for vid in video_ids if self._discard_widget(vid)]
+        self.container.setUpdatesEnabled(True)
+        if dropped:
+            self._emit_counts()
+            if not self._items:
+                self.lbl_empty.setVisible(not self._queued_count)
+
+    def _remove_item(self, video_id: str):
+        if self._discard_widget(video_id):
+            self._emit_counts()
 
             if not self._items:
-                self.lbl_empty.setVisible(True)
+                self.lbl_empty.setVisible(not self._queued_count)
 
         self.remove_requested.emit(video_id)
 
+    # -- Filtering ------------------------------------------------------------
+
+    def set_filter(self, tab_key: str = "all", query: str = ""):
+        """Apply tab/search filter, touching only widgets whose visibility changes."""
+        self._filter_tab = tab_key
+        self._filter_query = query.strip()
+
+        matched = self._search_index.match(self._filter_query)
+        tab_ids = self._tab_ids(tab_key)
+        if matched is None:
+            visible = self._items.keys() if tab_ids is None else tab_ids
+        else:
+            visible = matched if tab_ids is None else matched & tab_ids
+        new_hidden = self._items.keys() - visible
+
+        to_hide = new_hidden - self._hidden_ids
+        to_show = self._hidden_ids - new_hidden
+        if not to_hide and not to_show:
+            return
+
+        self.container.setUpdatesEnabled(False)
+        for vid in to_hide:
+            self._items[vid].setVisible(False)
+        for vid in to_show:
+            self._items[vid].setVisible(True)
+        self._hidden_ids = new_hidden
+        self.container.setUpdatesEnabled(True)
+        self._schedule_thumbnails()
+
+    def _matches_tab(self, video_id: str) -> bool:
+        tab_ids = self._tab_ids(self._filter_tab)
+        return tab_ids is None or video_id in tab_ids
+
+    def _passes_filter(self, video_id: str) -> bool:
+        return (self._matches_tab(video_id)
+                and self._search_index.matches(video_id, self._filter_query))
+
     def get_items_by_type(self, download_type: str) -> List[DownloadItemWidget]:
         """Filter items by download type."""
-        return [
-            w for w in self._items.values()
-            if w.video_info.download_type == download_type
-        ]
+        return [self._items[vid] for vid in self._by_type.get(download_type, ())]
+
+    def get_items_by_status(self, status: str) -> List[DownloadItemWidget]:
+        return [self._items[vid] for vid in self._by_status.get(status, ())]
 
     def get_playlist_items(self) -> List[DownloadItemWidget]:
-        return [
-            w for w in self._items.values()
-            if w.video_info.is_playlist
-        ]
+        return [self._items[vid] for vid in self._playlist_ids]
 
     def get_all_items(self) -> List[DownloadItemWidget]:
         return list(self._items.values())
 
     def sort_items(self, key: str, ascending: bool = True):
         """Sort download items by the given key."""
+        self._sort_key = key
+        self._sort_ascending = ascending
         widgets = list(self._items.values())
         reverse = not ascending
 
@@ -145,6 +533,7 @@ class DownloadList(QWidget):
             self.container_layout.removeWidget(w)
         for i, w in enumerate(widgets):
             self.container_layout.insertWidget(i, w)
+        self._schedule_thumbnails()
 
     @property
     def item_count(self) -> int:
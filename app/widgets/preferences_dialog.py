@@ -261,6 +261,25 @@ class AdvancedPage(QWidget):
         layout.addSpacing(8)
         layout.addWidget(_make_separator())
 
+        # 목록에 유지할 완료 항목 수
+        lbl_retention = QLabel("목록에 유지할 완료 항목 수")
+        lbl_retention.setObjectName("prefLabel")
+        layout.addSpacing(12)
+        layout.addWidget(lbl_retention)
+        layout.addSpacing(4)
+
+        self.spin_retention = QSpinBox()
+        self.spin_retention.setObjectName("prefSpinBox")
+        self.spin_retention.setRange(20, 5000)
+        self.spin_retention.setSingleStep(50)
+        self.spin_retention.setValue(200)
+        self.spin_retention.setFixedHeight(36)
+        self.spin_retention.setFixedWidth(100)
+        layout.addWidget(self.spin_retention)
+
+        layout.addSpacing(8)
+        layout.addWidget(_make_separator())
+
         # 기본 저장 경로
         lbl_path = QLabel("기본 저장 경로")
         lbl_path.setObjectName("prefLabel")
@@ -295,6 +314,11 @@ class AdvancedPage(QWidget):
         )
         layout.addWidget(row1)
 
+        row2, self.toggle_skip_downloaded = _make_toggle_row(
+            "이미 받은 영상 건너뛰기"
+        )
+        layout.addWidget(row2)
+
         layout.addStretch()
 
     def _browse_path(self):
@@ -691,8 +715,10 @@ class PreferencesDialog(QDialog):
         pa = self.page_advanced
         pa.spin_concurrent.setValue(s.concurrent_downloads)
         pa.spin_threads.setValue(s.download_threads)
+        pa.spin_retention.setValue(s.max_completed_items)
         pa.edit_path.setText(s.default_save_path)
         pa.toggle_filename_numbering.setChecked(s.filename_numbering)
+        pa.toggle_skip_downloaded.setChecked(s.skip_downloaded)
 
         # Connection
         pc = self.page_connection
@@ -727,8 +753,10 @@ class PreferencesDialog(QDialog):
         pa = self.page_advanced
         pa.spin_concurrent.valueChanged.connect(self._save_advanced)
         pa.spin_threads.valueChanged.connect(self._save_advanced)
+        pa.spin_retention.valueChanged.connect(self._save_advanced)
         pa.edit_path.textChanged.connect(self._save_advanced)
         pa.toggle_filename_numbering.toggled.connect(self._save_advanced)
+        pa.toggle_skip_downloaded.toggled.connect(self._save_advanced)
 
         pc = self.page_connection
         pc.combo_proxy.currentTextChanged.connect(self._save_connection)
@@ -791,8 +819,10 @@ class PreferencesDialog(QDialog):
         pa = self.page_advanced
         s.concurrent_downloads = pa.spin_concurrent.value()
         s.download_threads = pa.spin_threads.value()
+        s.max_completed_items = pa.spin_retention.value()
         s.default_save_path = pa.edit_path.text()
         s.filename_numbering = pa.toggle_filename_numbering.isChecked()
+        s.skip_downloaded = pa.toggle_skip_downloaded.isChecked()
         s.sync()
         self.settings_changed.emit()
 
@@ -14,12 +14,21 @@ class TabBar(QWidget):
     sort_changed = pyqtSignal(str, bool)  # key, ascending
 
     TABS = ["전체", "동영상", "오디오", "재생 목록"]
+    # 탭 이름 → DownloadList 필터 키
+    TAB_KEYS = {"전체": "all", "동영상": "video", "오디오": "audio", "재생 목록": "playlist"}
+
+    # 검색어 입력이 멈춘 뒤 필터를 적용할 때까지의 지연 (ms)
+    SEARCH_DEBOUNCE_MS = 200
 
     def __init__(self, parent=None):
         super().__init__(parent)
         self._current_tab = "전체"
         self._buttons: Dict[str, QPushButton] = {}
         self._search_visible = False
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(self.SEARCH_DEBOUNCE_MS)
+        self._search_timer.timeout.connect(self._emit_search)
         self._setup_ui()
 
     def _setup_ui(self):
@@ -121,7 +130,15 @@ class TabBar(QWidget):
         self.btn_search.setToolTip("필터 상자 표시")
 
     def _on_search_text_changed(self, text: str):
-        self.search_changed.emit(text)
+        if not text:
+            # 지우기는 즉시 반영
+            self._search_timer.stop()
+            self.search_changed.emit(text)
+            return
+        self._search_timer.start()
+
+    def _emit_search(self):
+        self.search_changed.emit(self.search_input.text())
 
     def _build_sort_menu(self):
         self._sort_key = "added"
@@ -175,6 +192,16 @@ class TabBar(QWidget):
     def set_count(self, count: int):
         self.lbl_count.setText(f"{count} 아이템")
 
+    def set_tab_counts(self, counts: dict):
+        """Show per-tab item counts (keyed by TAB_KEYS values) on the buttons."""
+        for tab_name, btn in self._buttons.items():
+            count = counts.get(self.TAB_KEYS[tab_name], 0)
+            btn.setText(f"{tab_name} {count}" if count else tab_name)
+
     @property
     def current_tab(self) -> str:
         return self._current_tab
+
+    @property
+    def current_tab_key(self) -> str:
+        return self.TAB_KEYS.get(self._current_tab, "all")
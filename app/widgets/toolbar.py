@@ -6,6 +6,7 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtCore import pyqtSignal, Qt
 from PyQt6.QtGui import QAction, QIcon
 
+from app.models.download_options import DownloadOptions
 from app.utils.settings_manager import SettingsManager
 
 
@@ -501,3 +502,17 @@ class ToolBar(QWidget):
     @property
     def codec(self) -> str:
         return self._codec
+
+    def current_options(self) -> DownloadOptions:
+        """Snapshot of the current selections for a new job."""
+        return DownloadOptions(
+            save_dir=self._save_path,
+            download_type=self._download_type,
+            quality=self._quality,
+            fmt=self._format,
+            subtitle=self._subtitle_enabled,
+            subtitle_lang=self._subtitle_lang,
+            audio_track=self._audio_track,
+            frame_rate=self._frame_rate,
+            codec=self._codec,
+        )
@@ -212,6 +212,7 @@ class DownloadWorker(QThread):
                 "speed": speed,
                 "eta": eta,
                 "status": "downloading",
+                "filename": d.get("tmpfilename") or d.get("filename", ""),
             })
         elif d["status"] == "finished":
             self.progress.emit(vid, {
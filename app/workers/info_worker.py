@@ -1,7 +1,12 @@
+from typing import Callable, Dict, List, Optional, Set
+
 from PyQt6.QtCore import QThread, pyqtSignal
 
 from app.models.video_info import VideoInfo
-from app.utils.helpers import is_playlist_url
+from app.utils.helpers import extract_video_id, is_playlist_url
+
+# video_id 목록 → 이미 받아 둔 기록 (video_id → history record)
+DownloadedLookup = Callable[[List[str]], Dict[str, dict]]
 
 
 class InfoWorker(QThread):
@@ -11,10 +16,17 @@ class InfoWorker(QThread):
     playlist_ready = pyqtSignal(list)  # list[VideoInfo]
     error = pyqtSignal(str)
     status_message = pyqtSignal(str)
+    already_downloaded = pyqtSignal(list, int)  # records still on disk, entries checked
 
-    def __init__(self, url: str, parent=None):
+    # 비공개/삭제된 영상의 목록 항목 제목 (yt-dlp가 붙이는 값)
+    UNAVAILABLE_TITLES = ("[Private video]", "[Deleted video]")
+
+    def __init__(self, url: str, lookup: Optional[DownloadedLookup] = None, parent=None):
         super().__init__(parent)
         self.url = url
+        self._lookup = lookup
+        # 가져오는 동안 취소된 video_id — 결과를 버린다 (GUI 스레드에서만 쓴다)
+        self.discarded: Set[str] = set()
 
     def run(self):
         import yt_dlp
@@ -40,7 +52,19 @@ class InfoWorker(QThread):
         except Exception as e:
             self.error.emit(f"정보를 가져오는 중 오류 발생: {str(e)}")
 
+    def _check_downloaded(self, video_ids: List[str]) -> Dict[str, dict]:
+        """Look up already-downloaded entries before any full extraction."""
+        if self._lookup is None or not video_ids:
+            return {}
+        found = self._lookup(video_ids)
+        self.already_downloaded.emit(list(found.values()), len(video_ids))
+        return found
+
     def _fetch_single(self, ydl_opts: dict):
+        video_id = extract_video_id(self.url)
+        if video_id and self._check_downloaded([video_id]):
+            return
+
         self.status_message.emit("영상 정보를 가져오는 중...")
         with self._yt_dlp.YoutubeDL(ydl_opts) as ydl:
             info = ydl.extract_info(self.url, download=False)
@@ -52,35 +76,60 @@ class InfoWorker(QThread):
 
     def _fetch_playlist(self, ydl_opts: dict):
         self.status_message.emit("재생목록 정보를 가져오는 중...")
-        with self._yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        # 1단계: 목록만 빠르게 가져와 이미 받은 영상을 걸러낸다
+        flat_opts = dict(ydl_opts, extract_flat="in_playlist")
+        with self._yt_dlp.YoutubeDL(flat_opts) as ydl:
             info = ydl.extract_info(self.url, download=False)
-            if info is None:
-                self.error.emit("재생목록 정보를 가져올 수 없습니다.")
-                return
-
-            entries = info.get("entries", [])
-            if not entries:
-                self.error.emit("재생목록에 영상이 없습니다.")
-                return
-
-            playlist_title = info.get("title", "재생목록")
-            videos = []
-            total = len(entries)
-
-            for i, entry in enumerate(entries):
-                if entry is None:
-                    continue
-                self.status_message.emit(
-                    f"재생목록 정보 가져오는 중... ({i + 1}/{total})"
-                )
-                vi = self._parse_info(entry)
-                vi.is_playlist = True
-                vi.playlist_title = playlist_title
-                vi.playlist_index = i + 1
-                vi.playlist_count = total
-                videos.append(vi)
-
+        if info is None:
+            self.error.emit("재생목록 정보를 가져올 수 없습니다.")
+            return
+
+        entries = [e for e in (info.get("entries") or []) if e]
+        if not entries:
+            self.error.emit("재생목록에 영상이 없습니다.")
+            return
+
+        playlist_title = info.get("title", "재생목록")
+        total = len(entries)
+        skip = self._check_downloaded([e.get("id", "") for e in entries])
+        pending = [(i, e) for i, e in enumerate(entries) if e.get("id") not in skip]
+        if not pending:
+            return
+
+        # 2단계: 상세 추출은 하지 않는다 — 다운로드 워커가 시작할 때 어차피 다시
+        # 추출하므로, 대기열에는 목록 항목의 기본 정보만 넘긴다 (형식 목록 없음)
+        videos = []
+        for i, entry in pending:
+            if entry.get("title") in self.UNAVAILABLE_TITLES:
+                print(f"[InfoWorker] Skipping unavailable playlist entry {entry.get('id')}")
+                continue
+            vi = self._parse_flat_entry(entry)
+            vi.is_playlist = True
+            vi.playlist_title = playlist_title
+            vi.playlist_index = i + 1
+            vi.playlist_count = total
+            videos.append(vi)
+
+        if videos:
             self.playlist_ready.emit(videos)
+        else:
+            self.error.emit("재생목록의 영상 정보를 가져올 수 없습니다.")
+
+    @staticmethod
+    def _parse_flat_entry(entry: dict) -> VideoInfo:
+        """VideoInfo from an extract_flat playlist entry (no formats/subtitles)."""
+        video_id = entry.get("id", "")
+        thumbnails = entry.get("thumbnails") or []
+        thumbnail = entry.get("thumbnail") or (thumbnails[-1].get("url", "") if thumbnails else "")
+        return VideoInfo(
+            url=entry.get("webpage_url") or entry.get("url")
+            or f"https://www.youtube.com/watch?v={video_id}",
+            video_id=video_id,
+            title=entry.get("title") or "제목 없음",
+            channel=entry.get("uploader") or entry.get("channel") or "알 수 없음",
+            duration=int(entry.get("duration") or 0),
+            thumbnail_url=thumbnail,
+        )
 
     def _parse_info(self, info: dict) -> VideoInfo:
         formats = info.get("formats", [])
@@ -0,0 +1,90 @@
+import os
+import time
+from collections import defaultdict
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+
+class LibraryScanner(QThread):
+    """Low-priority background check that history files are still on disk.
+
+    Records are grouped by directory and each directory is listed once with
+    os.scandir. A directory is skipped when its mtime matches the last scan
+    (adding, deleting or renaming a file changes it) and none of its records
+    are unchecked, so repeated runs only touch what changed.
+    """
+
+    # video_id → exists, for records whose state changed in this run
+    file_states_changed = pyqtSignal(dict)
+    finished_scan = pyqtSignal(int, int)  # directories scanned, missing files
+
+    # 디렉터리 사이에 잠깐 양보해 디스크/CPU를 독차지하지 않는다
+    YIELD_SECONDS = 0.002
+
+    def __init__(self, db, parent=None):
+        super().__init__(parent)
+        self._db = db
+        self._stopped = False
+
+    def stop(self):
+        self._stopped = True
+        self.wait(2000)
+
+    def run(self):
+        try:
+            self._scan()
+        except Exception as e:
+            print(f"[LibraryScanner] Scan failed: {e}")
+        finally:
+            self._db.release_connection()
+
+    def _scan(self):
+        by_dir = defaultdict(list)
+        for rec in self._db.get_scan_targets():
+            by_dir[os.path.dirname(rec["file_path"])].append(rec)
+        known = self._db.get_scan_dirs()
+
+        file_states, dirs, changed = [], [], {}
+        scanned = missing = 0
+        for directory, records in by_dir.items():
+            if self._stopped:
+                break
+            try:
+                dir_mtime = os.stat(directory).st_mtime
+            except OSError:
+                dir_mtime = -1.0  # 폴더 자체가 없음 — 다음 실행에서도 다시 확인
+            unchecked = any(r["checked_at"] is None for r in records)
+            if dir_mtime >= 0 and known.get(directory) == dir_mtime and not unchecked:
+                continue
+
+            found = self._list_dir(directory, {os.path.basename(r["file_path"]) for r in records})
+            for rec in records:
+                size, mtime = found.get(os.path.basename(rec["file_path"]), (0, None))
+                exists = 1 if size > 0 else 0
+                missing += not exists
+                file_states.append((exists, size, mtime, rec["id"]))
+                if rec["file_exists"] != exists:
+                    changed[rec["video_id"]] = bool(exists)
+            dirs.append((directory, dir_mtime))
+            scanned += 1
+            time.sleep(self.YIELD_SECONDS)
+
+        if file_states or dirs:
+            self._db.save_scan_results(file_states, dirs)
+        if changed:
+            self.file_states_changed.emit(changed)
+        self.finished_scan.emit(scanned, missing)
+
+    @staticmethod
+    def _list_dir(directory: str, names: set) -> dict:
+        """name → (size, mtime) for the wanted names present in directory."""
+        found = {}
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if entry.name in names and entry.is_file():
+                        st = entry.stat()
+                        found[entry.name] = (st.st_size, st.st_mtime)
+        except OSError:
+            pass
+        return found
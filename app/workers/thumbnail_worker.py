@@ -0,0 +1,53 @@
+import queue
+
+from PyQt6.QtCore import QThread, pyqtSignal
+import requests
+
+
+class ThumbnailLoader(QThread):
+    """Worker thread that fetches thumbnail images off the GUI thread.
+
+    Requests are queued by DownloadList for items that are (nearly) inside the
+    viewport, so large playlists only download what is actually on screen.
+    """
+
+    loaded = pyqtSignal(str, bytes)  # video_id, image data
+    failed = pyqtSignal(str)         # video_id
+
+    TIMEOUT = 5  # seconds
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._queue: "queue.Queue" = queue.Queue()
+        self._queued: set = set()
+        self._stopped = False
+
+    def request(self, video_id: str, url: str):
+        if video_id in self._queued:
+            return
+        self._queued.add(video_id)
+        self._queue.put((video_id, url))
+        if not self.isRunning():
+            self.start()
+
+    def stop(self):
+        self._stopped = True
+        self._queue.put(None)
+        self.wait(2000)
+
+    def run(self):
+        session = requests.Session()
+        while not self._stopped:
+            job = self._queue.get()
+            if job is None:
+                break
+            video_id, url = job
+            self._queued.discard(video_id)
+            try:
+                resp = session.get(url, timeout=self.TIMEOUT)
+                if resp.status_code == 200:
+                    self.loaded.emit(video_id, resp.content)
+                else:
+                    self.failed.emit(video_id)
+            except Exception:
+                self.failed.emit(video_id)
@@ -0,0 +1,87 @@
+"""Benchmark: per-item add_item() vs bulk add_items() in DownloadList.
+
+Run with: python benchmarks/bench_add_items.py [count]
+Uses the offscreen Qt platform so it also works on headless machines.
+"""
+
+import os
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt6.QtWidgets import QApplication, QWidget, QVBoxLayout  # noqa: E402
+
+from app.models.video_info import VideoInfo  # noqa: E402
+from app.widgets.download_list import DownloadList  # noqa: E402
+from app.widgets.tab_bar import TabBar  # noqa: E402
+
+
+def make_videos(count: int, prefix: str) -> list:
+    return [
+        VideoInfo(
+            url=f"https://www.youtube.com/watch?v={prefix}{i}",
+            video_id=f"{prefix}{i}",
+            title=f"재생목록 영상 {i}",
+            channel="벤치마크 채널",
+            duration=180,
+            is_playlist=True,
+            playlist_index=i + 1,
+            playlist_count=count,
+        )
+        for i in range(count)
+    ]
+
+
+def make_window():
+    window = QWidget()
+    window.resize(1000, 650)
+    layout = QVBoxLayout(window)
+    tab_bar = TabBar()
+    download_list = DownloadList()
+    download_list.count_changed.connect(tab_bar.set_count)
+    layout.addWidget(tab_bar)
+    layout.addWidget(download_list, stretch=1)
+    window.show()
+    QApplication.processEvents()
+    return window, download_list
+
+
+def bench(label: str, count: int, bulk: bool) -> float:
+    window, download_list = make_window()
+    videos = make_videos(count, label)
+
+    start = time.perf_counter()
+    if bulk:
+        download_list.add_items(videos)
+    else:
+        # 기존 _on_playlist_ready 루프: 항목마다 add_item()을 동기 호출
+        for vi in videos:
+            download_list.add_item(vi)
+    # 두 경로 모두 쌓인 레이아웃/페인트 이벤트까지 처리한 시점을 잰다
+    QApplication.processEvents()
+    elapsed = time.perf_counter() - start
+
+    download_list.shutdown()
+    window.close()
+    window.deleteLater()
+    QApplication.processEvents()
+    return elapsed
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    app = QApplication(sys.argv)  # noqa: F841
+
+    old = bench("old", count, bulk=False)
+    new = bench("new", count, bulk=True)
+
+    print(f"entries: {count}")
+    print(f"add_item x{count}: {old * 1000:8.1f} ms")
+    print(f"add_items:       {new * 1000:8.1f} ms")
+    print(f"speedup:         {old / new:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Benchmark: BridgeClient round-trip latency — connect per call (old client)
+vs one persistent connection, sequential and pipelined.
+
+Run with: python benchmarks/bench_bridge_client.py [calls]
+Starts a BridgeServer on a spare port inside this process.
+"""
+
+import json
+import os
+import socket
+import statistics
+import sys
+import threading
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt6.QtCore import QCoreApplication, QTimer  # noqa: E402
+
+from app.bridge.bridge_server import BridgeServer  # noqa: E402
+from app.mcp.bridge_client import BridgeClient  # noqa: E402
+
+BENCH_PORT = 19390
+
+
+class LegacyBridgeClient:
+    """The previous client: new TCP connection and 4 KB chunk reads per call."""
+
+    def __init__(self, port: int):
+        self.port = port
+        self._req_id = 0
+
+    def send_request(self, method: str, params: dict | None = None):
+        self._req_id += 1
+        req = {"jsonrpc": "2.0", "id": self._req_id, "method": method, "params": params or {}}
+        payload = json.dumps(req).encode("utf-8") + b"\n"
+        with socket.create_connection(("127.0.0.1", self.port), timeout=30) as sock:
+            sock.sendall(payload)
+            buf = b""
+            while b"\n" not in buf:
+                chunk = sock.recv(4096)
+                if not chunk:
+                    raise ConnectionError("Connection closed by server")
+                buf += chunk
+            return json.loads(buf.split(b"\n", 1)[0])["result"]
+
+
+def timed_calls(fn, calls: int) -> list:
+    samples = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1e6)
+    return samples
+
+
+def run(calls: int, results: dict, app: QCoreApplication):
+    try:
+        legacy = LegacyBridgeClient(BENCH_PORT)
+        results["connect per call"] = timed_calls(lambda: legacy.send_request("ping"), calls)
+
+        client = BridgeClient(port=BENCH_PORT, transport="tcp")
+        client.send_request("ping")  # 연결 수립은 측정에서 제외
+        results["persistent"] = timed_calls(lambda: client.send_request("ping"), calls)
+
+        # 파이프라이닝: 응답을 기다리지 않고 모두 보낸 뒤 한꺼번에 받는다
+        start = time.perf_counter()
+        futures = [client.call_async("ping") for _ in range(calls)]
+        for fut in futures:
+            fut.result(30)
+        results["pipelined"] = [(time.perf_counter() - start) * 1e6 / calls]
+        client.close()
+    finally:
+        app.quit()
+
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    app = QCoreApplication(sys.argv)
+    server = BridgeServer(main_window=None, port=BENCH_PORT)
+    if not server.start():
+        sys.exit(1)
+
+    results: dict = {}
+    worker = threading.Thread(target=run, args=(calls, results, app), daemon=True)
+    QTimer.singleShot(0, worker.start)
+    app.exec()
+    server.stop()
+
+    print(f"calls: {calls}")
+    print(f"{'':18}{'mean us':>10}{'p50 us':>10}{'p99 us':>10}")
+    for label, samples in results.items():
+        samples = sorted(samples)
+        p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+        print(f"{label:18}{statistics.mean(samples):10.1f}"
+              f"{statistics.median(samples):10.1f}{p99:10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""Benchmark: bridge payload codecs — size and encode/decode round trip of a
+history page and a download list with Korean titles, then get_downloads end
+to end for each negotiated codec.
+
+Run with: python benchmarks/bench_bridge_codec.py [items]
+msgpack, cbor2 and zstandard are optional; missing ones are skipped.
+Starts a BridgeServer on a spare port inside this process.
+"""
+
+import os
+import sys
+import threading
+import time
+from types import SimpleNamespace
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt6.QtCore import QCoreApplication, QTimer  # noqa: E402
+
+from app.bridge.bridge_server import BridgeServer  # noqa: E402
+from app.bridge.codec import Codec, available_compressions, available_encodings  # noqa: E402
+from app.mcp.bridge_client import BridgeClient  # noqa: E402
+from app.models.video_info import VideoInfo  # noqa: E402
+
+BENCH_PORT = 19392
+ROUNDS = 20
+
+
+def video_infos(count: int) -> list:
+    return [
+        VideoInfo(
+            video_id=f"vid{i:08d}", url=f"https://www.youtube.com/watch?v=vid{i:08d}",
+            title=f"[4K] 서울 야경 드론 촬영 스톡 영상 모음 {i}편 - 한강 다리와 도심",
+            channel=f"스톡 영상 채널 {i % 50}", status="completed", progress=100.0,
+            download_type="video", ext="mp4", selected_quality="2160p",
+            downloaded_path=f"C:/Users/사용자/Videos/스톡/서울 야경 {i}.mp4",
+        )
+        for i in range(count)
+    ]
+
+
+class FakeDownloadList:
+    def __init__(self, infos: list):
+        self._widgets = [SimpleNamespace(video_info=vi) for vi in infos]
+
+    def get_all_items(self) -> list:
+        return self._widgets
+
+    def item_version(self, video_id: str) -> int:
+        return 1
+
+
+def codecs() -> list:
+    out = []
+    for encoding in available_encodings():
+        for compression in [None] + available_compressions():
+            out.append((encoding, compression))
+    return out
+
+
+def round_trip(payload, encoding: str, compression) -> tuple:
+    codec = Codec(encoding, compression)
+    data = codec.encode(payload)
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        codec.encode(payload)
+    encode_ms = (time.perf_counter() - start) * 1000 / ROUNDS
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        codec.decode(data)
+    decode_ms = (time.perf_counter() - start) * 1000 / ROUNDS
+    return len(data), encode_ms, decode_ms
+
+
+def run(results: dict, app: QCoreApplication):
+    try:
+        for encoding, compression in codecs():
+            client = BridgeClient(
+                port=BENCH_PORT,
+                encodings=[encoding] if encoding != "json" else None,
+                compression=[compression] if compression else None,
+            )
+            client.send_request("get_downloads")  # 연결·협상은 측정에서 제외
+            start = time.perf_counter()
+            for _ in range(ROUNDS):
+                client.send_request("get_downloads")
+            results[(encoding, compression)] = (time.perf_counter() - start) * 1000 / ROUNDS
+            client.close()
+    finally:
+        app.quit()
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    infos = video_infos(count)
+    app = QCoreApplication(sys.argv)
+    dl = FakeDownloadList(infos)
+    server = BridgeServer(main_window=SimpleNamespace(download_list=dl), port=BENCH_PORT)
+    downloads = server._dispatch("get_downloads", {})
+    history = [{"id": i, "video_id": vi.video_id, "title": vi.title, "channel": vi.channel,
+                "url": vi.url, "file_path": vi.downloaded_path, "format": "mp4",
+                "quality": "2160p", "filesize": 350_000_000 + i, "duration": 184,
+                "download_type": "video", "status": "completed", "created_at": 1_760_000_000 + i}
+               for i, vi in enumerate(infos[:1000])]
+
+    for label, payload in (("get_history page (1000)", {"items": history, "next_cursor": None}),
+                           (f"get_downloads ({count})", downloads)):
+        print(label)
+        print(f"  {'codec':16}{'bytes':>11}{'encode ms':>11}{'decode ms':>11}")
+        for encoding, compression in codecs():
+            size, enc, dec = round_trip({"jsonrpc": "2.0", "id": 1, "result": payload},
+                                        encoding, compression)
+            name = encoding + (f"+{compression}" if compression else "")
+            print(f"  {name:16}{size:11d}{enc:11.2f}{dec:11.2f}")
+
+    if not server.start():
+        sys.exit(1)
+    results: dict = {}
+    worker = threading.Thread(target=run, args=(results, app), daemon=True)
+    QTimer.singleShot(0, worker.start)
+    app.exec()
+    server.stop()
+
+    print(f"\nend to end get_downloads ({count} items), ms per call")
+    for (encoding, compression), ms in results.items():
+        name = encoding + (f"+{compression}" if compression else "")
+        print(f"  {name:16}{ms:11.2f}")
+
+
+if __name__ == "__main__":
+    main()
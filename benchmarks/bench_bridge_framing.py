@@ -0,0 +1,131 @@
+"""Benchmark: bridge receive-side framing — the old bytes concat/split loop vs
+app.bridge.framing.FrameDecoder, plus 10 MB of pipelined requests end to end.
+
+Run with: python benchmarks/bench_bridge_framing.py [megabytes]
+Starts a BridgeServer on a spare port inside this process.
+"""
+
+import json
+import os
+import socket
+import sys
+import threading
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt6.QtCore import QCoreApplication, QTimer  # noqa: E402
+
+from app.bridge.bridge_server import BridgeServer  # noqa: E402
+from app.bridge.framing import LENGTH, LINE, FrameDecoder, encode_frame, read_frame  # noqa: E402
+
+BENCH_PORT = 19391
+CHUNK = 64 * 1024  # QTcpSocket readyRead 한 번에 오는 정도의 크기
+
+
+class LegacyBuffer:
+    """The previous BridgeServer._on_data_ready loop."""
+
+    def __init__(self):
+        self.buf = b""
+
+    def feed(self, data: bytes) -> list:
+        self.buf = self.buf + data
+        out = []
+        while b"\n" in self.buf:
+            line, self.buf = self.buf.split(b"\n", 1)
+            out.append(line)
+        return out
+
+
+def requests(total_bytes: int) -> list:
+    """Pipelined add_download-sized requests with Korean text, ~total_bytes."""
+    msgs, size, i = [], 0, 0
+    while size < total_bytes:
+        req = {"jsonrpc": "2.0", "id": i, "method": "ping",
+               "params": {"url": f"https://www.youtube.com/watch?v=vid{i:08d}",
+                          "note": "대량 가져오기 " * 8}}
+        msg = json.dumps(req, ensure_ascii=False).encode("utf-8")
+        msgs.append(msg)
+        size += len(msg) + 1
+        i += 1
+    return msgs
+
+
+def feed_all(decoder, stream: bytes, chunk: int) -> float:
+    start = time.perf_counter()
+    for pos in range(0, len(stream), chunk):
+        decoder.feed(stream[pos:pos + chunk])
+    return (time.perf_counter() - start) * 1000
+
+
+def decoder_bench(megabytes: float):
+    msgs = requests(int(megabytes * 1024 * 1024))
+    line_stream = b"".join(encode_frame(m, LINE) for m in msgs)
+    length_stream = b"".join(encode_frame(m, LENGTH) for m in msgs)
+    # 한 줄짜리 큰 요청 (예: URL 수천 개를 한 번에 넘기는 일괄 가져오기)
+    big = encode_frame(b"[" + b",".join(msgs[:20000]) + b"]", LINE)
+
+    print(f"decoder: {len(msgs)} messages, {len(line_stream) / 1e6:.1f} MB")
+    print(f"{'':34}{'legacy ms':>10}{'decoder ms':>11}")
+    for label, stream, chunk in (
+        ("pipelined, 64 KB reads", line_stream, CHUNK),
+        ("pipelined, 1.5 KB reads", line_stream, 1500),
+        (f"one {len(big) / 1e6:.1f} MB line, 64 KB reads", big, CHUNK),
+    ):
+        legacy = feed_all(LegacyBuffer(), stream, chunk)
+        new = feed_all(FrameDecoder(), stream, chunk)
+        print(f"{label:34}{legacy:10.1f}{new:11.1f}")
+    new = feed_all(FrameDecoder(), length_stream, CHUNK)
+    print(f"{'length-prefixed, 64 KB reads':34}{'':10}{new:11.1f}")
+    return msgs
+
+
+def pipelined(msgs: list, framing: str) -> float:
+    """Send every request without waiting, then read all responses."""
+    sock = socket.create_connection(("127.0.0.1", BENCH_PORT))
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    reader = sock.makefile("rb")
+    stream = b"".join(encode_frame(m, framing) for m in msgs)
+    start = time.perf_counter()
+    sender = threading.Thread(target=sock.sendall, args=(stream,))
+    sender.start()
+    for _ in msgs:
+        if read_frame(reader, framing) is None:
+            raise ConnectionError("Connection closed by server")
+    elapsed = time.perf_counter() - start
+    sender.join()
+    sock.close()
+    return elapsed
+
+
+def run(msgs: list, results: dict, app: QCoreApplication):
+    try:
+        for framing in (LINE, LENGTH):
+            results[framing] = pipelined(msgs, framing)
+    finally:
+        app.quit()
+
+
+def main():
+    megabytes = float(sys.argv[1]) if len(sys.argv) > 1 else 10
+    msgs = decoder_bench(megabytes)
+
+    app = QCoreApplication(sys.argv)
+    server = BridgeServer(main_window=None, port=BENCH_PORT)
+    if not server.start():
+        sys.exit(1)
+    results: dict = {}
+    worker = threading.Thread(target=run, args=(msgs, results, app), daemon=True)
+    QTimer.singleShot(0, worker.start)
+    app.exec()
+    server.stop()
+
+    print(f"\nend to end: {len(msgs)} pipelined requests ({megabytes:g} MB)")
+    for framing, elapsed in results.items():
+        print(f"{framing:10}{elapsed:8.2f} s  {len(msgs) / elapsed:10.0f} req/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Benchmark: bridge round-trip latency over loopback TCP vs the local socket
+(Unix domain socket), sequential and pipelined.
+
+Run with: python benchmarks/bench_bridge_transport.py [calls]
+Starts a BridgeServer on a spare port inside this process. On Windows only
+TCP is measured (the client has no named-pipe transport).
+"""
+
+import os
+import statistics
+import sys
+import threading
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt6.QtCore import QCoreApplication, QTimer  # noqa: E402
+
+from app.bridge.bridge_server import BridgeServer  # noqa: E402
+from app.mcp.bridge_client import BridgeClient  # noqa: E402
+
+BENCH_PORT = 19393
+
+
+def measure(transport: str, calls: int, results: dict):
+    client = BridgeClient(port=BENCH_PORT, transport=transport)
+    client.send_request("ping")  # 연결 수립은 측정에서 제외
+    samples = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        client.send_request("ping")
+        samples.append((time.perf_counter() - start) * 1e6)
+    results[f"{client.connected_via} sequential"] = samples
+
+    start = time.perf_counter()
+    futures = [client.call_async("ping") for _ in range(calls)]
+    for fut in futures:
+        fut.result(30)
+    results[f"{client.connected_via} pipelined"] = [(time.perf_counter() - start) * 1e6 / calls]
+    client.close()
+
+
+def run(calls: int, results: dict, app: QCoreApplication):
+    try:
+        measure("tcp", calls, results)
+        if sys.platform != "win32":
+            measure("local", calls, results)
+    finally:
+        app.quit()
+
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    app = QCoreApplication(sys.argv)
+    server = BridgeServer(main_window=None, port=BENCH_PORT)
+    if not server.start():
+        sys.exit(1)
+
+    results: dict = {}
+    worker = threading.Thread(target=run, args=(calls, results, app), daemon=True)
+    QTimer.singleShot(0, worker.start)
+    app.exec()
+    server.stop()
+
+    print(f"calls: {calls}")
+    print(f"{'':20}{'mean us':>10}{'p50 us':>10}{'p99 us':>10}")
+    for label, samples in results.items():
+        samples = sorted(samples)
+        p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+        print(f"{label:20}{statistics.mean(samples):10.1f}"
+              f"{statistics.median(samples):10.1f}{p99:10.1f}")
+
+
+if __name__ == "__main__":
+    main()
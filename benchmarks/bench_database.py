@@ -0,0 +1,113 @@
+"""Benchmark: per-call sqlite3.connect with the unindexed legacy schema
+(old DownloadDatabase) vs the long-lived WAL connection on the migrated schema.
+
+Run with: python benchmarks/bench_database.py [inserts]
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.database import DownloadDatabase  # noqa: E402
+
+
+def record(i: int) -> dict:
+    return dict(
+        url=f"https://www.youtube.com/watch?v=vid{i}",
+        video_id=f"vid{i}",
+        title=f"벤치마크 영상 {i}",
+        channel=f"채널 {i % 50}",
+        thumbnail_url="",
+        file_path=f"/tmp/bench/vid{i}.mp4",
+        fmt="mp4",
+        quality="1080p",
+        filesize=10_000_000 + i,
+        duration=300,
+        download_type="video" if i % 3 else "audio",
+    )
+
+
+class LegacyDatabase:
+    """The previous implementation: new connection per call, rollback journal."""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS downloads (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    url TEXT NOT NULL,
+                    video_id TEXT,
+                    title TEXT,
+                    channel TEXT,
+                    thumbnail_url TEXT,
+                    file_path TEXT,
+                    format TEXT,
+                    quality TEXT,
+                    filesize INTEGER,
+                    duration INTEGER,
+                    download_type TEXT DEFAULT 'video',
+                    status TEXT DEFAULT 'completed',
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+
+    def add_record(self, url, video_id, title, channel, thumbnail_url, file_path,
+                   fmt, quality, filesize, duration, download_type="video"):
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(
+                """INSERT INTO downloads
+                   (url, video_id, title, channel, thumbnail_url, file_path,
+                    format, quality, filesize, duration, download_type, status, created_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 'completed', ?)""",
+                (url, video_id, title, channel, thumbnail_url, file_path,
+                 fmt, quality, filesize, duration, download_type,
+                 datetime.now().isoformat()),
+            )
+            conn.commit()
+
+    def get_all_records(self, limit: int = 100) -> list:
+        with sqlite3.connect(self.db_path) as conn:
+            conn.row_factory = sqlite3.Row
+            cursor = conn.execute(
+                "SELECT * FROM downloads ORDER BY created_at DESC LIMIT ?", (limit,),
+            )
+            return [dict(row) for row in cursor.fetchall()]
+
+
+def bench(db, inserts: int, queries: int = 200) -> tuple:
+    start = time.perf_counter()
+    for i in range(inserts):
+        db.add_record(**record(i))
+    if hasattr(db, "flush"):
+        db.flush()  # 쓰기 스레드가 모두 커밋할 때까지 포함해서 측정
+    insert_rate = inserts / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for _ in range(queries):
+        db.get_all_records(limit=100)
+    query_ms = (time.perf_counter() - start) / queries * 1000
+    return insert_rate, query_ms
+
+
+def main():
+    inserts = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    with tempfile.TemporaryDirectory() as tmp:
+        old_rate, old_query = bench(LegacyDatabase(os.path.join(tmp, "old.db")), inserts)
+        new_db = DownloadDatabase(os.path.join(tmp, "new.db"))
+        new_rate, new_query = bench(new_db, inserts)
+        new_db.close()
+
+    print(f"inserts: {inserts}")
+    print(f"{'':12}{'inserts/s':>12}{'query ms':>12}")
+    print(f"{'per-call':12}{old_rate:12.0f}{old_query:12.3f}")
+    print(f"{'persistent':12}{new_rate:12.0f}{new_query:12.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Benchmark: already-downloaded lookup (DownloadDatabase.find_downloaded) with
+the planner free to pick idx_downloads_status_created vs pinned to
+idx_downloads_variant. Fails if the shipped query stops using the variant index.
+
+Run with: python benchmarks/bench_find_downloaded.py [rows]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models import database  # noqa: E402
+from app.models.database import DownloadDatabase  # noqa: E402
+
+LOOKUP = 200  # 재생목록 한 번에 확인하는 영상 수
+VARIANT = ("video", "mp4", "1080p")
+
+
+def fill(db: DownloadDatabase, rows: int):
+    for i in range(rows):
+        db.add_record(
+            url=f"https://www.youtube.com/watch?v=vid{i}", video_id=f"vid{i}",
+            title=f"벤치마크 영상 {i}", channel=f"채널 {i % 100}", thumbnail_url="",
+            file_path=f"/tmp/bench/vid{i}.mp4", fmt="mp4", quality="1080p",
+            filesize=10_000_000 + i, duration=300, download_type="video",
+        )
+    db.flush()
+
+
+def plan(conn, sql: str, params: tuple) -> str:
+    rows = conn.execute("EXPLAIN QUERY PLAN " + sql, params).fetchall()
+    return " | ".join(row[-1] for row in rows)
+
+
+def timed(conn, sql: str, params: tuple, repeat: int = 20) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        conn.execute(sql, params).fetchall()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DownloadDatabase(os.path.join(tmp, "history.db"))
+        fill(db, rows)
+        conn = db._conn()
+
+        ids = tuple(f"vid{i}" for i in range(0, rows, max(1, rows // LOOKUP)))[:LOOKUP]
+        marks = ", ".join("?" * len(ids))
+        params = (*ids, *VARIANT)
+        shipped = database._SELECT_VARIANT.format(marks=marks)
+        # 단항 + 없이 쓰면 status = 'completed'가 idx_downloads_status_created와 맞물린다
+        unhinted = shipped.replace("+status", "status")
+
+        shipped_plan = plan(conn, shipped, params)
+        by_video_plan = plan(conn, database._SELECT_BY_VIDEO.format(marks=marks), ids)
+        print(f"rows: {rows}, lookup: {len(ids)} ids")
+        print(f"unhinted plan: {plan(conn, unhinted, params)}")
+        print(f"shipped plan:  {shipped_plan}")
+        print(f"unhinted: {timed(conn, unhinted, params):8.2f} ms")
+        print(f"shipped:  {timed(conn, shipped, params):8.2f} ms")
+        db.close()
+
+    assert "idx_downloads_variant" in shipped_plan, shipped_plan
+    assert "idx_downloads_variant" in by_video_plan, by_video_plan
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Benchmark: deep history paging with LIMIT/OFFSET vs the keyset cursor of
+DownloadDatabase.get_history_page().
+
+Run with: python benchmarks/bench_history_page.py [rows]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.database import DownloadDatabase  # noqa: E402
+
+PAGE = 100
+
+
+def fill(db: DownloadDatabase, rows: int):
+    for i in range(rows):
+        db.add_record(
+            url=f"https://www.youtube.com/watch?v=vid{i}", video_id=f"vid{i}",
+            title=f"벤치마크 영상 {i}", channel=f"채널 {i % 100}", thumbnail_url="",
+            file_path=f"/tmp/bench/vid{i}.mp4", fmt="mp4", quality="1080p",
+            filesize=10_000_000 + i, duration=300,
+            download_type="video" if i % 3 else "audio",
+        )
+    db.flush()
+
+
+def offset_page(db: DownloadDatabase, page: int, channel: str = None) -> list:
+    # 기존 방식에 페이지를 붙인다면: OFFSET만큼 건너뛰며 매번 다시 읽는다
+    sql = "SELECT * FROM downloads"
+    params = []
+    if channel:
+        sql += " WHERE channel = ?"
+        params.append(channel)
+    sql += " ORDER BY created_at DESC, id DESC LIMIT ? OFFSET ?"
+    params += [PAGE, page * PAGE]
+    return db._conn().execute(sql, params).fetchall()
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DownloadDatabase(os.path.join(tmp, "history.db"))
+        fill(db, rows)
+        print(f"rows: {rows}, page size: {PAGE}")
+        print(f"{'':24}{'OFFSET ms':>10}{'cursor ms':>10}")
+
+        for label, channel, pages in (("all", None, rows // PAGE),
+                                      ("channel filter", "채널 7", rows // PAGE // 100)):
+            cursor, marks = None, {0, pages // 2, pages - 1}
+            for page in range(pages):
+                start = time.perf_counter()
+                _, cursor = db.get_history_page(limit=PAGE, cursor=cursor, channel=channel)
+                keyset_ms = (time.perf_counter() - start) * 1000
+                if page in marks:
+                    start = time.perf_counter()
+                    offset_page(db, page, channel)
+                    offset_ms = (time.perf_counter() - start) * 1000
+                    print(f"{label + ' page ' + str(page):24}{offset_ms:10.2f}{keyset_ms:10.2f}")
+
+            start = time.perf_counter()
+            cursor, total = None, 0
+            while True:
+                records, cursor = db.get_history_page(limit=PAGE, cursor=cursor, channel=channel)
+                total += len(records)
+                if cursor is None:
+                    break
+            print(f"{label + ' full walk':24}{'':10}{(time.perf_counter() - start) * 1000:10.1f}"
+                  f"  ({total} rows)")
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
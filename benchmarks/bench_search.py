@@ -0,0 +1,71 @@
+"""Benchmark: history search with a LIKE scan over four columns vs the FTS5
+trigram index behind DownloadDatabase.search().
+
+Run with: python benchmarks/bench_search.py [rows]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.database import DownloadDatabase  # noqa: E402
+
+WORDS = ("브이로그 여행 요리 리뷰 음악 라이브 강의 게임 공략 뉴스 하이라이트 "
+         "tutorial review music live cooking travel python piano guitar news").split()
+
+QUERIES = ("여행 브이로그", "piano", "guitar tutorial", "하이라이트", "채널 7", "vid12345",
+           "없는검색어")
+
+LIKE_SQL = """SELECT * FROM downloads
+    WHERE title LIKE ? OR channel LIKE ? OR url LIKE ? OR file_path LIKE ?
+    ORDER BY created_at DESC, id DESC LIMIT 50"""
+
+
+def fill(db: DownloadDatabase, rows: int):
+    rng = random.Random(0)
+    for i in range(rows):
+        title = " ".join(rng.choice(WORDS) for _ in range(4)) + f" #{i}"
+        db.add_record(
+            url=f"https://www.youtube.com/watch?v=vid{i}", video_id=f"vid{i}",
+            title=title, channel=f"채널 {i % 300}", thumbnail_url="",
+            file_path=f"/media/downloads/{title}.mp4", fmt="mp4", quality="1080p",
+            filesize=10_000_000 + i, duration=300,
+        )
+    db.flush()
+
+
+def like_search(db: DownloadDatabase, query: str) -> list:
+    # 기존 방식: 검색어 전체를 하나의 부분 문자열로 전체 테이블 스캔
+    pattern = f"%{query}%"
+    return db._conn().execute(LIKE_SQL, (pattern,) * 4).fetchall()
+
+
+def timed(fn, repeat: int = 20) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DownloadDatabase(os.path.join(tmp, "search.db"))
+        start = time.perf_counter()
+        fill(db, rows)
+        print(f"rows: {rows} (filled in {time.perf_counter() - start:.1f} s)")
+        print(f"{'query':20}{'LIKE ms':>10}{'FTS ms':>10}{'hits':>6}")
+        for query in QUERIES:
+            like_ms = timed(lambda: like_search(db, query))
+            fts_ms = timed(lambda: db.search(query))
+            hits = len(db.search(query))
+            print(f"{query:20}{like_ms:10.2f}{fts_ms:10.2f}{hits:6}")
+        db.close()
+
+
+if __name__ == "__main__":
+    main()